@@ -0,0 +1,50 @@
+"""Time and memory needed to build the connectivity and geometry of a `Mesh2D`
+
+The vertex and face arrays of a triangulated square are generated once per
+size, and only the construction of the unstructured mesh from them is
+measured, much as when reading a large Gmsh file. Run with::
+
+    $ python examples/benchmarking/meshing.py --maxElements=1e7
+
+and pass `--cellVertexIDs` to also time the `_cellVertexIDs` map used by
+the viewers and by `Mesh.__mul__`.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import unicode_literals
+
+import time
+import tracemalloc
+
+from fipy import numerix, Tri2D
+from fipy.meshes.mesh2D import Mesh2D
+from fipy.tools.numerix import MA
+from fipy.tools.parser import parse
+
+maxElements = parse('--maxElements', action='store',
+                    type='float', default=1e6)
+cellVertexIDs = parse('--cellVertexIDs', action='store_true', default=False)
+
+print("cells\tbuild / s\tpeak / (B / cell)")
+
+for size in numerix.arange(3, numerix.log10(maxElements) + 0.25, 0.5):
+    # Tri2D has four triangles per square
+    nx = max(int(numerix.sqrt(10**size / 4.)), 1)
+    tri = Tri2D(nx=nx, ny=nx)
+    args = (tri.vertexCoords,
+            MA.filled(tri.faceVertexIDs, -1),
+            MA.filled(tri.cellFaceIDs, -1))
+    del tri
+
+    tracemalloc.start()
+    start = time.time()
+    mesh = Mesh2D(*args)
+    if cellVertexIDs:
+        mesh._cellVertexIDs
+    elapsed = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print("%d\t%g\t%g" % (mesh.numberOfCells, elapsed, peak / mesh.numberOfCells))
+
+    del mesh, args
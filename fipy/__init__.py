@@ -39,28 +39,40 @@ import sys
 
 from fipy.boundaryConditions import *
 from fipy.meshes import *
-from fipy.solvers import *
+from fipy import solvers
+from fipy.solvers.solver import *
 from fipy.steppers import *
 from fipy.terms import *
 from fipy.tools import *
 from fipy.variables import *
 from fipy.viewers import *
 
-__all__ = []
-__all__.extend(boundaryConditions.__all__)
-__all__.extend(meshes.__all__)
-__all__.extend(solvers.__all__)
-__all__.extend(steppers.__all__)
-__all__.extend(terms.__all__)
-__all__.extend(tools.__all__)
-__all__.extend(variables.__all__)
-__all__.extend(viewers.__all__)
+_all = []
+_all.extend(boundaryConditions.__all__)
+_all.extend(meshes.__all__)
+_all.extend(steppers.__all__)
+_all.extend(terms.__all__)
+_all.extend(tools.__all__)
+_all.extend(variables.__all__)
+_all.extend(viewers.__all__)
+
+def __getattr__(name):
+    # the solvers are looked up, and their solver package imported,
+    # only when first needed
+    if name == "__all__":
+        return _all + list(solvers.__all__)
+    elif not name.startswith("__"):
+        try:
+            return getattr(solvers, name)
+        except AttributeError:
+            pass
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 # fipy needs to export raw_input whether or not parallel
 
 input_original = input
 
-if parallelComm.Nproc > 1:
+if solvers._Nproc > 1:
     def mpi_input(prompt=""):
         parallelComm.Barrier()
         sys.stdout.flush()
@@ -72,10 +84,10 @@ if parallelComm.Nproc > 1:
             return ""
     input = mpi_input
 
-__all__.extend(['input', 'input_original'])
+_all.extend(['input', 'input_original'])
 
 from future.utils import text_to_native_str
-__all__ = [text_to_native_str(n) for n in __all__]
+_all = [text_to_native_str(n) for n in _all]
 
 _saved_stdout = sys.stdout
 
@@ -147,3 +159,6 @@ def test(*args):
 from ._version import get_versions
 __version__ = get_versions()['version']
 del get_versions
+
+from fipy.solvers.solverPackages import _honorModuleGetattr
+_honorModuleGetattr(__name__)
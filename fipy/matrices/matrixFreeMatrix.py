@@ -0,0 +1,328 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tools import numerix
+from fipy.matrices.sparseMatrix import _SparseMatrix
+
+class _MatrixFreeMatrix(_SparseMatrix):
+    """Square matrix that is applied without ever being assembled.
+
+    The diagonal is held as a vector and the elements added off the
+    diagonal are kept as the `(vector, id1, id2)` arrays they were added
+    with, typically coefficients on the faces and the IDs of the cells
+    on either side.  Multiplying by a vector gathers from the cells and
+    scatters back into them with `numerix.bincount`, so no sparse matrix
+    is ever built.
+
+    >>> L = _MatrixFreeMatrix(size=3)
+    >>> L.addAt([3., 10., numerix.pi, 2.5], [0, 0, 1, 2], [2, 1, 1, 0])
+    >>> L.addAt([1.73, 2.2, 8.4, 3.9, 1.23], [1, 2, 0, 0, 1], [2, 2, 0, 0, 2])
+    >>> print(L)
+    12.300000  10.000000   3.000000  
+        ---     3.141593   2.960000  
+     2.500000      ---     2.200000  
+    >>> print(numerix.allclose(L * (1., 2., 3.), (41.3, 15.16318531, 9.1)))
+    True
+    >>> print(numerix.allclose((1., 2., 3.) * L, (19.8, 16.28318531, 15.52)))
+    True
+    >>> print(numerix.allclose(L.takeDiagonal(), (12.3, numerix.pi, 2.2)))
+    True
+
+    Matrices add and scale without being assembled either
+
+    >>> M = _MatrixFreeMatrix(size=3)
+    >>> M.addAtDiagonal(1.)
+    >>> print(numerix.allclose((L - 2 * M).numpyArray,
+    ...                        L.numpyArray - 2 * numerix.identity(3)))
+    True
+
+    and can be handed to the SciPy Krylov solvers as a `LinearOperator`
+
+    >>> from scipy.sparse.linalg import gmres
+    >>> x, info = gmres(L.matrix, L * (1., 2., 3.), tol=1e-12, atol=0.)
+    >>> print(numerix.allclose(x, (1., 2., 3.)))
+    True
+    """
+
+    def __init__(self, size):
+        self._size = size
+        self._diagonal = numerix.zeros((size,), 'd')
+        self._blocks = []
+        self._offDiagonal = None
+
+    @property
+    def _shape(self):
+        return (self._size, self._size)
+
+    @property
+    def _range(self):
+        return list(range(self._shape[1])), list(range(self._shape[0]))
+
+    def _new(self):
+        return _MatrixFreeMatrix(size=self._size)
+
+    def copy(self):
+        copy = self._new()
+        copy._diagonal = self._diagonal.copy()
+        copy._blocks = list(self._blocks)
+        return copy
+
+    @property
+    def _offDiagonalElements(self):
+        """The `(vector, id1, id2)` of all off-diagonal elements, joined
+        """
+        if self._offDiagonal is None:
+            if len(self._blocks) == 0:
+                self._offDiagonal = (numerix.zeros((0,), 'd'),
+                                     numerix.zeros((0,), 'l'),
+                                     numerix.zeros((0,), 'l'))
+            elif len(self._blocks) == 1:
+                self._offDiagonal = self._blocks[0]
+            else:
+                self._offDiagonal = tuple(numerix.concatenate(arrays)
+                                          for arrays in zip(*self._blocks))
+                self._blocks = [self._offDiagonal]
+        return self._offDiagonal
+
+    def addAt(self, vector, id1, id2):
+        vector = numerix.asarray(vector, dtype=float).ravel()
+        id1 = numerix.asarray(id1).ravel()
+        id2 = numerix.asarray(id2).ravel()
+        assert(len(id1) == len(id2) == len(vector))
+
+        diagonal = (id1 == id2)
+        self._diagonal += numerix.bincount(id1[diagonal],
+                                           weights=vector[diagonal],
+                                           minlength=self._size)
+        if not diagonal.all():
+            offDiagonal = ~diagonal
+            self._blocks.append((vector[offDiagonal],
+                                 id1[offDiagonal],
+                                 id2[offDiagonal]))
+            self._offDiagonal = None
+
+    def addAtDiagonal(self, vector):
+        if type(vector) in [type(1), type(1.)]:
+            self._diagonal += vector
+        else:
+            vector = numerix.asarray(vector, dtype=float).ravel()
+            self._diagonal[:len(vector)] += vector
+
+    def putDiagonal(self, vector):
+        if type(vector) in [type(1), type(1.)]:
+            self._diagonal[:] = vector
+        else:
+            vector = numerix.asarray(vector, dtype=float).ravel()
+            self._diagonal[:len(vector)] = vector
+
+    def put(self, vector, id1, id2):
+        """
+        Put elements of `vector` at positions of the matrix corresponding to (`id1`, `id2`)
+
+            >>> L = _MatrixFreeMatrix(size=3)
+            >>> L.addAt([1., 1., 1.], [0, 1, 2], [1, 1, 0])
+            >>> L.put([3., 10., numerix.pi, 2.5], [0, 0, 1, 2], [2, 1, 1, 0])
+            >>> print(L)
+                ---    10.000000   3.000000  
+                ---     3.141593      ---    
+             2.500000      ---        ---    
+        """
+        vector = numerix.asarray(vector, dtype=float).ravel()
+        id1 = numerix.asarray(id1).ravel()
+        id2 = numerix.asarray(id2).ravel()
+        assert(len(id1) == len(id2) == len(vector))
+
+        # done in such a way to vectorize everything
+        current = numerix.asarray(self._assembled()[id1, id2]).ravel()
+        self.addAt(vector - current, id1, id2)
+
+    def takeDiagonal(self):
+        return self._diagonal.copy()
+
+    def take(self, id1, id2):
+        return numerix.array([self[i, j] for i, j in zip(id1, id2)], 'd')
+
+    def __getitem__(self, index):
+        return self._assembled()[index]
+
+    def __iadd__(self, other):
+        return self._iadd(other)
+
+    def __isub__(self, other):
+        return self._iadd(other, sign=-1)
+
+    def _iadd(self, other, sign=1):
+        if isinstance(other, _MatrixFreeMatrix):
+            self._diagonal += sign * other._diagonal
+            if sign == 1:
+                self._blocks.extend(other._blocks)
+            else:
+                self._blocks.extend([(-vector, id1, id2)
+                                     for vector, id1, id2 in other._blocks])
+            self._offDiagonal = None
+        elif other != 0:
+            raise TypeError("only matrix-free matrices can be added to a matrix-free matrix")
+        return self
+
+    def __add__(self, other):
+        return self.copy()._iadd(other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.copy()._iadd(other, sign=-1)
+
+    def __rsub__(self, other):
+        return (-self)._iadd(other)
+
+    def _scaled(self, factor):
+        scaled = self._new()
+        scaled._diagonal = self._diagonal * factor
+        scaled._blocks = [(vector * factor, id1, id2)
+                          for vector, id1, id2 in self._blocks]
+        return scaled
+
+    def _product(self, other):
+        """The product with another matrix-free matrix
+
+        Products are only needed to build higher-order terms, so the
+        factors are assembled, multiplied, and the elements of the
+        product are kept like any others.
+        """
+        if not isinstance(other, _MatrixFreeMatrix):
+            raise TypeError("a matrix-free matrix can only be multiplied by another matrix-free matrix")
+
+        product = (self._assembled() * other._assembled()).tocoo()
+        result = self._new()
+        result.addAt(product.data, product.row, product.col)
+        return result
+
+    def __mul__(self, other):
+        """
+        Multiply a matrix-free matrix by another
+
+            >>> L1 = _MatrixFreeMatrix(size=3)
+            >>> L1.addAt([3., 10., numerix.pi, 2.5], [0, 0, 1, 2], [2, 1, 1, 0])
+            >>> L2 = _MatrixFreeMatrix(size=3)
+            >>> L2.addAt([1., 1., 1., 4.38, 12357.2, 1.1], [0, 1, 2, 2, 1, 0], [0, 1, 2, 1, 0, 2])
+            >>> print(L1 * L2)
+             1.24e+05  23.140000   3.000000  
+             3.88e+04   3.141593      ---    
+             2.500000      ---     2.750000  
+
+        by a scalar, or by a vector.
+        """
+        if isinstance(other, _SparseMatrix):
+            return self._product(other)
+        elif numerix.shape(other) == ():
+            return self._scaled(other)
+        else:
+            return self._matvec(other)
+
+    def __rmul__(self, other):
+        if isinstance(other, _SparseMatrix):
+            raise TypeError("a matrix-free matrix can only be multiplied by another matrix-free matrix")
+        elif numerix.shape(other) == ():
+            return self._scaled(other)
+        else:
+            return self._rmatvec(other)
+
+    def _matvec(self, x):
+        x = numerix.asarray(x, dtype=float).ravel()
+        vector, id1, id2 = self._offDiagonalElements
+        return (self._diagonal * x
+                + numerix.bincount(id1, weights=vector * x[id2],
+                                   minlength=self._size))
+
+    def _rmatvec(self, x):
+        x = numerix.asarray(x, dtype=float).ravel()
+        vector, id1, id2 = self._offDiagonalElements
+        return (self._diagonal * x
+                + numerix.bincount(id2, weights=vector * x[id1],
+                                   minlength=self._size))
+
+    def matvec(self, x):
+        """This method is required for scipy solvers.
+        """
+        return self._matvec(x)
+
+    @property
+    def matrix(self):
+        """The matrix as a `scipy.sparse.linalg.LinearOperator`
+        """
+        from scipy.sparse.linalg import LinearOperator
+        return LinearOperator(self._shape, matvec=self._matvec,
+                              rmatvec=self._rmatvec, dtype=float)
+
+    def _assembled(self):
+        """The matrix, assembled as a `scipy.sparse.csr_matrix`
+        """
+        from scipy import sparse
+        vector, id1, id2 = self._offDiagonalElements
+        return (sparse.diags(self._diagonal)
+                + sparse.csr_matrix((vector, (id1, id2)), shape=self._shape)).tocsr()
+
+    def asformat(self, *args, **kwargs):
+        return self._assembled().asformat(*args, **kwargs)
+
+    @property
+    def numpyArray(self):
+        return self._assembled().toarray()
+
+class _MatrixFreeMeshMatrix(_MatrixFreeMatrix):
+    def __init__(self, mesh, bandwidth=0, sizeHint=None, matrix=None, numberOfVariables=1, numberOfEquations=1, storeZeros=True):
+        """Creates a `_MatrixFreeMatrix` associated with a `Mesh`.
+
+        Parameters
+        ----------
+        mesh : ~fipy.meshes.mesh.Mesh
+            The `Mesh` to assemble the matrix for.
+        bandwidth : int
+            Ignored.
+        numberOfVariables : int
+            The columns of the matrix is determined by `numberOfVariables * self.mesh.numberOfCells`.
+        numberOfEquations : int
+            The rows of the matrix is determined by `numberOfEquations * self.mesh.numberOfCells`.
+        storeZeros : bool
+            Ignored.
+        """
+        self.mesh = mesh
+        self.numberOfVariables = numberOfVariables
+        assert numberOfEquations == self.numberOfVariables
+        _MatrixFreeMatrix.__init__(self, size=self.numberOfVariables * self.mesh.numberOfCells)
+
+    def _new(self):
+        return _MatrixFreeMeshMatrix(mesh=self.mesh, numberOfVariables=self.numberOfVariables,
+                                     numberOfEquations=self.numberOfVariables)
+
+    def _assembledMeshMatrix(self):
+        """The matrix, assembled as a `_ScipyMeshMatrix`, e.g., for
+        building a preconditioner
+        """
+        from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
+        return _ScipyMeshMatrix(mesh=self.mesh, matrix=self._assembled(),
+                                numberOfVariables=self.numberOfVariables,
+                                numberOfEquations=self.numberOfVariables)
+
+def _matrixFreeClassFor(SparseMatrix):
+    """The matrix-free class to use in place of `SparseMatrix`
+
+    Matrices that are only ever multiplied by a vector, such as those of
+    explicit terms, need not be assembled.  The offset matrices of
+    coupled and vector equations are assembled as before.
+    """
+    if hasattr(SparseMatrix, "equationIndex"):
+        return SparseMatrix
+    else:
+        return _MatrixFreeMeshMatrix
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
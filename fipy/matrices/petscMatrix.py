@@ -29,6 +29,53 @@ class _PETScMatrix(_SparseMatrix):
     def copy(self):
         return _PETScMatrix(matrix=self.matrix.copy())
         
+    def _insertInto(self, matrix):
+        """Replace the values of the `Mat` `matrix` with those of this matrix
+
+        `matrix` is zeroed and keeps its nonzero pattern, which must hold
+        every nonzero of this matrix. It is left for the caller to
+        assemble.
+
+        >>> L = _PETScMatrixFromShape(rows=3, cols=3, bandwidth=2)
+        >>> L.put([3., 10., numerix.pi, 2.5], [0, 0, 1, 2], [2, 1, 1, 0])
+        >>> L.matrix.assemble()
+        >>> held = L.matrix.copy()
+        >>> M = _PETScMatrixFromShape(rows=3, cols=3, bandwidth=2)
+        >>> M.put([-1., 2.], [0, 2], [2, 0])
+        >>> print(M._insertInto(held))
+        True
+        >>> held.assemble()
+        >>> print(numerix.allclose(_PETScMatrix(matrix=held).numpyArray,
+        ...                        [[0., 0., -1.],
+        ...                         [0., 0., 0.],
+        ...                         [2., 0., 0.]]))
+        True
+
+        A nonzero outside the pattern of `matrix` is not inserted
+
+        >>> M = _PETScMatrixFromShape(rows=3, cols=3, bandwidth=2)
+        >>> M.put([1.], [2], [2])
+        >>> print(M._insertInto(held))
+        False
+
+        Returns
+        -------
+        bool
+            Whether the values fit in the pattern of `matrix`.
+        """
+        self.matrix.assemblyBegin()
+        self.matrix.assemblyEnd()
+        indptr, indices, values = self.matrix.getValuesCSR()
+
+        matrix.zeroEntries()
+        matrix.setOption(PETSc.Mat.Option.NEW_NONZERO_LOCATION_ERR, True)
+        try:
+            matrix.setValuesCSR(indptr, indices, values)
+        except PETSc.Error:
+            return False
+
+        return True
+
     def __getitem__(self, index):
         self.matrix.assemblyBegin()
         self.matrix.assemblyEnd()
@@ -595,7 +642,7 @@ class _PETScMeshMatrix(_PETScMatrixFromShape):
             
         return self._ghosts_
         
-    def _fipy2petscGhost(self, var):
+    def _fipy2petscGhost(self, var, vec=None):
         """Convert a FiPy Variable to a PETSc `GhostVec`
         
         Moves the ghosts to the end, as necessary. 
@@ -622,9 +669,20 @@ class _PETScMeshMatrix(_PETScMatrixFromShape):
         ```
         
         where the [a, b] are the global ghost indices
+
+        If `vec` is a `GhostVec` of the same layout, e.g., from a previous
+        call, its values are replaced in place, rather than creating a
+        new `GhostVec` and its ghost scatter.
         """
         corporeal = numerix.asarray(var[..., self._bodies]).ravel()
         incorporeal = numerix.asarray(var[..., ~self._bodies]).ravel()
+
+        if vec is not None and vec.getLocalSize() == len(corporeal):
+            with vec.localForm() as lf:
+                lf.array[:len(corporeal)] = corporeal
+                lf.array[len(corporeal):] = incorporeal
+            return vec
+
         array = numerix.concatenate([corporeal, incorporeal])
 
         comm = self.mesh.communicator.petsc4py_comm
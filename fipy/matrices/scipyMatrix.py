@@ -1,3 +1,4 @@
+from __future__ import print_function
 from __future__ import unicode_literals
 from builtins import range
 __docformat__ = 'restructuredtext'
@@ -7,7 +8,7 @@ __all__ = []
 import scipy.sparse as sp
 from fipy.tools import numerix
 
-from fipy.matrices.sparseMatrix import _SparseMatrix
+from fipy.matrices.sparseMatrix import _SparseMatrix, _StencilStructure
 
 class _ScipyMatrix(_SparseMatrix):
 
@@ -16,6 +17,43 @@ class _ScipyMatrix(_SparseMatrix):
     `_ScipyMatrix` is always `NxN`.
     Allows basic python operations __add__, __sub__ etc.
     Facilitate matrix populating in an easy way.
+
+    Elements added with `addAt()`, and those of matrices added in
+    place, are collected in a buffer of (value, row, column) triplets and
+    only converted to CSR when the buffer is full or the `matrix` is next
+    needed.
+
+        >>> L = _ScipyMatrixFromShape(size=3)
+        >>> L.addAt([1., 2.], [0, 1], [0, 1])
+        >>> M = _ScipyMatrixFromShape(size=3)
+        >>> M.addAt([1., 1., 1.], [0, 1, 2], [0, 1, 2])
+        >>> L += M
+        >>> L.addAt([3., 4.], [0, 2], [0, 1])
+        >>> print(L._tripletCount)
+        7
+        >>> print(L)
+         5.000000      ---        ---    
+            ---     3.000000      ---    
+            ---     4.000000   1.000000  
+        >>> print(L._tripletCount)
+        0
+
+    Contributions too large for what is left of the buffer fill it, and
+    the rest is collected after it has been converted
+
+        >>> L = _ScipyMatrixFromShape(size=3)
+        >>> L._tripletBufferSize = 4
+        >>> L.addAt([1., 2., 3.], [0, 1, 2], [0, 0, 0])
+        >>> L.addAt(numerix.arange(10.), [0, 1, 2, 0, 1, 2, 0, 1, 2, 0], [0] * 10)
+        >>> print(L._tripletCount)
+        1
+        >>> L.addAt([1., 2.], [0, 1], [1, 1])
+        >>> print(L._tripletCount)
+        3
+        >>> print(L)
+        19.000000   1.000000      ---    
+        14.000000   2.000000      ---    
+        18.000000      ---        ---    
     """
 
     def __init__(self, matrix):
@@ -28,9 +66,108 @@ class _ScipyMatrix(_SparseMatrix):
         """
         self.matrix = matrix
 
+    # contributions of any size are collected in a buffer of triplets and
+    # converted to CSR together, one bufferful at a time.  The buffer
+    # grows to at most this many triplets, about 8 MB, which holds all
+    # of the contributions to the matrix of a 100x100 grid, while keeping
+    # the writes of each conversion within reach of the cache on larger
+    # meshes.
+    _tripletBufferSize = 2**19
+    def _getMatrix(self):
+        self._convertTriplets()
+        return self._matrix
+
+    def _setMatrix(self, matrix):
+        self._matrix = matrix
+        self._tripletBuffer = None
+        self._tripletCount = 0
+
+    def _delMatrix(self):
+        del self._matrix
+        del self._tripletBuffer
+
+    matrix = property(_getMatrix, _setMatrix, _delMatrix)
+
+    def _convertTriplets(self):
+        """Add the collected triplets to the matrix, with a single
+        conversion that sums the duplicates
+        """
+        if self._tripletCount > 0:
+            values, rows, cols = [a[:self._tripletCount] for a in self._tripletBuffer]
+            self._tripletCount = 0
+            added = sp.coo_matrix((values, (rows, cols)),
+                                  shape=self._matrix.shape).tocsr()
+            if self._matrix.nnz > 0:
+                added = self._matrix + added
+            self._matrix = added
+
+    def _growTripletBuffer(self, size):
+        """Make room in the buffer for `size` triplets, or as many as it
+        may hold, keeping those already collected
+        """
+        if self._tripletBuffer is None:
+            # the first contribution is seldom the only one
+            capacity = 4 * size
+        else:
+            capacity = max(2 * len(self._tripletBuffer[0]), size)
+        capacity = min(capacity, self._tripletBufferSize)
+
+        indexType = 'i' if max(self._shape) < 2**31 else 'l'
+        buffer = (numerix.empty((capacity,), 'd'),
+                  numerix.empty((capacity,), indexType),
+                  numerix.empty((capacity,), indexType))
+        if self._tripletCount > 0:
+            for new, old in zip(buffer, self._tripletBuffer):
+                new[:self._tripletCount] = old[:self._tripletCount]
+        self._tripletBuffer = buffer
+
+    def _addTriplets(self, vector, id1, id2, sign=1):
+        vector = numerix.asarray(vector, dtype=float).ravel()
+        id1 = numerix.asarray(id1).ravel()
+        id2 = numerix.asarray(id2).ravel()
+
+        done = 0
+        while done < len(vector):
+            capacity = 0
+            if self._tripletBuffer is not None:
+                capacity = len(self._tripletBuffer[0])
+            needed = self._tripletCount + len(vector) - done
+            if needed > capacity and capacity < self._tripletBufferSize:
+                self._growTripletBuffer(needed)
+                capacity = len(self._tripletBuffer[0])
+            elif self._tripletCount == capacity:
+                self._convertTriplets()
+
+            start = self._tripletCount
+            count = min(len(vector) - done, capacity - start)
+            end = start + count
+            values, rows, cols = self._tripletBuffer
+            values[start:end] = vector[done:done + count]
+            if sign != 1:
+                values[start:end] *= sign
+            rows[start:end] = id1[done:done + count]
+            cols[start:end] = id2[done:done + count]
+            self._tripletCount = end
+            done += count
+
     def getCoupledClass(self):
         return _CoupledScipyMeshMatrix
 
+    @classmethod
+    def _withStructure(cls, structure):
+        class _StructuredScipyMatrix(cls):
+            _structure = structure
+
+        return _StructuredScipyMatrix
+
+    @property
+    def _sharesStructure(self):
+        """Whether this matrix is still laid out on its frozen pattern
+        """
+        return (self._structure is not None
+                and self._structure.frozen
+                and self.matrix.indptr is self._structure.indptr)
+
     def copy(self):
         return _ScipyMatrix(matrix=self.matrix.copy())
 
@@ -44,8 +181,31 @@ class _ScipyMatrix(_SparseMatrix):
     def __iadd__(self, other):
         return self._iadd(other)
 
+    def _embeddingOf(self, other):
+        """Slots of the frozen pattern of this matrix that hold the
+        elements of `other`, if both are still laid out on their patterns
+        and the one holds the other
+        """
+        if (self._sharesStructure
+            and isinstance(other, _ScipyMatrix)
+            and other._sharesStructure):
+            return self._structure._embedding(other._structure)
+        else:
+            return None
+
     def _iadd(self, other, sign=1):
-        if hasattr(other, "matrix"):
+        slots = self._embeddingOf(other)
+        if slots is not None:
+            self.matrix.data[slots] += sign * other.matrix.data
+        elif (isinstance(other, _ScipyMatrix)
+              and other._matrix.shape == self._matrix.shape):
+            # defer the conversion of the triplets until the matrix is needed
+            if other._tripletCount > 0:
+                self._addTriplets(*[a[:other._tripletCount] for a in other._tripletBuffer],
+                                  sign=sign)
+            if other._matrix.nnz > 0:
+                self._matrix = self._matrix + (sign * other._matrix)
+        elif hasattr(other, "matrix"):
             self.matrix = self.matrix + (sign * other.matrix)
         elif type(other) in [float, int]:
             fillVec = numerix.repeat(other, self.matrix.nnz)
@@ -155,7 +315,7 @@ class _ScipyMatrix(_SparseMatrix):
 
     @property
     def _shape(self):
-        return self.matrix.shape
+        return self._matrix.shape
 
     @property
     def _range(self):
@@ -199,6 +359,12 @@ class _ScipyMatrix(_SparseMatrix):
         if type(vector) in [int, float]:
             vector = numerix.repeat(vector, self._shape[0])
 
+        if self._sharesStructure:
+            slots = self._structure._diagonal()
+            if slots is not None and len(slots) == len(vector):
+                self.matrix.data[slots] = vector
+                return
+
         self.matrix.setdiag(vector)
 
     def take(self, id1, id2):
@@ -221,9 +387,17 @@ class _ScipyMatrix(_SparseMatrix):
         """
         assert(len(id1) == len(id2) == len(vector))
 
-        temp = sp.csr_matrix((vector, (id1, id2)), self.matrix.shape)
+        if self._sharesStructure:
+            slots = self._structure._scatter(id1, id2)
+            if slots is not None:
+                self.matrix.data += numerix.bincount(slots,
+                                                     weights=numerix.asarray(vector, dtype=float),
+                                                     minlength=self._structure.nnz)
+                return
+        elif self._structure is not None and not self._structure.frozen:
+            self._structure._record(self._shape, id1, id2)
 
-        self.matrix = self.matrix + temp
+        self._addTriplets(vector, id1, id2)
 
     def addAtDiagonal(self, vector):
         if type(vector) in [type(1), type(1.)]:
@@ -266,7 +440,17 @@ class _ScipyMatrixFromShape(_ScipyMatrix):
             Instructs scipy to store zero values if possible.
         """
         if matrix is None:
-            matrix = sp.csr_matrix((size, size))
+            structure = self._structure
+            if (structure is not None
+                and structure.frozen
+                and structure.shape == (size, size)):
+                matrix = sp.csr_matrix((numerix.zeros(structure.nnz, 'd'),
+                                        structure.indices,
+                                        structure.indptr),
+                                       shape=structure.shape, copy=False)
+                matrix.has_sorted_indices = True
+            else:
+                matrix = sp.csr_matrix((size, size))
 
         _ScipyMatrix.__init__(self, matrix=matrix)
 
@@ -293,6 +477,15 @@ class _ScipyMeshMatrix(_ScipyMatrixFromShape):
         self.numberOfVariables = numberOfVariables
         size = self.numberOfVariables * self.mesh.numberOfCells
         assert numberOfEquations == self.numberOfVariables
+
+        stencilShape = self.mesh._cellStencilShape
+        if (matrix is None
+            and self._structure is None
+            and self.numberOfVariables == 1
+            and stencilShape is not None):
+            # the pattern of a grid is known without recording it
+            self._structure = _StencilStructure.forShape(stencilShape)
+
         _ScipyMatrixFromShape.__init__(self, size=size, matrix=matrix)
 
     def __mul__(self, other):
@@ -19,6 +19,22 @@ class _SparseMatrix(object):
     numpyArray = property()
     _shape     = property()
 
+    _structure = None
+
+    @classmethod
+    def _withStructure(cls, structure):
+        """Bind a `_SparseMatrixStructure` to this matrix class.
+
+        Matrix classes that cannot reuse a sparsity pattern return
+        themselves unchanged.
+
+        Parameters
+        ----------
+        structure : ~fipy.matrices.sparseMatrix._SparseMatrixStructure
+            Sparsity pattern shared by all matrices of the returned class.
+        """
+        return cls
+
     __array_priority__ = 100.0
 
     def __array_wrap(self, arr, context=None):
@@ -124,3 +140,569 @@ class _SparseMatrix(object):
 ##      indices = numerix.indices(shape)
 ##         numMatrix = self.take(indices[0].ravel(), indices[1].ravel())
 ##      return numerix.reshape(numMatrix, shape)
+
+class _MatrixRequiredError(Exception):
+    def __init__(self, s='The matrix is required, but was not assembled.'):
+        Exception.__init__(self, s)
+
+class _UnassembledMatrix(_SparseMatrix):
+    """Stands in for a matrix that a `Term` does not need to assemble.
+
+    Elements added to it are discarded, which allows the right-hand-side
+    vector of a `Term` to be built on its own.  Any operation that
+    needs the actual matrix raises `_MatrixRequiredError`.
+
+    >>> L = _UnassembledMatrix(mesh=None)
+    >>> L.addAt((1., 2.), (0, 1), (0, 1))
+    >>> L += _UnassembledMatrix(mesh=None)
+    >>> L * (1., 2.) # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+        ...
+    _MatrixRequiredError: The matrix is required, but was not assembled.
+    """
+
+    def __init__(self, mesh, bandwidth=0, sizeHint=None, matrix=None,
+                 numberOfVariables=1, numberOfEquations=1, storeZeros=True):
+        self.mesh = mesh
+
+    def __iadd__(self, other):
+        return self
+
+    __isub__ = __iadd__
+
+    def _required(self, *args, **kwargs):
+        raise _MatrixRequiredError
+
+    __add__ = __radd__ = __sub__ = __rsub__ = _required
+    __mul__ = __rmul__ = __neg__ = _required
+    take = takeDiagonal = copy = _required
+    matrix = property(_required)
+    numpyArray = property(_required)
+
+    def put(self, vector, id1, id2):
+        pass
+
+    def putDiagonal(self, vector):
+        pass
+
+    def addAt(self, vector, id1, id2):
+        pass
+
+    def addAtDiagonal(self, vector):
+        pass
+
+class _SparseMatrixStructure(object):
+    """Sparsity pattern of a matrix that is rebuilt many times.
+
+    The first build after creation (or after the pattern is invalidated)
+    records the `(id1, id2)` coordinates of every element added to any
+    matrix bound to this structure.  At the end of that build, the
+    coordinates are frozen into a sorted CSR pattern.  Subsequent builds
+    create their matrices directly on this pattern and only scatter
+    values into its data array, using a `(id1, id2)` to nonzero-slot map
+    that is cached for each call to `addAt()`.
+
+    If a later build adds an element outside the frozen pattern, the
+    pattern is discarded at the end of that build and recorded afresh on
+    the next one.
+
+    >>> s = _SparseMatrixStructure()
+    >>> s._beginBuild()
+    >>> s._record(shape=(3, 3), id1=[0, 1, 2, 0], id2=[0, 1, 2, 1])
+    >>> s._record(shape=(3, 3), id1=[2, 0], id2=[1, 1])
+    >>> s._endBuild()
+    >>> print(s.frozen)
+    True
+    >>> print(s.indptr)
+    [0 2 3 5]
+    >>> print(s.indices)
+    [0 1 1 1 2]
+
+    Coordinates map to slots in the pattern, with repeats as needed
+
+    >>> s._beginBuild()
+    >>> print(s._scatter(id1=[2, 0, 0], id2=[2, 1, 1]))
+    [4 1 1]
+
+    and coordinates outside the pattern invalidate it
+
+    >>> print(s._scatter(id1=[1], id2=[0]))
+    None
+    >>> s._endBuild()
+    >>> print(s.frozen)
+    False
+    """
+
+    def __init__(self):
+        self.shape = None
+        self.indptr = None
+        self.indices = None
+        self._keys = None
+        self._recorded = []
+        self._scatterMaps = []
+        self._call = 0
+        self._valid = True
+        self._diagonalSlots = None
+
+    @property
+    def frozen(self):
+        return self._keys is not None
+
+    @property
+    def nnz(self):
+        return len(self._keys)
+
+    def _coordinatesToKeys(self, id1, id2):
+        id1 = numerix.asarray(id1, dtype=numerix.int64).ravel()
+        id2 = numerix.asarray(id2, dtype=numerix.int64).ravel()
+        return id1 * self.shape[1] + id2
+
+    def _beginBuild(self):
+        self._call = 0
+        self._valid = True
+
+    def _endBuild(self):
+        if not self._valid:
+            self.invalidate()
+        elif not self.frozen and len(self._recorded) > 0:
+            self._freeze()
+
+    def _record(self, shape, id1, id2):
+        """Note the coordinates added by one `addAt()` while not frozen
+        """
+        if self.shape is None:
+            self.shape = tuple(shape)
+        elif self.shape != tuple(shape):
+            self._valid = False
+
+        if self._valid:
+            self._recorded.append(self._coordinatesToKeys(id1, id2))
+
+    def _freeze(self):
+        keys = numerix.unique(numerix.concatenate(self._recorded))
+        self._recorded = []
+
+        rows, cols = self.shape
+        if max(len(keys), rows, cols) < numerix.iinfo(numerix.int32).max:
+            dtype = numerix.int32
+        else:
+            dtype = numerix.int64
+
+        self.indptr = numerix.searchsorted(keys // cols,
+                                           numerix.arange(rows + 1)).astype(dtype)
+        self.indices = (keys % cols).astype(dtype)
+        self._keys = keys
+
+    def invalidate(self):
+        """Discard the pattern so that it is recorded on the next build
+        """
+        self.__init__()
+
+    def _lookup(self, keys):
+        slots = numerix.searchsorted(self._keys, keys)
+        if (len(slots) > 0
+            and ((slots.max() >= self.nnz)
+                 or not numerix.array_equal(self._keys[slots], keys))):
+            return None
+        return slots
+
+    def _scatter(self, id1, id2):
+        """Slots of the pattern corresponding to (`id1`, `id2`)
+
+        The map for the `n`-th call in a build is cached and reused
+        whenever the `n`-th call of a later build has the same coordinates.
+
+        Returns `None` (and invalidates the pattern at the end of the
+        build) if any coordinate falls outside of the pattern.
+        """
+        keys = self._coordinatesToKeys(id1, id2)
+        call = self._call
+        self._call += 1
+
+        if call < len(self._scatterMaps):
+            cachedKeys, slots = self._scatterMaps[call]
+            if numerix.array_equal(cachedKeys, keys):
+                return slots
+
+        slots = self._lookup(keys)
+
+        if slots is None:
+            self._valid = False
+        elif call < len(self._scatterMaps):
+            self._scatterMaps[call] = (keys, slots)
+        elif call == len(self._scatterMaps):
+            self._scatterMaps.append((keys, slots))
+
+        return slots
+
+    def _embedding(self, other):
+        """Slots of this pattern that hold the elements of the pattern
+        `other`, or `None` if they are not known
+        """
+        if other is self:
+            return slice(None)
+        else:
+            return None
+
+    def _diagonal(self):
+        """Slots of the diagonal of the pattern, or `None` if incomplete
+        """
+        if self._diagonalSlots is None:
+            N = min(self.shape)
+            self._diagonalSlots = self._lookup(self._coordinatesToKeys(numerix.arange(N),
+                                                                       numerix.arange(N)))
+        return self._diagonalSlots
+
+class _FixedStructure(_SparseMatrixStructure):
+    """Sparsity pattern that is known from the outset, so it is never
+    recorded, nor invalidated
+    """
+
+    @property
+    def frozen(self):
+        return True
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def _beginBuild(self):
+        pass
+
+    def _endBuild(self):
+        pass
+
+    def _record(self, shape, id1, id2):
+        pass
+
+    def invalidate(self):
+        """The pattern does not change
+        """
+        pass
+
+    @staticmethod
+    def _indexType(n):
+        if n < numerix.iinfo(numerix.int32).max:
+            return numerix.int32
+        else:
+            return numerix.int64
+
+class _StencilStructure(_FixedStructure):
+    """Sparsity pattern of a matrix on a grid of cells that only neighbor
+    the cells next to them along each axis.
+
+    The pattern is known from the number of cells along each axis, so it
+    is frozen from the outset.  An element at (`id1`, `id2`) lies at the
+    offset `id2 - id1` of row `id1` and its slot in the pattern is found
+    by looking up that offset in a table of the slots of each row, with
+    no pattern to record and no coordinates to sort.
+
+    >>> s = _StencilStructure.forShape((3, 2))
+    >>> print(s.indptr)
+    [ 0  3  7 10 13 17 20]
+    >>> print(s.indices)
+    [0 1 3 0 1 2 4 1 2 5 0 3 4 1 3 4 5 2 4 5]
+    >>> print(s._scatter(id1=[4, 0, 2], id2=[3, 3, 2]))
+    [14  2  8]
+    >>> print(s._diagonal())
+    [ 0  4  8 11 15 19]
+
+    Elements that are not next to each other fall outside of the pattern
+
+    >>> print(s._scatter(id1=[2], id2=[3]))
+    None
+
+    The same pattern is shared by all matrices on grids of the same shape
+
+    >>> print(_StencilStructure.forShape((3, 2)) is s)
+    True
+    """
+
+    _cache = {}
+
+    @classmethod
+    def forShape(cls, shape):
+        """The pattern of a grid of `shape` cells
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Number of cells along each axis, in order of increasing
+            stride of the cell IDs.
+        """
+        shape = tuple(int(n) for n in shape)
+        if shape not in cls._cache:
+            cls._cache[shape] = cls(shape)
+        return cls._cache[shape]
+
+    def __init__(self, shape):
+        _SparseMatrixStructure.__init__(self)
+
+        N = int(numerix.prod(shape))
+        self.shape = (N, N)
+
+        # offsets of the neighbors along the axes that have more than one
+        # cell, and whether each cell has them
+        index = numerix.indices(shape[::-1]).reshape((len(shape), N))[::-1]
+        offsets = [0]
+        present = [numerix.ones((N,), dtype=bool)]
+        stride = 1
+        for axis, n in enumerate(shape):
+            if n > 1:
+                offsets = [-stride] + offsets + [stride]
+                present = ([index[axis] > 0]
+                           + present
+                           + [index[axis] < n - 1])
+            stride *= n
+        self._offsets = numerix.array(offsets)
+        present = numerix.array(present).swapaxes(0, 1)
+
+        dtype = self._indexType(max(present.sum(), N))
+
+        self.indptr = numerix.concatenate(([0], numerix.cumsum(present.sum(axis=1)))).astype(dtype)
+        self.indices = (numerix.arange(N)[..., numerix.newaxis]
+                        + self._offsets)[present].astype(dtype)
+        self._slots = numerix.where(present,
+                                    self.indptr[:-1, numerix.newaxis]
+                                    + numerix.cumsum(present, axis=1) - 1,
+                                    -1).astype(dtype)
+        self._scatterMaps = {}
+
+    # the terms add at the same coordinates on every build, so the slots
+    # of the most recent coordinates are kept
+    _scatterCacheSize = 32
+
+    def _scatter(self, id1, id2):
+        """Slots of the pattern corresponding to (`id1`, `id2`), or `None`
+        if any coordinate falls outside of the pattern
+        """
+        id1 = numerix.asarray(id1).ravel()
+        id2 = numerix.asarray(id2).ravel()
+
+        key = (len(id1), id1[:4].tobytes(), id2[:4].tobytes(),
+               id1[-4:].tobytes(), id2[-4:].tobytes())
+        cached = self._scatterMaps.get(key)
+        if (cached is not None
+            and numerix.array_equal(cached[0], id1)
+            and numerix.array_equal(cached[1], id2)):
+            return cached[2]
+
+        offset = id2.astype(numerix.int64) - id1
+        column = numerix.searchsorted(self._offsets, offset).clip(max=len(self._offsets) - 1)
+        if not numerix.array_equal(self._offsets[column], offset):
+            return None
+
+        slots = self._slots[id1, column]
+        if len(slots) > 0 and slots.min() < 0:
+            return None
+
+        if len(self._scatterMaps) >= self._scatterCacheSize:
+            self._scatterMaps.clear()
+        self._scatterMaps[key] = (id1.copy(), id2.copy(), slots)
+
+        return slots
+
+    def _diagonal(self):
+        return self._slots[:, len(self._offsets) // 2]
+
+class _BlockStructure(_FixedStructure):
+    """Sparsity pattern of one (equation, variable) block of a coupled
+    matrix, which lays the pattern `block` of a single equation and
+    variable at the rows of the equation and the columns of the
+    variable.
+
+    >>> s = _BlockStructure(_StencilStructure.forShape((3,)),
+    ...                     shape=(6, 6), equationIndex=1, varIndex=0)
+    >>> print(s.indptr)
+    [0 0 0 0 2 5 7]
+    >>> print(s.indices)
+    [0 1 0 1 2 1 2]
+    >>> print(s._scatter(id1=[3, 4, 5], id2=[0, 1, 1]))
+    [0 3 5]
+
+    Elements of any other block fall outside of the pattern
+
+    >>> print(s._scatter(id1=[4], id2=[4]))
+    None
+    """
+
+    def __init__(self, block, shape, equationIndex, varIndex):
+        _FixedStructure.__init__(self)
+
+        self.shape = tuple(shape)
+        self.block = block
+        self.equationIndex = equationIndex
+        self.varIndex = varIndex
+
+        N = block.shape[0]
+        dtype = self._indexType(max(self.shape))
+        self.indptr = numerix.concatenate((numerix.zeros((equationIndex * N,), dtype),
+                                           block.indptr,
+                                           numerix.zeros((self.shape[0] - (equationIndex + 1) * N,),
+                                                         dtype) + block.nnz)).astype(dtype)
+        self.indices = (block.indices + varIndex * N).astype(dtype)
+
+    def _scatter(self, id1, id2):
+        """Slots of the pattern corresponding to (`id1`, `id2`), or `None`
+        if any coordinate falls outside of the block
+        """
+        N = self.block.shape[0]
+        row = numerix.asarray(id1).ravel() - self.equationIndex * N
+        col = numerix.asarray(id2).ravel() - self.varIndex * N
+        if (len(row) > 0
+            and (row.min() < 0 or row.max() >= N
+                 or col.min() < 0 or col.max() >= N)):
+            return None
+
+        return self.block._scatter(row, col)
+
+    def _diagonal(self):
+        """The diagonal of the coupled matrix is not all in one block
+        """
+        return None
+
+class _CoupledStructure(_FixedStructure):
+    """Sparsity pattern of a coupled matrix, which only holds the
+    (equation, variable) blocks that are not zero, each laid out on the
+    pattern `block` of a single equation and variable.
+
+    The rows of an equation hold the rows of each of its blocks in turn,
+    so the slot of each element of a block is known from its slot in
+    `block`.  These slots are worked out once, and a matrix of the
+    pattern of a block, given by `_block()`, is added to a matrix of this
+    pattern by adding its values at them, with no conversion.
+
+    >>> s = _CoupledStructure.forBlocks(_StencilStructure.forShape((3,)),
+    ...                                 blocks=[[0, 1], [1]])
+    >>> print(s.indptr)
+    [ 0  4 10 14 16 19 21]
+    >>> print(s.indices)
+    [0 1 3 4 0 1 2 3 4 5 1 2 4 5 3 4 3 4 5 4 5]
+    >>> print(s._embedding(s._block(0, 1)))
+    [ 2  3  7  8  9 12 13]
+    >>> print(s._embedding(s._block(1, 0)))
+    None
+    >>> print(s._scatter(id1=[4, 0, 1], id2=[5, 4, 1]))
+    [18  3  5]
+    >>> print(s._diagonal())
+    [ 0  5 11 14 17 20]
+
+    The same pattern is shared by all coupled matrices with the same
+    blocks
+
+    >>> print(_CoupledStructure.forBlocks(_StencilStructure.forShape((3,)),
+    ...                                   blocks=[[0, 1], [1]]) is s)
+    True
+    """
+
+    _cache = {}
+
+    @classmethod
+    def forBlocks(cls, block, blocks):
+        """The pattern of the non-zero `blocks` of a coupled matrix
+
+        Parameters
+        ----------
+        block : ~fipy.matrices.sparseMatrix._SparseMatrixStructure
+            Frozen pattern of each block.
+        blocks : list of list of int
+            For each equation, the indices of the variables with
+            non-zero blocks.
+        """
+        key = (block, tuple(tuple(sorted(varIndices)) for varIndices in blocks))
+        if key not in cls._cache:
+            cls._cache[key] = cls(block, [list(varIndices) for varIndices in key[1]])
+        return cls._cache[key]
+
+    def __init__(self, block, blocks):
+        _FixedStructure.__init__(self)
+
+        N = block.shape[0]
+        numberOfEquations = len(blocks)
+        self.shape = (numberOfEquations * N, numberOfEquations * N)
+        self.block = block
+
+        # the position of each block among those of its equation, and
+        # where the rows of each equation start
+        self._positions = -numerix.ones((numberOfEquations, numberOfEquations), 'l')
+        for equationIndex, varIndices in enumerate(blocks):
+            self._positions[equationIndex, varIndices] = numerix.arange(len(varIndices))
+        self._widths = numerix.array([len(varIndices) for varIndices in blocks], 'l')
+        self._starts = numerix.concatenate(([0], numerix.cumsum(self._widths * block.nnz)))
+
+        dtype = self._indexType(max(self._starts[-1], self.shape[0]))
+        self.indptr = numerix.concatenate([self._starts[i] + self._widths[i] * block.indptr[:-1]
+                                           for i in range(numberOfEquations)]
+                                          + [self._starts[-1:]]).astype(dtype)
+        self.indices = numerix.zeros((self._starts[-1],), dtype)
+
+        rows = numerix.repeat(numerix.arange(N), numerix.diff(block.indptr))
+        self._blocks = {}
+        self._blockSlots = {}
+        for equationIndex, varIndices in enumerate(blocks):
+            for varIndex in varIndices:
+                slots = self._slots(equationIndex, varIndex, rows,
+                                    numerix.arange(block.nnz))
+                self.indices[slots] = block.indices + varIndex * N
+                self._blockSlots[equationIndex, varIndex] = slots
+                self._blocks[equationIndex, varIndex] = _BlockStructure(block,
+                                                                        shape=self.shape,
+                                                                        equationIndex=equationIndex,
+                                                                        varIndex=varIndex)
+
+    def _slots(self, equationIndex, varIndex, row, blockSlot):
+        """Slots of the elements in `blockSlot` of the rows `row` of `block`,
+        in the block of `equationIndex` and `varIndex`
+        """
+        rowStart = self.block.indptr[row]
+        rowLength = self.block.indptr[row + 1] - rowStart
+        return (self._starts[equationIndex]
+                + self._widths[equationIndex] * rowStart
+                + self._positions[equationIndex, varIndex] * rowLength
+                + blockSlot - rowStart)
+
+    def _block(self, equationIndex, varIndex):
+        """The pattern of the block of `equationIndex` and `varIndex`, or
+        `None` if the block is zero
+        """
+        return self._blocks.get((equationIndex, varIndex))
+
+    def _embedding(self, other):
+        if other is self:
+            return slice(None)
+        elif (isinstance(other, _BlockStructure)
+              and self._block(other.equationIndex, other.varIndex) is other):
+            return self._blockSlots[other.equationIndex, other.varIndex]
+        else:
+            return None
+
+    def _scatter(self, id1, id2):
+        """Slots of the pattern corresponding to (`id1`, `id2`), or `None`
+        if any coordinate falls outside of the pattern
+        """
+        N = self.block.shape[0]
+        id1 = numerix.asarray(id1).ravel()
+        id2 = numerix.asarray(id2).ravel()
+        equationIndex, row = id1 // N, id1 % N
+        varIndex, col = id2 // N, id2 % N
+        if len(id1) > 0 and self._positions[equationIndex, varIndex].min() < 0:
+            return None
+
+        blockSlot = self.block._scatter(row, col)
+        if blockSlot is None:
+            return None
+
+        return self._slots(equationIndex, varIndex, row, blockSlot)
+
+    def _diagonal(self):
+        if self._diagonalSlots is None:
+            self._diagonalSlots = self._scatter(numerix.arange(self.shape[0]),
+                                                numerix.arange(self.shape[0]))
+        return self._diagonalSlots
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -20,6 +20,8 @@ elif solver == 'petsc':
 else:
     raise ImportError('Unknown solver package %s' % solver)
 
+docTestModuleNames = ('sparseMatrix', 'matrixFreeMatrix') + docTestModuleNames
+
 def _suite():
     return _LateImportDocTestSuite(docTestModuleNames=docTestModuleNames, base=__name__)
 
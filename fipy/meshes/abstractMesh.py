@@ -509,6 +509,14 @@ class AbstractMesh(object):
     def _maxFacesPerCell(self):
         raise NotImplementedError
 
+    @property
+    def _cellStencilShape(self):
+        """Number of cells along each axis, in order of increasing stride
+        of the cell IDs, when every cell only neighbors the cells next to
+        it along each axis, and `None` otherwise
+        """
+        return None
+
     @property
     def _numberOfVertices(self):
         if hasattr(self, 'numberOfVertices'):
@@ -1074,11 +1082,8 @@ class AbstractMesh(object):
 
     @property
     def _VTKCellType(self):
-        try:
-            from tvtk.api import tvtk
-        except ImportError as e:
-            from enthought.tvtk.api import tvtk
-        return tvtk.ConvexPointSet().cell_type
+        # VTK_CONVEX_POINT_SET
+        return 41
 
     @property
     def VTKCellDataSet(self):
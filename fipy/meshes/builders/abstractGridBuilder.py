@@ -17,7 +17,7 @@ class _AbstractGridBuilder(object):
     NumPtsCalcClass = None
 
     def buildGridData(self, ds, ns, overlap, communicator,
-                            cacheOccupiedNodes=False):
+                            cacheOccupiedNodes=False, periodicAxes=()):
         """
         Build and save any information relevant to the construction of a grid.
         Generalized to handle any dimension. Has side-effects.
@@ -43,6 +43,9 @@ class _AbstractGridBuilder(object):
             Number of grid spacings in each direction, e.g. `[nx, ny]`
         offset : list
             Displacement of grid spacings, e.g., `[Ox, Oy]`
+        periodicAxes : list
+            Axes that are not split between processors, if any other
+            axis can be
         """
 
         dim = len(ns)
@@ -78,33 +81,51 @@ class _AbstractGridBuilder(object):
         parallel stuff
         """
 
-        newNs = list(newNs)
+        globalNs = tuple(newNs)
 
-        procID = communicator.procID
+        rank = communicator.procID
         Nproc = communicator.Nproc
 
-        overlap = min(overlap, newNs[-1])
-        cellsPerNode = max(newNs[-1] // Nproc, overlap)
-        occupiedNodes = min(newNs[-1] // (cellsPerNode or 1), Nproc)
+        decomposableAxes = ([axis for axis in range(dim) if axis not in periodicAxes]
+                            or [dim - 1])
+        procGrid = self._calcProcessorGrid(globalNs, Nproc, overlap, decomposableAxes)
 
-        (firstOverlap,
-         secOverlap,
-         overlap) = self._buildOverlap(overlap, procID, occupiedNodes)
+        firstOverlaps = []
+        secOverlaps = []
+        offsets = []
+        localNs = []
+        occupiedNodes = 1
+        for n, nodes in zip(globalNs, procGrid):
+            # position of this processor along the axis, x varying fastest
+            nodeID = rank % nodes
+            rank //= nodes
 
-        offsetArg = min(procID, occupiedNodes-1) * cellsPerNode - firstOverlap
-        offset = self._packOffset(offsetArg)
+            axisOverlap = min(overlap, n)
+            cellsPerNode, occupied = self._calcCellsPerNode(n, nodes, axisOverlap)
 
-        """
-        local nx, [ny, [nz]] calculation
-        """
-        local_n = cellsPerNode * (procID < occupiedNodes)
+            (firstOverlap,
+             secOverlap) = self._buildOverlap(axisOverlap, nodeID, occupied)
+
+            offsets.append(min(nodeID, occupied - 1) * cellsPerNode - firstOverlap)
+
+            """
+            local nx, [ny, [nz]] calculation
+            """
+            local_n = cellsPerNode * (nodeID < occupied)
+
+            if nodeID == occupied - 1:
+                local_n += (n - cellsPerNode * occupied)
+
+            localNs.append(local_n + firstOverlap + secOverlap)
 
-        if procID == occupiedNodes - 1:
-            local_n += (newNs[-1] - cellsPerNode * occupiedNodes)
+            firstOverlaps.append(firstOverlap)
+            secOverlaps.append(secOverlap)
+            occupiedNodes *= occupied
 
-        local_n += firstOverlap + secOverlap
+        overlap = self._packOverlap(firstOverlaps, secOverlaps)
+        offset = self._packOffset(offsets)
 
-        newNs = tuple(newNs[:-1] + [local_n])
+        newNs = tuple(localNs)
 
         """
         post-parallel
@@ -133,6 +154,7 @@ class _AbstractGridBuilder(object):
         self.ns      = newNs
         self.scale   = scale
 
+        self.globalNs = globalNs
         self.globalNumberOfCells = globalNumCells
         self.globalNumberOfFaces = globalNumFaces
 
@@ -167,6 +189,7 @@ class _AbstractGridBuilder(object):
                 self.numberOfFaces,
                 self.numberOfCells,
                 self._calcShape(),
+                self.globalNs,
                 self._calcPhysicalShape(),
                 self._calcMeshSpacing()]
 
@@ -200,7 +223,8 @@ class _AbstractGridBuilder(object):
         """
         Dimensionally independent face-number calculation.
 
-        >>> from fipy.meshes.builders import *
+        >>> from fipy.meshes.builders import (_Grid1DBuilder, _Grid2DBuilder,
+        ...                                   _Grid3DBuilder)
 
         >>> gb = _Grid1DBuilder()
         >>> gb._calcGlobalNumFaces([1])
@@ -244,16 +268,89 @@ class _AbstractGridBuilder(object):
     def _calcNs(self, ns, ds):
         return self.NumPtsCalcClass.calcNs(ns, ds)
 
-    def _buildOverlap(self, overlap, procID, occupiedNodes):
-        (first, sec) = (overlap * (procID > 0) * (procID < occupiedNodes),
-                        overlap * (procID < occupiedNodes - 1))
+    @staticmethod
+    def _calcCellsPerNode(n, nodes, overlap):
+        """Cells given to each of `nodes` processors along an axis of `n` cells
+
+        Returns the number of cells per processor and the number of
+        processors that get any.
+        """
+        cellsPerNode = max(n // nodes, overlap)
+        occupiedNodes = min(n // (cellsPerNode or 1), nodes)
+
+        return cellsPerNode, occupiedNodes
+
+    def _calcProcessorGrid(self, ns, Nproc, overlap, decomposableAxes):
+        """Number of processors along each axis
 
-        return first, sec, self._packOverlap(first, sec)
+        Of all the ways to arrange `Nproc` processors in a Cartesian grid,
+        split only along `decomposableAxes`, pick the one that leaves the
+        fewest processors idle and then cuts the fewest faces. Ties go to
+        splitting the later axes.
+
+        >>> from fipy.meshes.builders import _Grid2DBuilder, _Grid3DBuilder
+
+        >>> gb2 = _Grid2DBuilder()
+        >>> print(gb2._calcProcessorGrid((100, 100), 1, 2, [0, 1]))
+        (1, 1)
+        >>> print(gb2._calcProcessorGrid((100, 100), 2, 2, [0, 1]))
+        (1, 2)
+        >>> print(gb2._calcProcessorGrid((100, 100), 64, 2, [0, 1]))
+        (8, 8)
+        >>> print(gb2._calcProcessorGrid((1000, 10), 4, 2, [0, 1]))
+        (4, 1)
+        >>> print(gb2._calcProcessorGrid((100, 3), 4, 1, [0, 1]))
+        (4, 1)
+        >>> print(gb2._calcProcessorGrid((100, 100), 4, 2, [0]))
+        (4, 1)
+
+        >>> gb3 = _Grid3DBuilder()
+        >>> print(gb3._calcProcessorGrid((64, 64, 64), 8, 2, [0, 1, 2]))
+        (2, 2, 2)
+        >>> print(gb3._calcProcessorGrid((64, 64, 64), 6, 2, [0, 1, 2]))
+        (1, 2, 3)
+        >>> print(gb3._calcProcessorGrid((64, 64, 1), 6, 2, [0, 1, 2]))
+        (2, 3, 1)
+
+        A dimension that cannot be split any further leaves processors idle,
+        as when only one axis is ever split
+
+        >>> print(gb2._calcProcessorGrid((1, 9), 20, 1, [0, 1]))
+        (1, 20)
+        """
+        def grids(axis, nodes):
+            if axis == len(ns) - 1:
+                if nodes == 1 or axis in decomposableAxes:
+                    yield (nodes,)
+            elif axis not in decomposableAxes:
+                for grid in grids(axis + 1, nodes):
+                    yield (1,) + grid
+            else:
+                for p in range(1, nodes + 1):
+                    if nodes % p == 0:
+                        for grid in grids(axis + 1, nodes // p):
+                            yield (p,) + grid
+
+        numberOfCells = reduce(self._mult, ns)
+
+        def cost(grid):
+            occupied = [self._calcCellsPerNode(n, nodes, min(overlap, n))[1]
+                        for n, nodes in zip(ns, grid)]
+            # each cut along an axis adds a layer of faces normal to it
+            cut = sum([(o - 1) * (numberOfCells // n)
+                       for n, o in zip(ns, occupied) if n > 0])
+            return (-reduce(self._mult, occupied), cut, tuple(-p for p in grid[::-1]))
+
+        return min(grids(0, Nproc), key=cost)
+
+    def _buildOverlap(self, overlap, procID, occupiedNodes):
+        return (overlap * (procID > 0) * (procID < occupiedNodes),
+                overlap * (procID < occupiedNodes - 1))
 
-    def _packOverlap(self, first, sec):
+    def _packOverlap(self, firsts, secs):
         raise NotImplementedError
 
-    def _packOffset(self, arg):
+    def _packOffset(self, offsets):
         raise NotImplementedError
 
     def _mult(self, x, y):
@@ -7,6 +7,7 @@ from builtins import range
 from builtins import str
 __docformat__ = 'restructuredtext'
 
+import itertools
 import os
 from subprocess import Popen, PIPE
 import sys
@@ -22,7 +23,7 @@ from fipy.tests.doctestPlus import register_skipper
 
 from fipy.meshes.mesh import Mesh
 from fipy.meshes.mesh2D import Mesh2D
-from fipy.meshes.topologies.meshTopology import _MeshTopology
+from fipy.meshes.topologies.meshTopology import _PartitionedMeshTopology
 
 from fipy.tools.debug import PRINT
 
@@ -482,6 +483,114 @@ class POSFile(GmshFile):
         data += [[str(value)] * numNodes]
         self.fileobj.write("\n".join([" ".join(datum) for datum in data]) + "\n")
 
+# number of nodes of each Gmsh element type
+_nodesPerElement = { 1: 2,  2: 3,  3: 4,  4: 4,  5: 8,  6: 6,  7: 5,  8: 3,
+                     9: 6, 10: 9, 11: 10, 12: 27, 13: 18, 14: 14, 15: 1,
+                    16: 8, 17: 20, 18: 15, 19: 13, 20: 9, 21: 10, 22: 12,
+                    23: 15, 24: 15, 25: 21, 26: 4, 27: 5, 28: 6, 29: 20,
+                    30: 35, 31: 56, 92: 64, 93: 125}
+
+def _fromText(text, kind):
+    """Numbers of `kind` in whitespace separated `text`
+
+    >>> print(_fromText(b"1 2\\n3\\n", "int"))
+    [1 2 3]
+    """
+    if len(text.strip()) == 0:
+        text = b""
+    if kind == "double":
+        dtype = float
+    else:
+        dtype = nx.INT_DTYPE
+    return nx.fromstring(text, dtype=dtype, sep=" ")
+
+def _splitRecords(text):
+    """Integers of the lines of `text` and where each line starts among them
+
+    >>> values, starts, counts = _splitRecords(b"1 2 3\\n\\n4 5\\n 6 7  8 9\\n")
+    >>> print(values)
+    [1 2 3 4 5 6 7 8 9]
+    >>> print(starts)
+    [0 3 5]
+    >>> print(counts)
+    [3 2 4]
+    """
+    chars = nx.frombuffer(text, dtype=nx.uint8)
+    isSpace = (chars <= ord(b" "))
+    isStart = ~isSpace
+    isStart[1:] &= isSpace[:-1]
+    lines = nx.cumsum(chars == ord(b"\n"))
+    counts = nx.bincount(lines[isStart], minlength=lines[-1] + 1)
+    counts = counts[counts > 0]
+
+    return _fromText(text, "int"), nx.cumsum(counts) - counts, counts
+
+def _groupElementRecords(values, starts, counts):
+    """Gather MSH 2 element records of the same type and number of tags
+
+    Each record is `id elemType numTags tags... nodes...`.
+
+    >>> values, starts, counts = _splitRecords(b'''1 1 2 0 1 1 2
+    ... 2 2 2 0 1 1 2 3
+    ... 3 1 2 0 2 2 3
+    ... ''')
+    >>> for positions, elemType, ids, tags, nodes in _groupElementRecords(values, starts, counts):
+    ...     print(positions, elemType, ids, tags.tolist(), nodes.tolist())
+    [0 2] 1 [1 3] [[0, 1], [0, 2]] [[1, 2], [2, 3]]
+    [1] 2 [2] [[0, 1]] [[1, 2, 3]]
+
+    Returns
+    -------
+    list
+        A block of `(positions, elemType, ids, tags, nodes)` for each kind
+        of record, where `positions` is the place of each record
+    """
+    elemTypes = values[starts + 1]
+    numTags = values[starts + 2]
+    kinds = (elemTypes * (numTags.max() + 1) + numTags) * (counts.max() + 1) + counts
+    kinds, firsts, kind = nx.unique(kinds, return_index=True, return_inverse=True)
+
+    blocks = []
+    for k, first in enumerate(firsts.tolist()):
+        elemType, nTags, count = elemTypes[first], numTags[first], counts[first]
+        positions = nx.nonzero(kind == k)[0]
+        records = values[starts[positions][..., nx.newaxis] + nx.arange(count)]
+        blocks.append((positions,
+                       elemType,
+                       records[..., 0],
+                       records[..., 3:3 + nTags],
+                       records[..., 3 + nTags:]))
+
+    return blocks
+
+def _uniqueRows(rows):
+    """Index of the first of each distinct row and the distinct row of each row
+
+    Distinct rows are numbered in the order they first appear.
+
+    >>> first, inverse = _uniqueRows(nx.array([[1, 2], [0, 1], [1, 2],
+    ...                                        [3, 4], [0, 1]]))
+    >>> print(first)
+    [0 1 3]
+    >>> print(inverse)
+    [0 1 0 2 1]
+    """
+    # lexsort is stable, so the first of each run is the first of its rows
+    order = nx.lexsort(rows.T[::-1])
+    sortedRows = rows[order]
+    isNew = nx.ones(len(rows), dtype=bool)
+    isNew[1:] = (sortedRows[1:] != sortedRows[:-1]).any(axis=-1)
+    run = nx.cumsum(isNew) - 1
+
+    first = order[isNew]
+    rank = nx.empty(len(first), dtype=nx.INT_DTYPE)
+    rank[nx.argsort(first)] = nx.arange(len(first))
+
+    inverse = nx.empty(len(rows), dtype=nx.INT_DTYPE)
+    inverse[order] = rank[run]
+
+    return nx.sort(first), inverse
+
 class MSHFile(GmshFile):
     """
     Class responsible for parsing a Gmsh file and then readying
@@ -492,10 +601,13 @@ class MSHFile(GmshFile):
     partitions matching `Nproc`, or the mesh must be specified with a `.geo` file
     or multiline string.
 
-    Does not support gmsh versions < 2. If partitioning, gmsh
-    version must be >= 2.5.
+    Reads ASCII and binary MSH 2 and MSH 4.1 files. The `$Nodes` and
+    `$Elements` sections are parsed in bulk, a block of elements of the same
+    type at a time, and faces are found by sorting, so large meshes load
+    without building a Python object per element.
 
-    TODO: Refactor face extraction functions.
+    Does not support gmsh versions < 2. If partitioning, gmsh
+    version must be >= 2.5 and the file must be MSH 2.
     """
     def __init__(self, filename,
                        dimensions,
@@ -536,337 +648,485 @@ class MSHFile(GmshFile):
 
         GmshFile.__init__(self, filename=filename, communicator=communicator, mode=mode, fileIsTemporary=fileIsTemporary)
 
-    def _getMetaData(self):
+    def _readMeshFormat(self, fileobj):
         """
         Extracts `gmshVersion`, file-type, and data-size in that
-        order.
+        order, and the byte order of a binary file.
         """
-        self._seekForHeader("MeshFormat")
-        metaData = self.fileobj.readline().split()
-        self.fileobj.seek(0)
-        return [float(x) for x in metaData]
+        version, fileType, dataSize = fileobj.readline().split()[:3]
+        self.version = float(version)
+        self.fileType = int(fileType)
+        self.dataSize = int(dataSize)
+
+        if not (2 <= self.version < 3 or self.version >= 4.1):
+            raise GmshException("Gmsh MSH file format version %g is not supported" % self.version)
+
+        if self.fileType == 1:
+            # binary files write the integer 1 to reveal their byte order
+            one = fileobj.read(4)
+            if nx.frombuffer(one, dtype="<i4")[0] == 1:
+                self._byteOrder = "<"
+            else:
+                self._byteOrder = ">"
 
-    def _isolateData(self, title):
+    def _skipSection(self, fileobj, title):
         """
-        Gets all data between $[title] and $End[title], writes
-        it out to its own file.
+        Read through `fileobj` past the end of the `title` section.
         """
-        newF, newPath = tempfile.mkstemp(title, text=True)
-        newF = os.fdopen(newF, 'w')
-        try:
-            self._seekForHeader(title)
-        except Exception as e:
-            newF.close()
-            os.unlink(newPath)
-            raise
-
-        # extract the actual data within section
         while True:
-            line = self.fileobj.readline()
-            if ("$End%s" % title) not in line:
-                newF.write(line)
-            else: break
-
-        self.fileobj.seek(0)
-        newF.close()
-        return newPath
+            line = fileobj.readline()
+            if len(line) == 0:
+                raise EOFError("No `$End%s' found!" % title)
+            elif line.startswith(("$End%s" % title).encode("ascii")):
+                break
 
-    def _seekForHeader(self, title):
+    def _readSectionLines(self, fileobj, title):
         """
-        Iterate through a file until we end up at the section header
-        for `title`. Function has obvious side-effects on `self.fileobj`.
+        Text lines of an ASCII section, up to `$End[title]`.
         """
+        lines = []
         while True:
-            line = self.fileobj.readline()
+            line = fileobj.readline()
             if len(line) == 0:
-                raise EOFError("No `%s' header found!" % title)
-                break
-            elif (("$%s" % title) not in line):
-                continue
-            else:
-                break # found header
+                raise EOFError("No `$End%s' found!" % title)
+            elif line.startswith(("$End%s" % title).encode("ascii")):
+                return lines
+            lines.append(line.decode("utf-8"))
+
+    def _binaryType(self, kind):
+        return nx.dtype(self._byteOrder + {"int": "i4",
+                                           "size": "u%d" % self.dataSize,
+                                           "double": "f8"}[kind])
 
-    def _deriveCellsAndFaces(self, cellsToVertIDs, shapeTypes, numCells):
+    def _readHeader(self, fileobj, kinds):
         """
-        Uses element information obtained from `_parseElementFile` to deliver
-        `facesToVertices` and `cellsToFaces`.
+        Read the numbers of a header, one line in an ASCII file.
         """
+        if self.fileType == 1:
+            values = []
+            for kind in kinds:
+                dtype = self._binaryType(kind)
+                values.append(int(nx.frombuffer(fileobj.read(dtype.itemsize), dtype=dtype)[0]))
+            return values
+        else:
+            return [int(x) for x in fileobj.readline().split()[:len(kinds)]]
 
-        allShapes  = nx.unique(shapeTypes).tolist()
-        maxFaces   = max([self.numFacesPerCell[x] for x in allShapes])
+    def _readArray(self, fileobj, rows, kind, columns=None):
+        """
+        Read `rows` lines of numbers, or `rows` * `columns` binary values,
+        into an array of shape (`rows`, `columns`).
 
-        # `cellsToFaces` must be padded with -1; see mesh.py
-        currNumFaces = 0
-        cellsToFaces = nx.ones((numCells, maxFaces), 'l') * -1
-        facesDict    = {}
-        uniqueFaces  = []
-
-        # we now build `cellsToFaces` and `uniqueFaces`,
-        # the latter will result in `facesToVertices`.
-        for cellIdx in range(numCells):
-            shapeType = shapeTypes[cellIdx]
-            cell = cellsToVertIDs[cellIdx]
-
-            if shapeType in [5, 12, 17]: # hexahedron
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3], # ordering of vertices gleaned from
-                                                                 [4, 5, 6, 7], # a one-cube Grid3D example
-                                                                 [0, 1, 5, 4],
-                                                                 [3, 2, 6, 7],
-                                                                 [0, 3, 7, 4],
-                                                                 [1, 2, 6, 5]])
-            elif shapeType in [6, 13, 18]: # prism
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2],
-                                                                 [5, 4, 3],
-                                                                 [3, 4, 1, 0],
-                                                                 [4, 5, 2, 1],
-                                                                 [5, 3, 0, 2]])
-            elif shapeType in [7, 14, 19]: # pyramid
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3],
-                                                                 [0, 1, 4],
-                                                                 [1, 2, 4],
-                                                                 [2, 3, 4],
-                                                                 [3, 0, 4]])
-            else:
-                if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
-                    faceLength = 2 # triangle
-                elif shapeType in [3, 10, 16]:
-                    faceLength = 2 # quadrangle
-                elif shapeType in [4, 11, 29, 30, 31]:
-                    faceLength = 3 # tetrahedron
-
-                faces = self._extractRegularFaces(cell=cell,
-                                                  faceLength=faceLength,
-                                                  facesPerCell=self.numFacesPerCell[shapeType])
-
-            for faceIdx in range(len(faces)):
-                # NB: currFace is sorted for the key to spot duplicates
-                currFace = faces[faceIdx]
-                keyStr   = ' '.join([str(x) for x in sorted(currFace)])
-
-                if keyStr in facesDict:
-                    cellsToFaces[cellIdx][faceIdx] = facesDict[keyStr]
-                else: # new face
-                    facesDict[keyStr] = currNumFaces
-                    cellsToFaces[cellIdx][faceIdx] = currNumFaces
-                    uniqueFaces.append(currFace)
-                    currNumFaces += 1
-
-        # pad short faces with -1
-        maxFaceLen = max([len(f) for f in uniqueFaces])
-        uniqueFaces = [[-1] * (maxFaceLen - len(f)) + f for f in uniqueFaces]
-
-        facesToVertices = nx.array(uniqueFaces, dtype=nx.INT_DTYPE)
-
-        return facesToVertices.swapaxes(0, 1)[::-1], cellsToFaces.swapaxes(0, 1).copy('C'), facesDict
+        Lines are parsed a chunk at a time, so only the resulting array,
+        and not the text, need fit in memory.
+        """
+        if self.fileType == 1:
+            dtype = self._binaryType(kind)
+            values = nx.frombuffer(fileobj.read(rows * columns * dtype.itemsize),
+                                   dtype=dtype)
+        else:
+            values = [_fromText(text, kind)
+                      for text in self._readChunks(fileobj, rows)]
+            values = nx.concatenate(values + [_fromText(b"", kind)])
 
-    def _translateNodesToVertices(self, entitiesNodes, vertexMap):
-        """Translates e`ntitiesNodes` from Gmsh node IDs to `vertexCoords` indices.
+        if kind == "double":
+            values = values.astype(float)
+        else:
+            values = values.astype(nx.INT_DTYPE)
+
+        if rows == 0:
+            return values.reshape((0, columns or 0))
+        return values.reshape((rows, -1))
+
+    _chunkLines = 2**16
+
+    def _readChunks(self, fileobj, numLines):
+        """
+        Yield the next `numLines` lines of `fileobj`, many lines at a time.
+        """
+        while numLines > 0:
+            lines = list(itertools.islice(fileobj, min(numLines, self._chunkLines)))
+            if len(lines) == 0:
+                raise EOFError("Gmsh MSH file ended unexpectedly")
+            numLines -= len(lines)
+            yield b"".join(lines)
+
+    def _readEntities(self, fileobj):
         """
-        entitiesVertices = []
+        Returns the physical entity of each `(dimension, tag)` geometrical
+        entity of a MSH 4 file, or 0 if it has none.
+        """
+        physicalEntities = {}
+        counts = self._readHeader(fileobj, ["size"] * 4)
+        for dim, count in enumerate(counts):
+            numBounds = 3 if dim == 0 else 6
+            for entity in range(count):
+                if self.fileType == 1:
+                    tag = self._readHeader(fileobj, ["int"])[0]
+                    self._readArray(fileobj, numBounds, "double", 1)
+                    numTags = self._readHeader(fileobj, ["size"])[0]
+                    tags = self._readArray(fileobj, numTags, "int", 1).flat
+                    if dim > 0:
+                        numBoundingEntities = self._readHeader(fileobj, ["size"])[0]
+                        self._readArray(fileobj, numBoundingEntities, "int", 1)
+                else:
+                    line = fileobj.readline().split()
+                    tag = int(line[0])
+                    numTags = int(line[1 + numBounds])
+                    tags = line[2 + numBounds:2 + numBounds + numTags]
 
-        for entity in entitiesNodes:
-            try:
-                vertIndices = vertexMap[nx.array(entity)]
-            except IndexError:
-                vertIndices = nx.ones((len(entity),), 'l') * -1
-            entitiesVertices.append(vertIndices)
+                if numTags > 0:
+                    physicalEntities[(dim, tag)] = int(tags[0])
+                else:
+                    physicalEntities[(dim, tag)] = 0
+
+        return physicalEntities
 
-        return entitiesVertices
+    def _readNodes(self, fileobj):
+        """
+        Returns the Gmsh ID and the coordinates of every node.
+        """
+        if self.version < 3:
+            numNodes = int(fileobj.readline())
+            if self.fileType == 1:
+                record = nx.dtype([("id", self._binaryType("int")),
+                                   ("coords", self._binaryType("double"), (3,))])
+                nodes = nx.frombuffer(fileobj.read(numNodes * record.itemsize),
+                                      dtype=record)
+                return (nodes["id"].astype(nx.INT_DTYPE),
+                        nodes["coords"].astype(float))
+            else:
+                nodes = self._readArray(fileobj, numNodes, "double", 4)
+                return nodes[..., 0].astype(nx.INT_DTYPE), nodes[..., 1:4]
+        else:
+            numBlocks = self._readHeader(fileobj, ["size"] * 4)[0]
+            ids = [nx.zeros((0,), dtype=nx.INT_DTYPE)]
+            coords = [nx.zeros((0, 3))]
+            for block in range(numBlocks):
+                (dim,
+                 tag,
+                 parametric,
+                 numNodes) = self._readHeader(fileobj, ["int", "int", "int", "size"])
+                ids.append(self._readArray(fileobj, numNodes, "size", 1)[..., 0])
+                # parametric nodes are followed by `dim` parametric coordinates
+                coords.append(self._readArray(fileobj, numNodes, "double",
+                                              3 + dim * parametric)[..., :3])
+            return nx.concatenate(ids), nx.concatenate(coords)
+
+    def _readElements(self, fileobj, physicalEntities):
+        """
+        Returns blocks of `(positions, elemType, ids, tags, nodes)` of
+        elements of the same type, where `positions` is the place of each
+        element in the file.
+        """
+        blocks = []
+        if self.version < 3 and self.fileType == 1:
+            numElements = int(fileobj.readline())
+            position = 0
+            while position < numElements:
+                elemType, numElems, numTags = self._readHeader(fileobj, ["int"] * 3)
+                records = self._readArray(fileobj, numElems, "int",
+                                          1 + numTags + _nodesPerElement[elemType])
+                blocks.append((nx.arange(position, position + numElems),
+                               elemType,
+                               records[..., 0],
+                               records[..., 1:1 + numTags],
+                               records[..., 1 + numTags:]))
+                position += numElems
+        elif self.version < 3:
+            numElements = int(fileobj.readline())
+            position = 0
+            for text in self._readChunks(fileobj, numElements):
+                values, starts, counts = _splitRecords(text)
+                for (positions,
+                     elemType,
+                     ids,
+                     tags,
+                     nodes) in _groupElementRecords(values, starts, counts):
+                    blocks.append((positions + position, elemType, ids, tags, nodes))
+                position += len(counts)
+        else:
+            numBlocks = self._readHeader(fileobj, ["size"] * 4)[0]
+            position = 0
+            for block in range(numBlocks):
+                (dim,
+                 tag,
+                 elemType,
+                 numElems) = self._readHeader(fileobj, ["int", "int", "int", "size"])
+                records = self._readArray(fileobj, numElems, "size",
+                                          1 + _nodesPerElement.get(elemType, 0))
+                # MSH 2 tags each element with its physical and geometrical entity
+                tags = nx.empty((numElems, 2), dtype=nx.INT_DTYPE)
+                tags[..., 0] = physicalEntities.get((dim, tag), 0)
+                tags[..., 1] = tag
+                blocks.append((nx.arange(position, position + numElems),
+                               elemType,
+                               records[..., 0],
+                               tags,
+                               records[..., 1:]))
+                position += numElems
+
+        return blocks
+
+    def _readSections(self, fileobj):
+        """
+        Bulk parse the `$MeshFormat`, `$Entities`, `$Nodes`, `$Elements`, and
+        `$PhysicalNames` sections of `fileobj`, skipping any others.
+        """
+        nodeIDs = nodeCoords = None
+        blocks = []
+        physicalEntities = {}
+        names = []
+        while True:
+            line = fileobj.readline()
+            if len(line) == 0:
+                break
+            elif not line.startswith(b"$"):
+                continue
 
-    def _extractRegularFaces(self, cell, faceLength, facesPerCell):
-        """Return faces for a regular poly(gon|hedron)
+            title = line.strip()[1:].decode("ascii", "replace")
+            if title == "MeshFormat":
+                self._readMeshFormat(fileobj)
+            elif title == "PhysicalNames":
+                names = self._readSectionLines(fileobj, title)
+                continue
+            elif title == "Entities":
+                physicalEntities = self._readEntities(fileobj)
+            elif title == "PartitionedEntities":
+                raise GmshException("Partitioned Gmsh MSH 4 files are not supported. Use `-format msh2`.")
+            elif title == "Nodes":
+                nodeIDs, nodeCoords = self._readNodes(fileobj)
+            elif title == "Elements":
+                blocks = self._readElements(fileobj, physicalEntities)
+            self._skipSection(fileobj, title)
+
+        if nodeIDs is None:
+            raise EOFError("No `$Nodes' header found!")
+
+        return nodeIDs, nodeCoords, blocks, names
+
+    def _faceOrderings(self, shapeType):
+        """
+        The vertices of each face of a cell of `shapeType`.
+        """
+        if shapeType in [5, 12, 17]: # hexahedron
+            return [[0, 1, 2, 3], # ordering of vertices gleaned from
+                    [4, 5, 6, 7], # a one-cube Grid3D example
+                    [0, 1, 5, 4],
+                    [3, 2, 6, 7],
+                    [0, 3, 7, 4],
+                    [1, 2, 6, 5]]
+        elif shapeType in [6, 13, 18]: # prism
+            return [[0, 1, 2],
+                    [5, 4, 3],
+                    [3, 4, 1, 0],
+                    [4, 5, 2, 1],
+                    [5, 3, 0, 2]]
+        elif shapeType in [7, 14, 19]: # pyramid
+            return [[0, 1, 2, 3],
+                    [0, 1, 4],
+                    [1, 2, 4],
+                    [2, 3, 4],
+                    [3, 0, 4]]
+        else:
+            # triangles and quadrangles have faces of 2 vertices,
+            # tetrahedra have faces of 3, and we may wrap
+            numFaces = self.numFacesPerCell[shapeType]
+            return [[(i + j) % numFaces for j in range(self.dimensions)]
+                    for i in range(numFaces)]
 
-        Given `cell`, defined by node IDs, returns an array of
-        `facesPerCell` faces of length `faceLength` in terms of nodes.
+    def _deriveCellsAndFaces(self, cellsToVertIDs, shapeTypes, facesToVertIDs):
         """
-        faces = []
-        for i in range(facesPerCell):
-            aFace = []
-            for j in range(faceLength):
-                aVertex = (i + j) % len(cell) # we may wrap
-                aFace.append(int(cell[aVertex]))
-            faces.append(aFace)
-        return faces
-
-    def _extractOrderedFaces(self, cell, faceOrderings):
-        """Return faces for a 8-node hexahedron cell.
+        Uses element information obtained from `_sortElements` to deliver
+        `facesToVertices` and `cellsToFaces`, and the face that matches each
+        of the Gmsh faces in `facesToVertIDs`, or -1 if it bounds no cell.
         """
-        def orderingToFace(vertList):
-            aFace = []
-            for i in vertList:
-                aFace.append(int(cell[i]))
-            return aFace
+        numCells = len(shapeTypes)
+        orderings = dict((shapeType, self._faceOrderings(shapeType))
+                         for shapeType in nx.unique(shapeTypes).tolist())
+        maxFaces = max([len(ordering) for ordering in orderings.values()])
+        maxFaceLen = max([len(face) for ordering in orderings.values() for face in ordering])
+
+        # vertices of each face of each cell, padded with -1 in front
+        cellFaces = -nx.ones((numCells, maxFaces, maxFaceLen), dtype=nx.INT_DTYPE)
+        for shapeType, ordering in orderings.items():
+            isShape = (shapeTypes == shapeType)
+            cells = cellsToVertIDs[isShape]
+            for faceIdx, face in enumerate(ordering):
+                cellFaces[isShape, faceIdx, maxFaceLen - len(face):] = cells[..., face]
+
+        isFace = (cellFaces[..., -1] >= 0)
+        faces = cellFaces[isFace]
+        numCellFaces = len(faces)
+
+        # sorted vertices spot duplicates. Gmsh faces are appended, so that
+        # faces are numbered in the order they are met in the cells.
+        width = max(maxFaceLen, facesToVertIDs.shape[-1])
+        keys = -nx.ones((numCellFaces + len(facesToVertIDs), width), dtype=nx.INT_DTYPE)
+        keys[:numCellFaces, width - maxFaceLen:] = faces
+        keys[numCellFaces:, width - facesToVertIDs.shape[-1]:] = facesToVertIDs
+        keys.sort(axis=-1)
+
+        first, inverse = _uniqueRows(keys)
+        numFaces = (first < numCellFaces).sum()
+
+        facesToVertices = faces[first[:numFaces]]
+
+        # `cellsToFaces` must be padded with -1; see mesh.py
+        cellsToFaces = -nx.ones((numCells, maxFaces), dtype=nx.INT_DTYPE)
+        cellsToFaces[isFace] = inverse[:numCellFaces]
+
+        matchingFaces = inverse[numCellFaces:]
+        matchingFaces[matchingFaces >= numFaces] = -1
+
+        return facesToVertices.swapaxes(0, 1)[::-1], cellsToFaces.swapaxes(0, 1).copy('C'), matchingFaces
 
-        return [orderingToFace(o) for o in faceOrderings]
+    def _translateNodesToVertices(self, entitiesNodes, vertexMap):
+        """Translates `entitiesNodes` from Gmsh node IDs to `vertexCoords` indices.
+
+        Nodes that are not vertices of any cell become -1.
+        """
+        inMap = (entitiesNodes >= 0) & (entitiesNodes < len(vertexMap))
+        return nx.where(inMap, vertexMap[nx.where(inMap, entitiesNodes, 0)], -1)
 
     def read(self):
         """
-        0. Build `cellsToVertices`
-        1. Recover needed `vertexCoords` and mapping from file using
-           `cellsToVertices`
-        2. Build `cellsToVertIDs` proper from `vertexCoords` and vertex map
-        3. Build faces
-        4. Build `cellsToFaces`
-
-        Isolate relevant data into three files, store in
-        `self.nodesPath` for `$Nodes`,
-        `self.elemsPath` for `$Elements`.
-        `self.namesFile` for `$PhysicalNames`.
+        0. Bulk parse the `$Nodes`, `$Elements`, and `$PhysicalNames`
+           sections
+        1. Select the cells of this processor, its ghost cells, and the
+           faces
+        2. Recover needed `vertexCoords` and mapping from Gmsh node IDs
+           using `cellsToVertices`
+        3. Build `cellsToVertIDs` proper from `vertexCoords` and vertex map
+        4. Build faces and `cellsToFaces`
 
         Returns `vertexCoords`, `facesToVertexID`, `cellsToFaceID`,
                 `cellGlobalIDMap`, `ghostCellGlobalIDMap`.
         """
-        self.version, self.fileType, self.dataSize = self._getMetaData()
-        self.nodesPath = self._isolateData("Nodes")
-        self.elemsPath = self._isolateData("Elements")
-        try:
-            self.namesPath = self._isolateData("PhysicalNames")
-        except EOFError as e:
-            self.namesPath = None
-
-        try:
-            if self.dimensions is None:
-                nodesFile = open(self.nodesPath, 'r')
-                nodesFile.readline() # skip number of nodes
-
-                # We assume we have a 2D file unless we find a node
-                # with a non-zero Z coordinate
+        with open(self.filename, 'rb') as fileobj:
+            (nodeIDs,
+             nodeCoords,
+             blocks,
+             names) = self._readSections(fileobj)
+
+        if self.version >= 4 and self.communicator.Nproc > 1:
+            raise GmshException("Gmsh MSH 4 files cannot be partitioned. Use `-format msh2`.")
+
+        if self.dimensions is None:
+            # We assume we have a 2D file unless we find a node
+            # with a non-zero Z coordinate
+            if (nodeCoords[..., 2] != 0.0).any():
+                self.dimensions = 3
+            else:
                 self.dimensions = 2
-                for node in nodesFile:
-                    line   = node.split()
 
-                    newVert = [float(x) for x in line]
+        self.coordDimensions = self.coordDimensions or self.dimensions
+
+        # we need a conditional here so we don't pick up 2D shapes in 3D
+        if self.dimensions == 2:
+            self.numVertsPerFace = {1: 2, # 2-node line
+                                    8: 2} # 3-node line
+            self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 faces)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+        elif self.dimensions == 3:
+            self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 vertices)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+            self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
+                                    11: 4, # 10-node tetrahedron (we only read 1st 4)
+                                    29: 4, # 20-node tetrahedron (we only read 1st 4)
+                                    30: 4, # 35-node tetrahedron (we only read 1st 4)
+                                    31: 4, # 56-node tetrahedron (we only read 1st 4)
+                                     5: 6, # 8-node hexahedron (6 faces)
+                                    12: 6, # 27-node tetrahedron (we only read 1st 6)
+                                    17: 6, # 20-node tetrahedron (we only read 1st 6)
+                                     6: 5, # 6-node prism (5 faces)
+                                    13: 5, # 18-node prism (we only read 1st 6)
+                                    18: 5, # 15-node prism (we only read 1st 6)
+                                     7: 5, # 5-node pyramid (5 faces)
+                                    14: 5, # 14-node pyramid (we only read 1st 5)
+                                    19: 5} # 13-node pyramid (we only read 1st 5)
+        else:
+            raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
+
+        parprint("Sorting elements.")
+        (cellsData,
+         ghostsData,
+         facesData) = self._sortElements(blocks)
+
+        cellsToGmshVerts = nx.concatenate((cellsData.nodes, ghostsData.nodes))
+        numCellsTotal    = len(cellsToGmshVerts)
+        allShapeTypes    = nx.concatenate((cellsData.shapes, ghostsData.shapes))
+        self.physicalCellMap = nx.concatenate((cellsData.physicalEntities,
+                                               ghostsData.physicalEntities))
+        self.geometricalCellMap = nx.concatenate((cellsData.geometricalEntities,
+                                                  ghostsData.geometricalEntities))
+
+        if numCellsTotal < 1:
+            errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
+            errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
+            raise GmshException(errStr)
+
+        parprint("Recovering coords.")
+        parprint("numcells %d" % numCellsTotal)
+        vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts,
+                                                             nodeIDs,
+                                                             nodeCoords)
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
+                                                        vertIDtoIdx)
+
+        # cell entities were easy to record on parsing
+        # but we don't use Gmsh faces, so we need to correlate the nodes
+        # that make up the Gmsh faces with the vertex IDs of the FiPy faces
+        # so that we can check if any are named.
+        # Only the corners of higher order faces are compared.
+        facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
+                                                        vertIDtoIdx)
+        corners = nx.array([self.numVertsPerFace[shapeType]
+                            for shapeType in facesData.shapes.tolist()],
+                           dtype=nx.INT_DTYPE)
+        facesToVertIDs[nx.arange(facesToVertIDs.shape[-1]) >= corners[..., nx.newaxis]] = -1
+
+        parprint("Building cells and faces.")
+        (facesToV,
+         cellsToF,
+         matchingFaces) = self._deriveCellsAndFaces(cellsToVertIDs,
+                                                    allShapeTypes,
+                                                    facesToVertIDs)
 
-                    if newVert[2] != 0.0:
-                        self.dimensions = 3
-                        break
+        # not all faces are necessarily tagged
+        isTagged = (matchingFaces >= 0)
+        self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.physicalFaceMap[matchingFaces[isTagged]] = facesData.physicalEntities[isTagged]
+        self.geometricalFaceMap[matchingFaces[isTagged]] = facesData.geometricalEntities[isTagged]
 
-                nodesFile.close()
-
-            self.coordDimensions = self.coordDimensions or self.dimensions
-
-            # we need a conditional here so we don't pick up 2D shapes in 3D
-            if self.dimensions == 2:
-                self.numVertsPerFace = {1: 2, # 2-node line
-                                        8: 2} # 3-node line
-                self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 faces)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-            elif self.dimensions == 3:
-                self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 vertices)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-                self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
-                                        11: 4, # 10-node tetrahedron (we only read 1st 4)
-                                        29: 4, # 20-node tetrahedron (we only read 1st 4)
-                                        30: 4, # 35-node tetrahedron (we only read 1st 4)
-                                        31: 4, # 56-node tetrahedron (we only read 1st 4)
-                                         5: 6, # 8-node hexahedron (6 faces)
-                                        12: 6, # 27-node tetrahedron (we only read 1st 6)
-                                        17: 6, # 20-node tetrahedron (we only read 1st 6)
-                                         6: 5, # 6-node prism (5 faces)
-                                        13: 5, # 18-node prism (we only read 1st 6)
-                                        18: 5, # 15-node prism (we only read 1st 6)
-                                         7: 5, # 5-node pyramid (5 faces)
-                                        14: 5, # 14-node pyramid (we only read 1st 5)
-                                        19: 5} # 13-node pyramid (we only read 1st 5)
-            else:
-                raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
-
-            parprint("Parsing elements.")
-            (cellsData,
-             ghostsData,
-             facesData) = self._parseElementFile()
-
-            cellsToGmshVerts = cellsData.nodes + ghostsData.nodes
-            numCellsTotal    = len(cellsData.nodes) + len(ghostsData.nodes)
-            allShapeTypes    = cellsData.shapes + ghostsData.shapes
-            allShapeTypes    = nx.array(allShapeTypes)
-            allShapeTypes    = nx.delete(allShapeTypes, nx.s_[numCellsTotal:])
-            self.physicalCellMap = nx.array(cellsData.physicalEntities
-                                            + ghostsData.physicalEntities)
-            self.geometricalCellMap = nx.array(cellsData.geometricalEntities
-                                               + ghostsData.geometricalEntities)
-
-            if numCellsTotal < 1:
-                errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
-                errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
-                raise GmshException(errStr)
-
-            parprint("Recovering coords.")
-            parprint("numcells %d" % numCellsTotal)
-            vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts)
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
-                                                            vertIDtoIdx)
-
-            parprint("Building cells and faces.")
-            (facesToV,
-             cellsToF,
-             facesDict) = self._deriveCellsAndFaces(cellsToVertIDs,
-                                                    allShapeTypes,
-                                                    numCellsTotal)
-
-            # cell entities were easy to record on parsing
-            # but we don't use Gmsh faces, so we need to correlate the nodes
-            # that make up the Gmsh faces with the vertex IDs of the FiPy faces
-            # so that we can check if any are named
-            faceEntitiesDict = dict()
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
-                                                            vertIDtoIdx)
-
-            for face, physicalEntity, geometricalEntity in zip(facesToVertIDs,
-                                                               facesData.physicalEntities,
-                                                               facesData.geometricalEntities):
-                faceEntitiesDict[' '.join([str(x) for x in sorted(face)])] = (physicalEntity, geometricalEntity)
-
-            self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            for face in list(facesDict.keys()):
-                # not all faces are necessarily tagged
-                if face in faceEntitiesDict:
-                    self.physicalFaceMap[facesDict[face]] = faceEntitiesDict[face][0]
-                    self.geometricalFaceMap[facesDict[face]] = faceEntitiesDict[face][1]
-
-            self.physicalNames = self._parseNamesFile()
-
-        finally:
-            os.unlink(self.nodesPath)
-            os.unlink(self.elemsPath)
-            if self.namesPath is not None:
-                os.unlink(self.namesPath)
-
-        # convert lists of cell vertices to a properly oriented masked array
-        maxVerts = max([len(v) for v in cellsToVertIDs])
-        # ticket:539 - NumPy 1.7 casts to array before concatenation and empty array defaults to float
-        cellsToVertIDs = [nx.concatenate((v, nx.array([-1] * (maxVerts-len(v)), dtype=nx.INT_DTYPE))) for v in cellsToVertIDs]
+        self.physicalNames = self._parseNames(names)
+
+        # convert cell vertices to a properly oriented masked array
         cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs, value=-1).swapaxes(0, 1)
 
         parprint("Done with cells and faces.")
         return (vertexCoords, facesToV, cellsToF,
-                cellsData.idmap, ghostsData.idmap,
+                cellsData.ids.tolist(), ghostsData.ids.tolist(),
                 cellsToVertIDs)
 
     def write(self, obj, time=0.0, timeindex=0):
@@ -996,50 +1256,35 @@ class MSHFile(GmshFile):
 
         self.fileobj.write("$EndElementData\n")
 
-    def _vertexCoordsAndMap(self, cellsToGmshVerts):
+    def _vertexCoordsAndMap(self, cellsToGmshVerts, nodeIDs, nodeCoords):
         """
         Returns `vertexCoords` and mapping from Gmsh ID to `vertexCoords`
-        indices (same as in `MSHFile`).
+        indices.
 
-        Unlike parent, doesn't use `genfromtxt`
-        because we want to avoid loading the entire `.msh` file into memory.
+        Only the nodes of `cellsToGmshVerts` become vertices.
         """
-        allVerts     = [v for c in cellsToGmshVerts for v in c] # flatten
-        allVerts     = nx.unique(nx.array(allVerts, dtype=nx.INT_DTYPE)) # remove dups
-        allVerts     = nx.sort(allVerts)
+        allVerts     = nx.unique(cellsToGmshVerts[cellsToGmshVerts >= 0]) # sorted, no dups
         maxVertIdx   = allVerts[-1] + 1 # add one to offset zero
-        vertGIDtoIdx = nx.ones(maxVertIdx, 'l') * -1 # gmsh ID -> vertexCoords idx
-        vertexCoords = nx.empty((len(allVerts), self.coordDimensions))
-        nodeCount    = 0
+        vertGIDtoIdx = -nx.ones(maxVertIdx, dtype=nx.INT_DTYPE) # gmsh ID -> vertexCoords idx
 
         # establish map. This works because allVerts is a sorted set.
         vertGIDtoIdx[allVerts] = nx.arange(len(allVerts))
 
-        nodesFile = open(self.nodesPath, 'r')
-        nodesFile.readline() # skip number of nodes
-
-        # now we walk through node file with a sorted unique list of vertices
-        # in hand. When we encounter 0th element in `allVerts`, save it
-        # to `vertexCoords` then pop its ID off `allVerts`.
-        for node in nodesFile:
-            line   = node.split()
-            nodeID = int(line[0])
-
-            if nodeID == allVerts[nodeCount]:
-                newVert = [float(x) for x in line[1:self.coordDimensions+1]]
-                vertexCoords[nodeCount,:] = nx.array(newVert)
-                nodeCount += 1
-
-            if len(allVerts) == nodeCount:
-                break
+        # row of each node in the `$Nodes` section
+        nodeRows = -nx.ones(maxVertIdx, dtype=nx.INT_DTYPE)
+        needed = (nodeIDs < maxVertIdx)
+        nodeRows[nodeIDs[needed]] = nx.nonzero(needed)[0]
+        nodeRows = nodeRows[allVerts]
+        if (nodeRows < 0).any():
+            raise GmshException("Elements refer to nodes missing from the `$Nodes` section")
 
-        nodesFile.close()
+        vertexCoords = nodeCoords[nodeRows, :self.coordDimensions]
 
         # transpose for FiPy
         transCoords = vertexCoords.swapaxes(0, 1)
         return transCoords, vertGIDtoIdx
 
-    def _parseElementFile(self):
+    def _sortElements(self, blocks):
         """
         Return three objects, the first for non-ghost cells, the second for
         ghost cells, and the third for faces.
@@ -1048,121 +1293,53 @@ class MSHFile(GmshFile):
         calculation is consolidated here: if we were ever to need to CALCULATE
         GHOST CELLS OURSELVES, the only code we'd have to change is in here.
         """
+        elements = _ElementData.fromBlocks(blocks)
 
-        def _parseTags(offset, currLineInts):
-            if offset == -1:
-                # if first valid shape
-                offset = currLineInts[0]
-
-            numTags = currLineInts[2]
-            tags    = currLineInts[3:(3+numTags)]
-
-            # the partition tags for don't seem to always be present
-            # and don't always make much sense when they are
-
-            if len(tags) >= 2:
-                physicalEntity = tags.pop(0)
-                geometricalEntity = tags.pop(0)
-            else:
-                physicalEntity = geometricalEntity = -1
-
-            return offset, tags, physicalEntity, geometricalEntity
-
-
-        cellsData = _ElementData()
-        ghostsData = _ElementData()
-        facesData = _ElementData()
-
-        cellOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        faceOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        pid = self.communicator.procID + 1
-
-        elemsFile = open(self.elemsPath, 'r')
-
-        elemsFile.readline() # skip number of elements
-        for el in elemsFile:
-            currLineInts = [int(x) for x in el.split()]
-            elemType     = currLineInts[1]
-
-            if elemType in list(self.numFacesPerCell.keys()):
-                # element is a cell
-
-                (cellOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=cellOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= cellOffset
-
-                if len(tags) > 0:
-                    # next item is a count
-                    if tags[0] != len(tags) - 1:
-                        warnings.warn("Partition count %d does not agree with number of remaining tags %d." % (tags[0], len(tags) - 1),
-                                      SyntaxWarning, stacklevel=2)
-                    tags = tags[1:]
-
-                if self.communicator.Nproc > 1:
-                    for tag in tags:
-                        if -tag == pid:
-                            # if we're collecting ghost cells and this is our ghost cell
-                            ghostsData.add(currLine=currLineInts, elType=elemType,
-                                           physicalEntity=physicalEntity,
-                                           geometricalEntity=geometricalEntity)
-                        elif tag == pid:
-                            # el is in this processor's partition or we collect all cells
-                            cellsData.add(currLine=currLineInts, elType=elemType,
-                                          physicalEntity=physicalEntity,
-                                          geometricalEntity=geometricalEntity)
-                else:
-                    # we collect all cells
-                    cellsData.add(currLine=currLineInts, elType=elemType,
-                                  physicalEntity=physicalEntity,
-                                  geometricalEntity=geometricalEntity)
-            elif elemType in list(self.numVertsPerFace.keys()):
-                # element is a face
-
-                (faceOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=faceOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= faceOffset
+        cells = elements[nx.in1d(elements.shapes, list(self.numFacesPerCell.keys()))]
+        faces = elements[nx.in1d(elements.shapes, list(self.numVertsPerFace.keys()))]
 
-                facesData.add(currLine=currLineInts, elType=elemType,
-                              physicalEntity=physicalEntity,
-                              geometricalEntity=geometricalEntity)
+        # the Gmsh ID of the first cell is subtracted to obtain global IDs
+        if len(cells.ids) > 0:
+            cells.ids = cells.ids - cells.ids[0]
 
-        elemsFile.close()
-
-        return cellsData, ghostsData, facesData
+        # the partition tags for don't seem to always be present
+        # and don't always make much sense when they are
+        partitions = cells.partitions
+        if (cells.partitionCounts != (partitions != 0).sum(axis=-1)).any():
+            warnings.warn("Partition counts do not agree with number of remaining tags.",
+                          SyntaxWarning, stacklevel=3)
 
+        if self.communicator.Nproc > 1:
+            pid = self.communicator.procID + 1
+            return (cells[(partitions == pid).any(axis=-1)],
+                    cells[(partitions == -pid).any(axis=-1)],
+                    faces)
+        else:
+            # we collect all cells
+            return cells, cells[:0], faces
 
-    def _parseNamesFile(self):
+    def _parseNames(self, lines):
         physicalNames = {
             0: dict(),
             1: dict(),
             2: dict(),
             3: dict()
         }
-        if self.namesPath is not None:
-            namesFile = open(self.namesPath, 'r')
-
-            namesFile.readline() # skip number of elements
-            for nm in namesFile:
-                nm = nm.split()
-                if self.version > 2.0:
-                    dim = [int(nm.pop(0))]
-                else:
-                    # Gmsh format prior to 2.1 did not unambiguously tie
-                    # physical names to physical entities of different dimensions
-                    # http://article.gmane.org/gmane.comp.cad.gmsh.general/1601
-                    dim = [0, 1, 2, 3]
-                num = int(nm.pop(0))
-                name = " ".join(nm)[1:-1]
-                for d in dim:
-                    physicalNames[d][name] = int(num)
-
-            namesFile.close()
+        for nm in lines[1:]: # skip number of elements
+            nm = nm.split()
+            if len(nm) == 0:
+                continue
+            if self.version > 2.0:
+                dim = [int(nm.pop(0))]
+            else:
+                # Gmsh format prior to 2.1 did not unambiguously tie
+                # physical names to physical entities of different dimensions
+                # http://article.gmane.org/gmane.comp.cad.gmsh.general/1601
+                dim = [0, 1, 2, 3]
+            num = int(nm.pop(0))
+            name = " ".join(nm)[1:-1]
+            for d in dim:
+                physicalNames[d][name] = int(num)
 
         return physicalNames
 
@@ -1273,116 +1450,99 @@ class _ElementData(object):
     Bookkeeping for cells. Declared as own class for generality.
 
     :Properties:
-    - `nodes`: A Python list of the vertices that make up this element
-    - `shapes`: A `shapeTypes` Python list
-    - `idmap`: A Python list which maps `vertexCoords` index to global ID
-    - `physicalEntities`: A Python list of the Gmsh physical entities each element is in
-    - `geometricalEntities`: A Python list of the Gmsh geometrical entities each element is in
+    - `nodes`: An array of the Gmsh nodes of each element, padded with -1
+    - `shapes`: An array of the Gmsh element type of each element
+    - `ids`: An array of the Gmsh ID of each element
+    - `tags`: An array of the physical entity, geometrical entity, number of
+      partitions, and partitions of each element, padded with 0
     """
-    def __init__(self):
-        self.nodes = []
-        self.shapes = []
-        self.idmap = [] # vertexCoords idx -> gmsh ID (global ID)
-        self.physicalEntities = []
-        self.geometricalEntities = []
-
-    def add(self, currLine, elType, physicalEntity, geometricalEntity):
-        numTags = currLine[2]
-        self.nodes.append(currLine[(numTags+3):])
-        self.shapes.append(elType)
-        self.idmap.append(currLine[0])
-        self.physicalEntities.append(physicalEntity)
-        self.geometricalEntities.append(geometricalEntity)
-
-class _GmshTopology(_MeshTopology):
-
-    @property
-    def _globalNonOverlappingCellIDs(self):
+    def __init__(self, shapes, ids, tags, nodes):
+        self.shapes = shapes
+        self.ids = ids
+        self.tags = tags
+        self.nodes = nodes
+
+    @classmethod
+    def fromBlocks(cls, blocks):
         """
-        Return the IDs of the local mesh in the context of the
-        global parallel mesh. Does not include the IDs of boundary cells.
-
-        E.g., would return [0, 1, 4, 5] for mesh A
-        
-        ```
-            A        B
-        ------------------
-        | 4 | 5 || 6 | 7 |
-        ------------------
-        | 0 | 1 || 2 | 3 |
-        ------------------
-        ```
-
-        .. note:: Trivial except for parallel meshes
+        Gather blocks of `(positions, elemType, ids, tags, nodes)` in file order.
+
+        >>> data = _ElementData.fromBlocks([
+        ...     (nx.array([0, 2]), 2, nx.array([1, 3]),
+        ...      nx.array([[7, 8, 1, 2], [7, 8, 1, -2]]),
+        ...      nx.array([[1, 2, 3], [2, 3, 4]])),
+        ...     (nx.array([1]), 1, nx.array([2]),
+        ...      nx.zeros((1, 0), dtype=int),
+        ...      nx.array([[1, 2]]))])
+        >>> print(data.shapes)
+        [2 1 2]
+        >>> print(data.physicalEntities)
+        [ 7 -1  7]
+        >>> print(data.partitions)
+        [[ 2]
+         [ 0]
+         [-2]]
+        >>> print(data.nodes)
+        [[ 1  2  3]
+         [ 1  2 -1]
+         [ 2  3  4]]
         """
-        return nx.array(self.mesh.cellGlobalIDs)
+        numTags = max([3] + [tags.shape[-1] for _, _, _, tags, _ in blocks])
+        numNodes = max([0] + [nodes.shape[-1] for _, _, _, _, nodes in blocks])
+
+        positions = [nx.zeros((0,), dtype=nx.INT_DTYPE)]
+        shapes = [nx.zeros((0,), dtype=nx.INT_DTYPE)]
+        allIDs = [nx.zeros((0,), dtype=nx.INT_DTYPE)]
+        allTags = [nx.zeros((0, numTags), dtype=nx.INT_DTYPE)]
+        allNodes = [nx.zeros((0, numNodes), dtype=nx.INT_DTYPE)]
+        for blockPositions, elemType, ids, tags, nodes in blocks:
+            positions.append(blockPositions)
+            shapes.append(nx.ones(len(ids), dtype=nx.INT_DTYPE) * elemType)
+            allIDs.append(ids)
+
+            paddedTags = nx.zeros((len(ids), numTags), dtype=nx.INT_DTYPE)
+            if tags.shape[-1] >= 2:
+                paddedTags[..., :tags.shape[-1]] = tags
+            else:
+                paddedTags[..., :2] = -1
+            allTags.append(paddedTags)
 
-    @property
-    def _globalOverlappingCellIDs(self):
-        """
-        Return the IDs of the local mesh in the context of the
-        global parallel mesh. Includes the IDs of boundary cells.
+            paddedNodes = -nx.ones((len(ids), numNodes), dtype=nx.INT_DTYPE)
+            paddedNodes[..., :nodes.shape[-1]] = nodes
+            allNodes.append(paddedNodes)
 
-        E.g., would return [0, 1, 2, 4, 5, 6] for mesh A
+        order = nx.argsort(nx.concatenate(positions), kind="mergesort")
 
-        ```
-            A        B
-        ------------------
-        | 4 | 5 || 6 | 7 |
-        ------------------
-        | 0 | 1 || 2 | 3 |
-        ------------------
-        ```
+        return cls(shapes=nx.concatenate(shapes)[order],
+                   ids=nx.concatenate(allIDs)[order],
+                   tags=nx.concatenate(allTags)[order],
+                   nodes=nx.concatenate(allNodes)[order])
 
-        .. note:: Trivial except for parallel meshes
-        """
-        return nx.array(self.mesh.cellGlobalIDs + self.mesh.gCellGlobalIDs)
+    def __getitem__(self, index):
+        return _ElementData(shapes=self.shapes[index],
+                            ids=self.ids[index],
+                            tags=self.tags[index],
+                            nodes=self.nodes[index])
 
     @property
-    def _localNonOverlappingCellIDs(self):
-        """
-        Return the IDs of the local mesh in isolation.
-        Does not include the IDs of boundary cells.
-
-        E.g., would return [0, 1, 2, 3] for mesh A
-
-        ```
-            A        B
-        ------------------
-        | 3 | 4 || 4 | 5 |
-        ------------------
-        | 0 | 1 || 1 | 2 |
-        ------------------
-        ```
-
-        .. note:: Trivial except for parallel meshes
-        """
-        return nx.arange(len(self.mesh.cellGlobalIDs))
+    def physicalEntities(self):
+        return self.tags[..., 0]
 
     @property
-    def _localOverlappingCellIDs(self):
-        """
-        Return the IDs of the local mesh in isolation.
-        Includes the IDs of boundary cells.
-
-        E.g., would return [0, 1, 2, 3, 4, 5] for mesh A
-
-        ```
-            A        B
-        ------------------
-        | 3 | 4 || 5 |   |
-        ------------------
-        | 0 | 1 || 2 |   |
-        ------------------
-        ```
-
-        .. note:: Trivial except for parallel meshes
-        """
-        return nx.arange(len(self.mesh.cellGlobalIDs)
-                         + len(self.mesh.gCellGlobalIDs))
+    def geometricalEntities(self):
+        return self.tags[..., 1]
 
+    @property
+    def partitionCounts(self):
+        return self.tags[..., 2]
 
+    @property
+    def partitions(self):
+        """Partitions of each element, negative where it is a ghost"""
+        return self.tags[..., 3:]
 
+class _GmshTopology(_PartitionedMeshTopology):
+    pass
 
 class Gmsh2D(Mesh2D):
     """Construct a 2D Mesh using Gmsh
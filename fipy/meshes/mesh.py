@@ -94,27 +94,32 @@ class Mesh(AbstractMesh):
         return interiorCellIDs, exteriorCellIDs
 
     def _calcCellToFaceOrientations(self):
-        tmp = numerix.take(self.faceCellIDs[0], self.cellFaceIDs)
-        return (tmp == MA.indices(tmp.shape)[-1]) * 2 - 1
+        cellFaceIDs = MA.filled(self.cellFaceIDs, 0)
+        orientations = (MA.filled(self.faceCellIDs[0])[cellFaceIDs]
+                        == numerix.arange(self.numberOfCells)) * 2 - 1
+        return MA.array(orientations, mask=MA.getmask(self.cellFaceIDs))
 
     def _calcAdjacentCellIDs(self):
-        return (MA.filled(self.faceCellIDs[0]),
-                          MA.filled(MA.where(MA.getmaskarray(self.faceCellIDs[1]),
-                              self.faceCellIDs[0],
-                                             self.faceCellIDs[1])))
+        faceCellIDs = MA.filled(self.faceCellIDs[0])
+        return (faceCellIDs,
+                numerix.where(MA.getmaskarray(self.faceCellIDs[1]),
+                              faceCellIDs,
+                              MA.filled(self.faceCellIDs[1], 0)))
 
     def _calcCellToCellIDs(self):
-        cellToCellIDs = numerix.take(self.faceCellIDs, self.cellFaceIDs, axis=1)
-        cellToCellIDs = MA.where(self._cellToFaceOrientations == 1,
-                                 cellToCellIDs[1], cellToCellIDs[0])
-        return cellToCellIDs
+        cellFaceIDs = MA.filled(self.cellFaceIDs, 0)
+        up = MA.filled(self._cellToFaceOrientations, 0) == 1
+        cellToCellIDs = numerix.where(up,
+                                      MA.filled(self.faceCellIDs[1], 0)[cellFaceIDs],
+                                      MA.filled(self.faceCellIDs[0])[cellFaceIDs])
+        mask = (MA.getmaskarray(self.cellFaceIDs)
+                | (up & MA.getmaskarray(self.faceCellIDs[1])[cellFaceIDs]))
+        return MA.array(cellToCellIDs, mask=mask)
 
     def _calcCellToCellIDsFilled(self):
-        N = self.numberOfCells
-        M = self._maxFacesPerCell
-        cellIDs = numerix.repeat(numerix.arange(N)[numerix.newaxis, ...], M, axis=0)
-        return MA.where(MA.getmaskarray(self._cellToCellIDs), cellIDs,
-                        self._cellToCellIDs)
+        return numerix.where(MA.getmaskarray(self._cellToCellIDs),
+                             numerix.arange(self.numberOfCells),
+                             MA.filled(self._cellToCellIDs, 0))
 
     """
     Geometry set and calculate
@@ -160,20 +165,12 @@ class Mesh(AbstractMesh):
         return numerix.sqrtDot(cross, cross) / 2.
 
     def _calcFaceCenters(self):
-        maskedFaceVertexIDs = MA.filled(self.faceVertexIDs, 0)
+        faceVertexCoords = numerix.take(self.vertexCoords,
+                                        MA.filled(self.faceVertexIDs, 0), axis=1)
+        valid = ~MA.getmaskarray(self.faceVertexIDs)
 
-        faceVertexCoords = numerix.take(self.vertexCoords, maskedFaceVertexIDs, axis=1)
-
-        if MA.getmask(self.faceVertexIDs) is False:
-            faceVertexCoordsMask = numerix.zeros(numerix.shape(faceVertexCoords), 'l')
-        else:
-            faceVertexCoordsMask = \
-              numerix.repeat(MA.getmaskarray(self.faceVertexIDs)[numerix.newaxis, ...],
-                             self.dim, axis=0)
-
-        faceVertexCoords = MA.array(data=faceVertexCoords, mask=faceVertexCoordsMask)
-
-        return MA.filled(MA.average(faceVertexCoords, axis=1))
+        return (numerix.where(valid, faceVertexCoords, 0).sum(axis=1)
+                / valid.sum(axis=0))
 
     @property
     def _rightHandOrientation(self):
@@ -206,9 +203,11 @@ class Mesh(AbstractMesh):
         return faceNormals * orientation
 
     def _calcFaceCellToCellNormals(self):
-        faceCellCentersUp = numerix.take(self._cellCenters, self.faceCellIDs[1], axis=1)
-        faceCellCentersDown = numerix.take(self._cellCenters, self.faceCellIDs[0], axis=1)
-        faceCellCentersUp = numerix.where(MA.getmaskarray(faceCellCentersUp),
+        faceCellCentersUp = numerix.take(self._cellCenters,
+                                         MA.filled(self.faceCellIDs[1], 0), axis=1)
+        faceCellCentersDown = numerix.take(self._cellCenters,
+                                           MA.filled(self.faceCellIDs[0]), axis=1)
+        faceCellCentersUp = numerix.where(MA.getmaskarray(self.faceCellIDs[1]),
                                           self._faceCenters,
                                           faceCellCentersUp)
 
@@ -224,28 +223,31 @@ class Mesh(AbstractMesh):
 
     def _calcCellVolumes(self):
         tmp = self._faceCenters[0] * self._faceAreas * self.faceNormals[0]
-        tmp = numerix.take(tmp, self.cellFaceIDs) * self._cellToFaceOrientations
-        return MA.filled(MA.sum(tmp, 0))
+        tmp = tmp[MA.filled(self.cellFaceIDs, 0)] * MA.filled(self._cellToFaceOrientations, 0)
+        return numerix.where(MA.getmaskarray(self.cellFaceIDs), 0, tmp).sum(axis=0)
 
     def _calcCellCenters(self):
-        tmp = numerix.take(self._faceCenters, self.cellFaceIDs, axis=1)
-        return MA.filled(MA.average(tmp, 1))
+        tmp = numerix.take(self._faceCenters, MA.filled(self.cellFaceIDs, 0), axis=1)
+        valid = ~MA.getmaskarray(self.cellFaceIDs)
+        return numerix.where(valid, tmp, 0).sum(axis=1) / valid.sum(axis=0)
 
     def _calcFaceToCellDistAndVec(self):
-        tmp = MA.repeat(self._faceCenters[..., numerix.NewAxis,:], 2, 1)
-        # array -= masked_array screws up masking for on numpy 1.1
-
-        tmp = tmp - numerix.take(self._cellCenters, self.faceCellIDs, axis=1)
-        cellToFaceDistanceVectors = tmp
-        faceToCellDistances = MA.sqrt(MA.sum(tmp * tmp, 0))
+        mask = MA.getmaskarray(self.faceCellIDs)
+        tmp = (self._faceCenters[..., numerix.newaxis,:]
+               - numerix.take(self._cellCenters, MA.filled(self.faceCellIDs, 0), axis=1))
+        tmp[:, mask] = 0
+        cellToFaceDistanceVectors = MA.array(tmp, mask=numerix.repeat(mask[numerix.newaxis],
+                                                                      self.dim, axis=0))
+        faceToCellDistances = MA.array(numerix.sqrt((tmp * tmp).sum(axis=0)), mask=mask)
         return faceToCellDistances, cellToFaceDistanceVectors
 
     def _calcCellDistAndVec(self):
-        tmp = numerix.take(self._cellCenters, self.faceCellIDs, axis=1)
-        tmp = tmp[..., 1,:] - tmp[..., 0,:]
-        tmp = MA.filled(MA.where(MA.getmaskarray(tmp), self._cellToFaceDistanceVectors[:, 0], tmp))
+        tmp = (numerix.take(self._cellCenters, MA.filled(self.faceCellIDs[1], 0), axis=1)
+               - numerix.take(self._cellCenters, MA.filled(self.faceCellIDs[0]), axis=1))
+        tmp = numerix.where(MA.getmaskarray(self.faceCellIDs[1]),
+                            MA.filled(self._cellToFaceDistanceVectors[:, 0]), tmp)
         cellDistanceVectors = tmp
-        cellDistances = MA.filled(MA.sqrt(MA.sum(tmp * tmp, 0)))
+        cellDistances = numerix.sqrt((tmp * tmp).sum(axis=0))
         return cellDistances, cellDistanceVectors
 
     def _calcFaceTangents(self):
@@ -332,6 +334,7 @@ class Mesh(AbstractMesh):
         self._scaledCellCenters = self._scale['length'] * self._cellCenters
         self._scaledFaceToCellDistances = self._scale['length'] * self._faceToCellDistances
         self._scaledCellDistances = self._scale['length'] * self._cellDistances
+        self._cellCenterTreeData = None
         self._setFaceDependentScaledValues()
 
     def _setFaceDependentScaledValues(self):
@@ -428,29 +431,21 @@ class Mesh(AbstractMesh):
     """calculate Topology methods"""
 
     def _calcFaceCellIDs(self):
-        array = MA.array(MA.indices(self.cellFaceIDs.shape, 'l')[1],
-                         mask=MA.getmask(self.cellFaceIDs))
-        faceCellIDs = MA.zeros((2, self.numberOfFaces), 'l')
-
-        ## Nasty bug: MA.put(arr, ids, values) fills its ids and
-        ## values arguments when masked!  This was not the behavior
-        ## that was assumed when used below.  It was only working
-        ## because the old fill value was 0 and the first element of
-        ## the array needed to be 0 since the cell's face was
-        ## 0. numerix.put() has been changed to deal with this
-        ## properly.
-
-##         MA.put(firstRow, cellFaceIDsFlat[::-1], array[::-1])
-##         MA.put(secondRow, cellFaceIDsFlat, array)
-        firstRow = faceCellIDs[0]
-        secondRow = faceCellIDs[1]
-
-        numerix.put(firstRow, self.cellFaceIDs[::-1, ::-1], array[::-1, ::-1])
-        numerix.put(secondRow, self.cellFaceIDs, array)
-
-        mask = ((False,) * self.numberOfFaces, (firstRow == secondRow))
-        return MA.sort(MA.array(faceCellIDs, mask = mask),
-                                   axis=0)
+        valid = ~MA.getmaskarray(self.cellFaceIDs)
+        faceIDs = MA.filled(self.cellFaceIDs, 0)[valid]
+        cellIDs = numerix.indices(self.cellFaceIDs.shape, 'l')[1][valid]
+
+        # the first and the last cell to list each face
+        firstRow = numerix.zeros(self.numberOfFaces, 'l')
+        secondRow = numerix.zeros(self.numberOfFaces, 'l')
+        numerix.put(firstRow, faceIDs[::-1], cellIDs[::-1])
+        numerix.put(secondRow, faceIDs, cellIDs)
+
+        faceCellIDs = numerix.array((numerix.minimum(firstRow, secondRow),
+                                     numerix.maximum(firstRow, secondRow)))
+        mask = numerix.array((numerix.zeros(self.numberOfFaces, bool),
+                              firstRow == secondRow))
+        return MA.array(faceCellIDs, mask=mask)
 
     """get Topology methods"""
 
@@ -460,25 +455,26 @@ class Mesh(AbstractMesh):
 
     @property
     def _cellVertexIDs(self):
-        ## Get all the vertices from all the faces for each cell
-        cellFaceVertices = numerix.take(self.faceVertexIDs, self.cellFaceIDs, axis=1)
-
-        ## get a sorted list of vertices for each cell
-        cellVertexIDs = numerix.reshape(cellFaceVertices, (-1, self.numberOfCells))
-        cellVertexIDs = MA.sort(cellVertexIDs, axis=0, fill_value=-1)
-
-        cellVertexIDs = MA.sort(MA.concatenate((cellVertexIDs[-1, numerix.newaxis],
-                                                MA.masked_where(cellVertexIDs[:-1]
-                                                                == cellVertexIDs[1:],
-                                                                cellVertexIDs[:-1]))),
-                                axis=0, fill_value=-1)
-
-        ## resize the array to remove extra masked values
+        ## Get all the vertices from all the faces for each cell,
+        ## with -1 for missing faces and vertices
+        faceVertexIDs = MA.filled(self.faceVertexIDs, -1)
+        cellFaceIDs = MA.filled(self.cellFaceIDs, 0)
+        cellVertexIDs = numerix.where(MA.getmaskarray(self.cellFaceIDs)[numerix.newaxis],
+                                      -1, faceVertexIDs[:, cellFaceIDs])
+
+        ## get a sorted list of vertices for each cell, with each vertex
+        ## listed once and the missing ones first
+        cellVertexIDs = numerix.reshape(cellVertexIDs, (-1, self.numberOfCells))
+        cellVertexIDs.sort(axis=0)
+        cellVertexIDs[1:][cellVertexIDs[1:] == cellVertexIDs[:-1]] = -1
+        cellVertexIDs.sort(axis=0)
+
+        ## resize the array to remove extra missing values
         if cellVertexIDs.shape[-1] == 0:
             length = 0
         else:
-            length = min(numerix.sum(MA.getmaskarray(cellVertexIDs), axis=0))
-        return cellVertexIDs[length:][::-1]
+            length = min(numerix.sum(cellVertexIDs == -1, axis=0))
+        return MA.masked_values(cellVertexIDs[length:][::-1], -1)
 
 #     Below is an ordered version of _getCellVertexIDs()
 #     It works for the test case in this file (other than the ordering, obviously)
@@ -543,9 +539,41 @@ class Mesh(AbstractMesh):
            >>> m1 = Grid2D(nx=2, ny=2, dx=5., dy=5.)
            >>> print(m0._getNearestCellID(m1.cellCenters.globalValue))
            [4 5 7 8]
+           >>> print(m0._getNearestCellID((6., 0.)))
+           2
+
+        The spatial index is built once and reused
+
+           >>> m0._cellCenterTree is m0._cellCenterTree
+           True
+
+        """
+        tree = self._cellCenterTree
+        if tree is None or numerix._isPhysical(points):
+            return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+
+        points = numerix.asanyarray(points)
+        if numerix.ndim(points) > 1:
+            points = points.swapaxes(0, 1)
+        return tree.query(points)[1]
+
+    @property
+    def _cellCenterTree(self):
+        """k-d tree of the global cell centers
 
+        `None` if the tree cannot be built, either because :mod:`scipy.spatial`
+        is unavailable or because the cell centers carry units.
         """
-        return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        if getattr(self, "_cellCenterTreeData", None) is None:
+            centers = self.cellCenters.globalValue
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                return None
+            if numerix._isPhysical(centers) or centers.shape[-1] == 0:
+                return None
+            self._cellCenterTreeData = cKDTree(numerix.asarray(centers).swapaxes(0, 1))
+        return self._cellCenterTreeData
 
     def _test(self):
         """
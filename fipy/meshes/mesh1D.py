@@ -57,8 +57,5 @@ class Mesh1D(Mesh):
 
     @property
     def _VTKCellType(self):
-        try:
-            from tvtk.api import tvtk
-        except ImportError as e:
-            from enthought.tvtk.api import tvtk
-        return tvtk.Line().cell_type
+        # VTK_LINE
+        return 3
@@ -52,7 +52,7 @@ class Mesh2D(Mesh):
         return numerix.sqrtDot(tangent, tangent)
 
     def _calcFaceNormals(self):
-        faceVertexCoords = numerix.take(self.vertexCoords, self.faceVertexIDs, axis=1)
+        faceVertexCoords = numerix.take(self.vertexCoords, MA.filled(self.faceVertexIDs, 0), axis=1)
         t1 = faceVertexCoords[:, 1,:] - faceVertexCoords[:, 0,:]
         faceNormals = t1.copy()
         mag = numerix.sqrt(t1[1]**2 + t1[0]**2)
@@ -232,11 +232,8 @@ class Mesh2D(Mesh):
 
     @property
     def _VTKCellType(self):
-        try:
-            from tvtk.api import tvtk
-        except ImportError as e:
-            from enthought.tvtk.api import tvtk
-        return tvtk.Polygon().cell_type
+        # VTK_POLYGON
+        return 7
 
     def _test(self):
         """
@@ -0,0 +1,329 @@
+"""Save a fully built mesh and load it again without rebuilding it
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+import os
+import pickle
+import struct
+import zipfile
+
+from numpy.lib import format as npyFormat
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+from fipy.tools import parallelComm
+
+__all__ = ["saveMesh", "loadMesh"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+# attributes that are rebuilt, rather than stored
+_rebuiltAttributes = ("communicator", "representation", "topology",
+                      "_cellCenterTreeData")
+
+class _CachedArray(object):
+    """Stands in for an array stored in its own member of the archive"""
+    def __init__(self, key, masked=False, fillValue=None):
+        self.key = key
+        self.masked = masked
+        self.fillValue = fillValue
+
+class _CachedVariable(object):
+    """Stands in for a `MeshVariable` of the cached mesh"""
+    def __init__(self, variableClass, name, value):
+        self.variableClass = variableClass
+        self.name = name
+        self.value = value
+
+def _rankFilename(filename, communicator):
+    """The file of this processor
+
+    >>> from fipy.tools.comms.dummyComm import DummyComm
+    >>> print(_rankFilename("mesh.npz", DummyComm()))
+    mesh.npz
+    >>> class _Comm(DummyComm):
+    ...     procID = 2
+    ...     Nproc = 4
+    >>> print(_rankFilename("mesh.npz", _Comm()))
+    mesh.2.npz
+    """
+    if communicator.Nproc > 1:
+        root, ext = os.path.splitext(filename)
+        filename = "%s.%d%s" % (root, communicator.procID, ext)
+    return filename
+
+def _memmapMember(filename, archive, name):
+    """Map the `.npy` member `name` of the `.npz` file `filename` into memory
+
+    Only uncompressed members can be mapped; others are read.
+    Writes to the array are not written back to the file.
+    """
+    info = archive.getinfo(name)
+    if info.compress_type == zipfile.ZIP_STORED:
+        with open(filename, 'rb') as fileobj:
+            fileobj.seek(info.header_offset)
+            localHeader = fileobj.read(30)
+            nameLength, extraLength = struct.unpack("<HH", localHeader[26:30])
+            fileobj.seek(info.header_offset + 30 + nameLength + extraLength)
+
+            version = npyFormat.read_magic(fileobj)
+            if version == (1, 0):
+                header = npyFormat.read_array_header_1_0(fileobj)
+            elif version == (2, 0):
+                header = npyFormat.read_array_header_2_0(fileobj)
+            else:
+                header = None
+            offset = fileobj.tell()
+
+        if header is not None:
+            shape, fortranOrder, dtype = header
+            if numerix.prod(shape) == 0:
+                return numerix.zeros(shape, dtype=dtype)
+            array = numerix.memmap(filename, dtype=dtype, mode='c',
+                                   offset=offset, shape=shape,
+                                   order='F' if fortranOrder else 'C')
+            return array.view(numerix.ndarray)
+
+    with archive.open(name) as member:
+        return npyFormat.read_array(member)
+
+def _replace(source, destination):
+    """Move the file `source` to `destination`, replacing any file there
+
+    A process that has mapped the file it replaces keeps the old file.
+    """
+    if hasattr(os, "replace"):
+        os.replace(source, destination)
+    else:
+        # Python 2 renames over an existing file everywhere but on Windows
+        if os.name == "nt" and os.path.exists(destination):
+            os.remove(destination)
+        os.rename(source, destination)
+
+def saveMesh(mesh, filename):
+    """Save a fully built mesh
+
+    Everything the mesh has computed about its vertices, faces, and cells,
+    including its connectivity, its geometry, the physical regions of a
+    `Gmsh2D` or `Gmsh3D`, and its parallel partitioning, is written to an
+    uncompressed `.npz` file, one array per member. In parallel, each
+    processor writes its part to its own file, with the processor number
+    inserted before the extension of `filename`.
+
+    >>> import os
+    >>> import tempfile
+    >>> from fipy import CellVariable, DiffusionTerm, Tri2D, numerix
+    >>> m = Tri2D(nx=3, ny=2) + [[1.], [2.]]
+    >>> f, name = tempfile.mkstemp(suffix=".npz")
+    >>> os.close(f)
+    >>> saveMesh(m, name)
+    >>> mm = loadMesh(name)
+    >>> print(mm.__class__.__name__, mm.numberOfCells, mm.numberOfFaces)
+    Mesh2D 24 41
+    >>> print(numerix.allclose(mm.cellCenters, m.cellCenters))
+    True
+    >>> print(numerix.allclose(mm.faceNormals, m.faceNormals))
+    True
+    >>> print(numerix.allequal(mm.exteriorFaces, m.exteriorFaces))
+    True
+
+    Solutions on the loaded mesh match those on the original
+
+    >>> def solve(mesh):
+    ...     var = CellVariable(mesh=mesh)
+    ...     var.constrain(0., mesh.facesLeft)
+    ...     var.constrain(1., mesh.facesRight)
+    ...     DiffusionTerm().solve(var=var)
+    ...     return var
+    >>> print(numerix.allclose(solve(mm), solve(m)))
+    True
+
+    The file is written in full under another name and then moved into
+    place, so a mesh that is still mapped from an earlier file of the
+    same name keeps its arrays
+
+    >>> saveMesh(Tri2D(nx=1, ny=1), name)
+    >>> print(numerix.allclose(mm.cellCenters, m.cellCenters))
+    True
+    >>> print(loadMesh(name).numberOfCells)
+    4
+
+    >>> del mm
+    >>> os.remove(name)
+
+    Parameters
+    ----------
+    mesh : ~fipy.meshes.mesh.Mesh
+        The mesh to save
+    filename : str
+        Name of the file to write
+    """
+    from fipy.variables.variable import Variable
+
+    arrays = {}
+    keys = {}
+    # hold on to the arrays, so that `id()` is not reused
+    held = []
+
+    def storeArray(array):
+        if id(array) not in keys:
+            key = "a%d" % len(keys)
+            keys[id(array)] = key
+            held.append(array)
+            arrays[key] = MA.getdata(array)
+            if MA.isMaskedArray(array):
+                arrays[key + "_mask"] = MA.getmaskarray(array)
+        key = keys[id(array)]
+        if MA.isMaskedArray(array):
+            return _CachedArray(key, masked=True, fillValue=array.fill_value)
+        else:
+            return _CachedArray(key)
+
+    def extract(value):
+        if isinstance(value, Variable) and getattr(value, "mesh", None) is mesh:
+            return _CachedVariable(variableClass=value._variableClass,
+                                   name=value._name,
+                                   value=extract(value.value))
+        elif isinstance(value, numerix.ndarray) and value.dtype != object:
+            return storeArray(value)
+        elif isinstance(value, dict):
+            return dict((k, extract(v)) for k, v in value.items())
+        elif isinstance(value, (list, tuple)) and not isinstance(value, numerix.ndarray):
+            extracted = [extract(v) for v in value]
+            if isinstance(value, tuple):
+                return tuple(extracted)
+            return extracted
+        else:
+            return value
+
+    attributes = dict((name, extract(value))
+                      for name, value in mesh.__dict__.items()
+                      if name not in _rebuiltAttributes)
+
+    state = dict(meshClass=mesh.__class__,
+                 representationClass=mesh.representation.__class__,
+                 topologyClass=mesh.topology.__class__,
+                 procID=mesh.communicator.procID,
+                 Nproc=mesh.communicator.Nproc,
+                 attributes=attributes)
+    arrays["state"] = numerix.frombuffer(pickle.dumps(state, protocol=2),
+                                         dtype=numerix.uint8)
+
+    # meshes loaded from an earlier file of this name may still be
+    # mapped from it, so it is replaced rather than overwritten
+    filename = _rankFilename(filename, mesh.communicator)
+    temporary = "%s.%d.tmp" % (filename, os.getpid())
+    try:
+        # an open file keeps `savez` from appending `.npz`
+        with open(temporary, 'wb') as fileobj:
+            numerix.savez(fileobj, **arrays)
+        _replace(temporary, filename)
+    except:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+def loadMesh(filename, communicator=parallelComm, mmap=True):
+    """Load a mesh saved by `saveMesh`
+
+    Nothing is recomputed. Unless `mmap` is `False`, the arrays of the mesh
+    are mapped from the file into memory as they are needed, rather than
+    read, so even very large meshes load in a moment.  The file must not
+    be modified while the mesh is in use; `saveMesh` replaces a file
+    rather than modifying it.
+
+    .. warning:: The file holds pickled classes, which are imported and
+       can run arbitrary code when loaded. Only load files you trust.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the file given to `saveMesh`
+    communicator : ~fipy.tools.comms.commWrapper.CommWrapper
+        Generally, `fipy.tools.serialComm` or `fipy.tools.parallelComm`.
+        Must have as many processors as the mesh was saved with.
+    mmap : bool
+        Whether to map the arrays into memory
+
+    Returns
+    -------
+    ~fipy.meshes.abstractMesh.AbstractMesh
+        The mesh, of the same class as the one that was saved
+    """
+    filename = _rankFilename(filename, communicator)
+
+    with zipfile.ZipFile(filename) as archive:
+        with archive.open("state.npy") as member:
+            state = pickle.loads(npyFormat.read_array(member).tobytes())
+
+        if state["Nproc"] != communicator.Nproc:
+            raise ValueError("Mesh was saved by %d processors, not %d"
+                             % (state["Nproc"], communicator.Nproc))
+
+        arrays = {}
+
+        def array(key):
+            if key not in arrays:
+                if mmap:
+                    arrays[key] = _memmapMember(filename, archive, key + ".npy")
+                else:
+                    with archive.open(key + ".npy") as member:
+                        arrays[key] = npyFormat.read_array(member)
+            return arrays[key]
+
+        def restore(value):
+            if isinstance(value, _CachedArray):
+                if value.masked:
+                    return MA.array(array(value.key),
+                                    mask=array(value.key + "_mask"),
+                                    fill_value=value.fillValue,
+                                    copy=False)
+                return array(value.key)
+            elif isinstance(value, _CachedVariable):
+                return value.variableClass(mesh=mesh,
+                                           value=restore(value.value),
+                                           name=value.name)
+            elif isinstance(value, dict):
+                return dict((k, restore(v)) for k, v in value.items())
+            elif isinstance(value, (list, tuple)):
+                restored = [restore(v) for v in value]
+                if isinstance(value, tuple):
+                    return tuple(restored)
+                return restored
+            else:
+                return value
+
+        def hasVariables(value):
+            if isinstance(value, _CachedVariable):
+                return True
+            elif isinstance(value, dict):
+                return any(hasVariables(v) for v in value.values())
+            elif isinstance(value, (list, tuple)):
+                return any(hasVariables(v) for v in value)
+            return False
+
+        from fipy.meshes.abstractMesh import AbstractMesh
+
+        mesh = state["meshClass"].__new__(state["meshClass"])
+        AbstractMesh.__init__(mesh, communicator=communicator,
+                              _RepresentationClass=state["representationClass"],
+                              _TopologyClass=state["topologyClass"])
+
+        # variables need the rest of the mesh to be in place
+        attributes = state["attributes"]
+        for withVariables in (False, True):
+            for name, value in attributes.items():
+                if hasVariables(value) == withVariables:
+                    mesh.__dict__[name] = restore(value)
+
+    return mesh
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -61,6 +61,7 @@ class NonUniformGrid1D(Mesh1D):
          self.numberOfFaces,
          self.numberOfCells,
          self.shape,
+         self._globalShape,
          self.physicalShape,
          self._meshSpacing,
          self.occupiedNodes,
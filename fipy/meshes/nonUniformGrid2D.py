@@ -20,6 +20,9 @@ class NonUniformGrid2D(Mesh2D):
     Creates a 2D grid mesh with horizontal faces numbered
     first and then vertical faces.
     """
+
+    _periodicAxes = ()
+
     def __init__(self, dx=1., dy=1., nx=None, ny=None, overlap=2, communicator=parallelComm,
                  _RepresentationClass=_Grid2DRepresentation, _TopologyClass=_Grid2DTopology):
 
@@ -33,7 +36,8 @@ class NonUniformGrid2D(Mesh2D):
             'overlap': overlap
         }
 
-        builder.buildGridData([dx, dy], [nx, ny], overlap, communicator)
+        builder.buildGridData([dx, dy], [nx, ny], overlap, communicator,
+                              periodicAxes=self._periodicAxes)
 
         ([self.dx, self.dy],
          [self.nx, self.ny],
@@ -47,6 +51,7 @@ class NonUniformGrid2D(Mesh2D):
          self.numberOfFaces,
          self.numberOfCells,
          self.shape,
+         self._globalShape,
          self.physicalShape,
          self._meshSpacing,
          self.numberOfHorizontalRows,
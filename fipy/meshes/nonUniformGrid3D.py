@@ -29,6 +29,9 @@ class NonUniformGrid3D(Mesh):
 
     Faces: XY faces numbered first, then XZ faces, then YZ faces. Within each subcategory, it is numbered in the usual way.
     """
+
+    _periodicAxes = ()
+
     def __init__(self, dx = 1., dy = 1., dz = 1., nx = None, ny = None, nz = None, overlap=2, communicator=parallelComm,
                  _RepresentationClass=_Grid3DRepresentation, _TopologyClass=_Grid3DTopology):
 
@@ -45,7 +48,7 @@ class NonUniformGrid3D(Mesh):
         }
 
         builder.buildGridData([dx, dy, dz], [nx, ny, nz], overlap,
-                              communicator)
+                              communicator, periodicAxes=self._periodicAxes)
 
         ([self.dx, self.dy, self.dz],
          [self.nx, self.ny, self.nz],
@@ -59,6 +62,7 @@ class NonUniformGrid3D(Mesh):
          self.numberOfFaces,
          self.numberOfCells,
          self.shape,
+         self._globalShape,
          self.physicalShape,
          self._meshSpacing,
          self.numberOfXYFaces,
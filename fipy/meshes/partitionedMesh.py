@@ -0,0 +1,275 @@
+"""Split any mesh between the processors of a parallel run
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+from fipy.tools import parallelComm
+
+from fipy.meshes.topologies.meshTopology import _PartitionedMeshTopology
+
+__all__ = ["PartitionedMesh"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+def _recursiveCoordinateBisection(points, numberOfParts):
+    """Assign each of `points` to one of `numberOfParts` parts
+
+    The points are repeatedly cut in two across their longest extent, in
+    proportion to the number of parts that each side will be cut into, so
+    that the parts are of nearly equal size.
+
+    >>> x = numerix.array([[0., 1., 2., 3., 0., 1., 2., 3.],
+    ...                    [0., 0., 0., 0., 1., 1., 1., 1.]])
+    >>> print(_recursiveCoordinateBisection(x, 1))
+    [0 0 0 0 0 0 0 0]
+    >>> print(_recursiveCoordinateBisection(x, 2))
+    [0 0 1 1 0 0 1 1]
+    >>> print(_recursiveCoordinateBisection(x, 4))
+    [0 1 2 3 0 1 2 3]
+    >>> print(_recursiveCoordinateBisection(x, 3))
+    [0 1 1 2 0 1 2 2]
+
+    Some parts are left empty when there are more parts than points
+
+    >>> print(_recursiveCoordinateBisection(x, 10))
+    [1 3 6 8 2 4 7 9]
+
+    Parameters
+    ----------
+    points : array_like
+        Coordinates of the points, of shape (dim, N)
+    numberOfParts : int
+        The number of parts
+
+    Returns
+    -------
+    ndarray
+        The part of each point
+    """
+    points = numerix.asarray(points)
+    parts = numerix.zeros(points.shape[-1], dtype=numerix.INT_DTYPE)
+
+    pending = [(numerix.arange(points.shape[-1]), 0, numberOfParts)]
+    while pending:
+        ids, first, number = pending.pop()
+        if number == 1 or len(ids) == 0:
+            parts[ids] = first
+            continue
+
+        coords = points[..., ids]
+        axis = numerix.argmax(coords.max(axis=-1) - coords.min(axis=-1))
+        order = numerix.argsort(coords[axis], kind="mergesort")
+
+        lower = number // 2
+        split = (len(ids) * lower) // number
+        pending.append((ids[order[:split]], first, lower))
+        pending.append((ids[order[split:]], first + lower, number - lower))
+
+    return parts
+
+def _partitionCells(mesh, parts, part, overlap):
+    """Cells of `mesh` that are in `part` and the ghost cells around them
+
+    The ghost cells are the cells of other parts that are within `overlap`
+    neighbors of the cells of `part`.
+
+    >>> from fipy import Grid2D
+    >>> m = Grid2D(nx=4, ny=2)
+    >>> parts = numerix.array([0, 0, 1, 1, 0, 0, 1, 1])
+    >>> print(_partitionCells(m, parts, 0, overlap=1))
+    (array([0, 1, 4, 5]), array([2, 6]))
+    >>> print(_partitionCells(m, parts, 1, overlap=2))
+    (array([2, 3, 6, 7]), array([0, 1, 4, 5]))
+    >>> print(_partitionCells(m, parts, 1, overlap=0))
+    (array([2, 3, 6, 7]), array([], dtype=int64))
+    """
+    owned = (parts == part)
+    neighbors = MA.filled(mesh._cellToCellIDs, -1)
+
+    local = owned.copy()
+    for layer in range(overlap):
+        adjacent = neighbors[..., local]
+        local[adjacent[adjacent >= 0]] = True
+
+    return (numerix.nonzero(owned)[0],
+            numerix.nonzero(local & ~owned)[0])
+
+def _submeshArrays(mesh, cellIDs):
+    """Vertices, faces and cells of `mesh` that bound `cellIDs`
+
+    The faces and vertices are renumbered in their global order, and
+    missing entries are padded with -1.
+
+    >>> from fipy import Grid2D
+    >>> m = Grid2D(nx=2, ny=1)
+    >>> vertexCoords, faceVertexIDs, cellFaceIDs = _submeshArrays(m, [1])
+    >>> print(vertexCoords)
+    [[ 1.  2.  1.  2.]
+     [ 0.  0.  1.  1.]]
+    >>> print(faceVertexIDs)
+    [[0 2 0 1]
+     [1 3 2 3]]
+    >>> print(cellFaceIDs)
+    [[0]
+     [3]
+     [1]
+     [2]]
+    """
+    cellFaceIDs = MA.filled(mesh.cellFaceIDs, -1)[..., cellIDs]
+    faceIDs = numerix.unique(cellFaceIDs[cellFaceIDs >= 0])
+
+    faceVertexIDs = MA.filled(mesh.faceVertexIDs, -1)[..., faceIDs]
+    vertexIDs = numerix.unique(faceVertexIDs[faceVertexIDs >= 0])
+
+    def renumber(ids, used, total):
+        new = -numerix.ones(total + 1, dtype=numerix.INT_DTYPE)
+        new[used] = numerix.arange(len(used))
+        # -1 entries pick up the -1 stored past the end
+        return new[ids]
+
+    return (numerix.take(mesh.vertexCoords, vertexIDs, axis=1),
+            renumber(faceVertexIDs, vertexIDs, mesh.vertexCoords.shape[-1]),
+            renumber(cellFaceIDs, faceIDs, mesh.numberOfFaces))
+
+class _OrderedPartitionedMeshTopology(_PartitionedMeshTopology):
+    """Topology of a part of a mesh whose owned and ghost cells are kept
+    in the order of their global IDs
+
+    Keeping that order means that, when a part holds every cell of the
+    global mesh, its cells are numbered just as they are globally.
+    """
+
+    @property
+    def _globalOverlappingCellIDs(self):
+        return numerix.sort(numerix.concatenate((self.mesh.cellGlobalIDs,
+                                                 self.mesh.gCellGlobalIDs)).astype(numerix.INT_DTYPE))
+
+    @property
+    def _localNonOverlappingCellIDs(self):
+        return numerix.searchsorted(self._globalOverlappingCellIDs,
+                                    self.mesh.cellGlobalIDs)
+
+def PartitionedMesh(mesh, overlap=2, communicator=parallelComm):
+    r"""The part of `mesh` that belongs to this processor
+
+    The cells of `mesh` are divided between the processors of
+    `communicator` by recursive coordinate bisection of the cell centers,
+    and each processor gets the cells of its part plus `overlap` layers of
+    ghost cells around them. This makes any mesh, including those built
+    directly from vertices, faces and cells, usable in a parallel run. Every
+    processor needs the whole of `mesh` to find its part.
+
+    >>> from fipy import CellVariable, DiffusionTerm, Tri2D, numerix
+    >>> from fipy import serialComm
+    >>> m = Tri2D(nx=3, ny=3)
+    >>> pm = PartitionedMesh(m, communicator=serialComm)
+    >>> print(pm.numberOfCells == pm.globalNumberOfCells == m.numberOfCells)
+    True
+    >>> print(numerix.allclose(pm.cellCenters, m.cellCenters))
+    True
+
+    Solutions on the partitioned mesh match those on the original
+
+    >>> def solve(mesh):
+    ...     var = CellVariable(mesh=mesh)
+    ...     var.constrain(0., mesh.facesLeft)
+    ...     var.constrain(1., mesh.facesRight)
+    ...     DiffusionTerm().solve(var=var)
+    ...     return var
+    >>> print(numerix.allclose(solve(pm).globalValue, solve(m).globalValue))
+    True
+    >>> pm = PartitionedMesh(m)
+    >>> print(numerix.allclose(solve(pm).globalValue, solve(m).globalValue))
+    True
+
+    Each processor keeps its cells and its ghost cells in the order of
+    their global IDs, so values given for the whole mesh land on the
+    right cells, even when the ghost cells make up the rest of the mesh.
+    Here, the parts of two processors are built in turn
+
+    >>> from fipy import Grid3D
+    >>> from fipy.tools.comms.dummyComm import DummyComm
+    >>> def _comm(procID, Nproc):
+    ...     class _Comm(DummyComm):
+    ...         pass
+    ...     _Comm.procID, _Comm.Nproc = procID, Nproc
+    ...     return _Comm()
+    >>> g = Grid3D(nx=4, ny=3, nz=3)
+    >>> for overlap in (1, 2):
+    ...     for procID in range(2):
+    ...         pm = PartitionedMesh(g, overlap=overlap,
+    ...                              communicator=_comm(procID, 2))
+    ...         ids = pm._globalOverlappingCellIDs
+    ...         var = CellVariable(mesh=pm, value=g.x.value)
+    ...         print(pm.numberOfCells,
+    ...               numerix.allclose(pm.cellCenters, g.cellCenters.value[..., ids]),
+    ...               numerix.allclose(var, pm.x))
+    27 True True
+    27 True True
+    36 True True
+    36 True True
+
+    Grids are partitioned like any other mesh
+
+    >>> from fipy import Grid1D
+    >>> pm = PartitionedMesh(Grid1D(nx=10), overlap=1, communicator=_comm(1, 2))
+    >>> print(pm.numberOfCells)
+    6
+    >>> print(pm._localNonOverlappingCellIDs)
+    [1 2 3 4 5]
+
+    Parameters
+    ----------
+    mesh : ~fipy.meshes.mesh.Mesh
+        The whole mesh
+    overlap : int
+        The number of layers of ghost cells
+    communicator : ~fipy.tools.comms.commWrapper.CommWrapper
+        Generally, `fipy.tools.serialComm` or `fipy.tools.parallelComm`.
+        Select `~fipy.tools.serialComm` to keep the whole mesh on every
+        processor.
+
+    Returns
+    -------
+    ~fipy.meshes.mesh.Mesh
+        A `Mesh1D`, `Mesh2D` or `Mesh` holding this processor's cells
+        and its ghost cells, in the order of their global IDs
+    """
+    from fipy.meshes.mesh import Mesh
+    from fipy.meshes.mesh1D import Mesh1D
+    from fipy.meshes.mesh2D import Mesh2D
+
+    if mesh.numberOfCells != mesh.globalNumberOfCells:
+        raise ValueError("The mesh to partition must not already be partitioned")
+
+    # uniform grids do not list their faces' vertices
+    mesh = mesh._concatenableMesh
+
+    parts = _recursiveCoordinateBisection(mesh.cellCenters.globalValue,
+                                          communicator.Nproc)
+    owned, ghosts = _partitionCells(mesh, parts, communicator.procID, overlap)
+
+    vertexCoords, faceVertexIDs, cellFaceIDs = \
+      _submeshArrays(mesh, numerix.sort(numerix.concatenate((owned, ghosts))))
+
+    MeshClass = {1: Mesh1D, 2: Mesh2D}.get(mesh.dim, Mesh)
+    local = MeshClass(vertexCoords, faceVertexIDs, cellFaceIDs,
+                      communicator=communicator,
+                      _TopologyClass=_OrderedPartitionedMeshTopology)
+
+    local.cellGlobalIDs = list(owned)
+    local.gCellGlobalIDs = list(ghosts)
+    local.globalNumberOfCells = mesh.globalNumberOfCells
+
+    return local
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -97,6 +97,8 @@ class PeriodicGrid2D(_BasePeriodicGrid2D):
         True
     """
 
+    _periodicAxes = (0, 1)
+
     def _makePeriodic(self):
         self._connectFaces(numerix.nonzero(self.facesLeft),
                            numerix.nonzero(self.facesRight))
@@ -104,11 +106,15 @@ class PeriodicGrid2D(_BasePeriodicGrid2D):
                            numerix.nonzero(self.facesTop))
 
 class PeriodicGrid2DLeftRight(_BasePeriodicGrid2D):
+    _periodicAxes = (0,)
+
     def _makePeriodic(self):
         self._connectFaces(numerix.nonzero(self.facesLeft),
                            numerix.nonzero(self.facesRight))
 
 class PeriodicGrid2DTopBottom(_BasePeriodicGrid2D):
+    _periodicAxes = (1,)
+
     def _makePeriodic(self):
         self._connectFaces(numerix.nonzero(self.facesBottom),
                            numerix.nonzero(self.facesTop))
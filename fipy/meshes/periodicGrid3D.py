@@ -115,6 +115,8 @@ class PeriodicGrid3D(_BasePeriodicGrid3D):
         True
     """
 
+    _periodicAxes = (0, 1, 2)
+
     def _makePeriodic(self):
         self._connectFaces(numerix.nonzero(self.facesLeft),
                            numerix.nonzero(self.facesRight))
@@ -141,11 +143,15 @@ class PeriodicGrid3D(_BasePeriodicGrid3D):
         pass
 
 class PeriodicGrid3DLeftRight(_BasePeriodicGrid3D):
+    _periodicAxes = (0,)
+
     def _makePeriodic(self):
         self._connectFaces(numerix.nonzero(self.facesLeft),
                            numerix.nonzero(self.facesRight))
 
 class PeriodicGrid3DLeftRightTopBottom(_BasePeriodicGrid3D):
+    _periodicAxes = (0, 1)
+
     def _makePeriodic(self):
         self._connectFaces(numerix.nonzero(self.facesLeft),
                            numerix.nonzero(self.facesRight))
@@ -153,6 +159,8 @@ class PeriodicGrid3DLeftRightTopBottom(_BasePeriodicGrid3D):
                            numerix.nonzero(self.facesTop))
 
 class PeriodicGrid3DLeftRightFrontBack(_BasePeriodicGrid3D):
+    _periodicAxes = (0, 2)
+
     def _makePeriodic(self):
         self._connectFaces(numerix.nonzero(self.facesLeft),
                            numerix.nonzero(self.facesRight))
@@ -160,11 +168,15 @@ class PeriodicGrid3DLeftRightFrontBack(_BasePeriodicGrid3D):
                            numerix.nonzero(self.facesBack))
 
 class PeriodicGrid3DTopBottom(_BasePeriodicGrid3D):
+    _periodicAxes = (1,)
+
     def _makePeriodic(self):
         self._connectFaces(numerix.nonzero(self.facesBottom),
                            numerix.nonzero(self.facesTop))
 
 class PeriodicGrid3DTopBottomFrontBack(_BasePeriodicGrid3D):
+    _periodicAxes = (1, 2)
+
     def _makePeriodic(self):
         self._connectFaces(numerix.nonzero(self.facesBottom),
                            numerix.nonzero(self.facesTop))
@@ -172,6 +184,8 @@ class PeriodicGrid3DTopBottomFrontBack(_BasePeriodicGrid3D):
                            numerix.nonzero(self.facesBack))
 
 class PeriodicGrid3DFrontBack(_BasePeriodicGrid3D):
+    _periodicAxes = (2,)
+
     def _makePeriodic(self):
         self._connectFaces(numerix.nonzero(self.facesFront),
                            numerix.nonzero(self.facesBack))
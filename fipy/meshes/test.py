@@ -16,9 +16,12 @@ def _suite():
         'fipy.meshes.nonUniformGrid3D',
         'fipy.meshes.tri2D',
         'fipy.meshes.gmshMesh',
+        'fipy.meshes.partitionedMesh',
+        'fipy.meshes.meshCache',
         'fipy.meshes.periodicGrid1D',
         'fipy.meshes.periodicGrid2D',
         'fipy.meshes.periodicGrid3D',
+        'fipy.meshes.uniformGrid',
         'fipy.meshes.uniformGrid1D',
         'fipy.meshes.uniformGrid2D',
         'fipy.meshes.uniformGrid3D',
@@ -30,6 +33,8 @@ def _suite():
         'fipy.meshes.sphericalNonUniformGrid1D',
         'fipy.meshes.factoryMeshes',
         'fipy.meshes.abstractMesh',
+        'fipy.meshes.builders.abstractGridBuilder',
+        'fipy.meshes.topologies.gridTopology',
         'fipy.meshes.representations.gridRepresentation'))
 
 if __name__ == '__main__':
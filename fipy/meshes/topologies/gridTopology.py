@@ -17,6 +17,50 @@ class _GridTopology(_AbstractTopology):
     def _isOrthogonal(self):
         return True
 
+    @staticmethod
+    def _blockCellIDs(starts, stops, shape):
+        """IDs of the cells from `starts` up to `stops` along each axis of a
+        grid of `shape` cells, with x varying fastest
+
+        >>> print(_GridTopology._blockCellIDs((1, 0), (3, 2), (4, 3)))
+        [1 2 5 6]
+        >>> print(_GridTopology._blockCellIDs((0, 1, 1), (2, 2, 3), (2, 3, 3)))
+        [ 8  9 14 15]
+        """
+        ids = numerix.zeros((), 'l')
+        stride = 1
+        for axis, (start, stop, n) in enumerate(zip(starts, stops, shape)):
+            index = numerix.arange(start, stop) * stride
+            ids = ids + index.reshape((-1,) + (1,) * axis)
+            stride *= n
+        return ids.ravel()
+
+    def _starts(self, overlapping):
+        mesh = self.mesh
+        starts = [0] * mesh.dim
+        if not overlapping:
+            starts = [mesh.overlap[side] for side in ("left", "bottom", "front")[:mesh.dim]]
+        return starts
+
+    def _stops(self, overlapping):
+        mesh = self.mesh
+        stops = list(mesh.shape)
+        if not overlapping:
+            stops = [n - mesh.overlap[side]
+                     for n, side in zip(stops, ("right", "top", "back"))]
+        return stops
+
+    def _globalCellIDs(self, overlapping):
+        offset = self.mesh.offset
+        return self._blockCellIDs([start + o for start, o in zip(self._starts(overlapping), offset)],
+                                  [stop + o for stop, o in zip(self._stops(overlapping), offset)],
+                                  self.mesh._globalShape)
+
+    def _localCellIDs(self, overlapping):
+        return self._blockCellIDs(self._starts(overlapping),
+                                  self._stops(overlapping),
+                                  self.mesh.shape)
+
 class _Grid1DTopology(_GridTopology):
 
     _concatenatedClass = Mesh1D
@@ -210,8 +254,7 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange((self.mesh.offset[1] + self.mesh.overlap['bottom']) * self.mesh.nx,
-                              (self.mesh.offset[1] + self.mesh.ny - self.mesh.overlap['top']) * self.mesh.nx)
+        return self._globalCellIDs(overlapping=False)
 
     @property
     def _globalOverlappingCellIDs(self):
@@ -233,7 +276,7 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.offset[1] * self.mesh.nx, (self.mesh.offset[1] + self.mesh.ny) * self.mesh.nx)
+        return self._globalCellIDs(overlapping=True)
 
     @property
     def _localNonOverlappingCellIDs(self):
@@ -255,8 +298,7 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.overlap['bottom'] * self.mesh.nx,
-                              (self.mesh.ny - self.mesh.overlap['top']) * self.mesh.nx)
+        return self._localCellIDs(overlapping=False)
 
     @property
     def _localOverlappingCellIDs(self):
@@ -301,8 +343,7 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange((self.mesh.offset[2] + self.mesh.overlap['front']) * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.offset[2] + self.mesh.nz - self.mesh.overlap['back']) * self.mesh.nx * self.mesh.ny)
+        return self._globalCellIDs(overlapping=False)
 
     @property
     def _globalOverlappingCellIDs(self):
@@ -312,9 +353,7 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-
-        return numerix.arange(self.mesh.offset[2] * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.offset[2] + self.mesh.nz) * self.mesh.nx * self.mesh.ny)
+        return self._globalCellIDs(overlapping=True)
 
     @property
     def _localNonOverlappingCellIDs(self):
@@ -324,8 +363,7 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.overlap['front'] * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.nz - self.mesh.overlap['back']) * self.mesh.nx * self.mesh.ny)
+        return self._localCellIDs(overlapping=False)
 
     @property
     def _localOverlappingCellIDs(self):
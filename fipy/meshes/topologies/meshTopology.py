@@ -100,3 +100,96 @@ class _Mesh2DTopology(_MeshTopology):
         cellTopology[facesPerCell == 4] = t["quadrangle"]
 
         return cellTopology
+
+class _PartitionedMeshTopology(_MeshTopology):
+    """Topology of a mesh that is one part of a global parallel mesh
+
+    The mesh lists the global IDs of the cells it owns in `cellGlobalIDs`
+    and of its ghost cells in `gCellGlobalIDs`.
+    """
+
+
+    @property
+    def _globalNonOverlappingCellIDs(self):
+        """
+        Return the IDs of the local mesh in the context of the
+        global parallel mesh. Does not include the IDs of boundary cells.
+
+        E.g., would return [0, 1, 4, 5] for mesh A
+        
+        ```
+            A        B
+        ------------------
+        | 4 | 5 || 6 | 7 |
+        ------------------
+        | 0 | 1 || 2 | 3 |
+        ------------------
+        ```
+
+        .. note:: Trivial except for parallel meshes
+        """
+        return numerix.array(self.mesh.cellGlobalIDs)
+
+    @property
+    def _globalOverlappingCellIDs(self):
+        """
+        Return the IDs of the local mesh in the context of the
+        global parallel mesh. Includes the IDs of boundary cells.
+
+        E.g., would return [0, 1, 2, 4, 5, 6] for mesh A
+
+        ```
+            A        B
+        ------------------
+        | 4 | 5 || 6 | 7 |
+        ------------------
+        | 0 | 1 || 2 | 3 |
+        ------------------
+        ```
+
+        .. note:: Trivial except for parallel meshes
+        """
+        return numerix.array(self.mesh.cellGlobalIDs + self.mesh.gCellGlobalIDs)
+
+    @property
+    def _localNonOverlappingCellIDs(self):
+        """
+        Return the IDs of the local mesh in isolation.
+        Does not include the IDs of boundary cells.
+
+        E.g., would return [0, 1, 2, 3] for mesh A
+
+        ```
+            A        B
+        ------------------
+        | 3 | 4 || 4 | 5 |
+        ------------------
+        | 0 | 1 || 1 | 2 |
+        ------------------
+        ```
+
+        .. note:: Trivial except for parallel meshes
+        """
+        return numerix.arange(len(self.mesh.cellGlobalIDs))
+
+    @property
+    def _localOverlappingCellIDs(self):
+        """
+        Return the IDs of the local mesh in isolation.
+        Includes the IDs of boundary cells.
+
+        E.g., would return [0, 1, 2, 3, 4, 5] for mesh A
+
+        ```
+            A        B
+        ------------------
+        | 3 | 4 || 5 |   |
+        ------------------
+        | 0 | 1 || 2 |   |
+        ------------------
+        ```
+
+        .. note:: Trivial except for parallel meshes
+        """
+        return numerix.arange(len(self.mesh.cellGlobalIDs)
+                              + len(self.mesh.gCellGlobalIDs))
@@ -1,6 +1,9 @@
 from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
+import itertools
+
+from fipy.tools import numerix
 from fipy.meshes.abstractMesh import AbstractMesh
 
 __all__ = ["UniformGrid"]
@@ -51,3 +54,125 @@ class UniformGrid(AbstractMesh):
 
     _faceToCellDistances = property(_getFaceToCellDistances,
                                     _setFaceToCellDistances)
+
+    """Topology properties"""
+    @property
+    def _cellStencilShape(self):
+        """Number of local cells along each axis
+
+        Cell IDs increase fastest along x, so the neighbors of a cell
+        are at fixed offsets in ID, known from `nx`, `ny` and `nz`.
+
+        >>> from fipy import Grid3D, PeriodicGrid2D
+        >>> print(Grid3D(nx=2, ny=3, nz=4)._cellStencilShape)
+        (2, 3, 4)
+        >>> print(PeriodicGrid2D(nx=2, ny=3)._cellStencilShape)
+        None
+        """
+        return tuple(self.shape)
+
+    """Locating points by index arithmetic"""
+    def _getCellIndices(self, points):
+        """Position of `points` along each axis, in units of the global cells
+
+        Cell centers are at whole numbers. Each axis is returned with the
+        shape of the coordinates of `points`.
+        """
+        spacing = numerix.array(self._meshSpacing, dtype=float).reshape((self.dim,))
+        origin = (numerix.array(self.origin, dtype=float).reshape((self.dim,))
+                  - numerix.array(self.offset).reshape((self.dim,)) * spacing)
+        firstCenter = origin + spacing / 2.
+
+        return [(numerix.asarray(x, dtype=float) - x0) / dx
+                for x, x0, dx in zip(points, firstCenter, spacing)]
+
+    def _getNearestCellID(self, points):
+        """
+        Test cases
+
+           >>> from fipy import *
+           >>> m = Grid1D(nx=3)
+           >>> print(m._getNearestCellID(([0., .9, 3.],)))
+           [0 0 2]
+           >>> print(m._getNearestCellID(([1.1],)))
+           [1]
+           >>> m0 = Grid1D(nx=2, dx=1.)
+           >>> m1 = Grid1D(nx=4, dx=.5)
+           >>> print(m0._getNearestCellID(m1.cellCenters.globalValue))
+           [0 0 1 1]
+
+           >>> m = Grid2D(nx=3, ny=2)
+           >>> print(m._getNearestCellID(((0., .9, 3.), (0., 2., 2.))))
+           [0 3 5]
+           >>> print(m._getNearestCellID(([1.1], [1.5])))
+           [4]
+           >>> m0 = Grid2D(nx=2, ny=2, dx=1., dy=1.)
+           >>> m1 = Grid2D(nx=4, ny=4, dx=.5, dy=.5)
+           >>> print(m0._getNearestCellID(m1.cellCenters.globalValue))
+           [0 0 1 1 0 0 1 1 2 2 3 3 2 2 3 3]
+
+           >>> m = Grid3D(nx=3, ny=2, nz=2) + [[1.], [0.], [-1.]]
+           >>> print(m._getNearestCellID(((1., 2.9, 5.), (0., 1.9, 0.), (-1., 0.4, 9.))))
+           [ 0 10  8]
+           >>> print(m._getNearestCellID((2.2, 1.2, 0.3)))
+           10
+
+        """
+        shape = self._globalShape
+
+        if numerix.prod(shape) == 0:
+            return numerix.arange(0)
+
+        cellIDs = 0
+        stride = 1
+        for index, n in zip(self._getCellIndices(points), shape):
+            i = numerix.clip(numerix.rint(index), 0, n - 1).astype(numerix.INT_DTYPE)
+            cellIDs = cellIDs + i * stride
+            stride *= n
+
+        return cellIDs
+
+    def _getInterpolationStencil(self, points):
+        """Cells to interpolate from, and their weights, at each of `points`
+
+        Each point is interpolated (bi/tri)linearly between the centers of
+        the cells around it. Beyond the outermost cell centers, the value
+        of the outermost cells is used.
+
+           >>> from fipy import *
+           >>> m = Grid2D(nx=3, ny=2)
+           >>> cellIDs, weights = m._getInterpolationStencil(((1.25, 0.), (1., 2.)))
+           >>> print(cellIDs.T)
+           [[0 1 3 4]
+            [0 1 3 4]]
+           >>> print(weights.T)
+           [[ 0.125  0.375  0.125  0.375]
+            [ 0.     0.     1.     0.   ]]
+
+        Returns
+        -------
+        cellIDs : ~numpy.ndarray of int
+            The `2**dim` global cells around each point
+        weights : ~numpy.ndarray of float
+            The weight of each of these cells
+        """
+        shape = self._globalShape
+
+        axes = []
+        stride = 1
+        for index, n in zip(self._getCellIndices(points), shape):
+            index = numerix.clip(index, 0, n - 1)
+            lower = numerix.clip(numerix.floor(index), 0, max(n - 2, 0)).astype(numerix.INT_DTYPE)
+            upper = numerix.minimum(lower + 1, n - 1)
+            fraction = index - lower
+            axes.append(((lower * stride, 1. - fraction), (upper * stride, fraction)))
+            stride *= n
+
+        cellIDs = []
+        weights = []
+        # the first axis varies fastest
+        for corner in itertools.product(*axes[::-1]):
+            cellIDs.append(sum(offset for offset, weight in corner))
+            weights.append(numerix.prod([weight for offset, weight in corner], axis=0))
+
+        return numerix.array(cellIDs), numerix.array(weights)
@@ -68,6 +68,7 @@ class UniformGrid1D(UniformGrid):
          self.numberOfFaces,
          self.numberOfCells,
          self.shape,
+         self._globalShape,
          self.physicalShape,
          self._meshSpacing,
          self.occupiedNodes,
@@ -288,36 +289,10 @@ class UniformGrid1D(UniformGrid):
         c1 = numerix.arange(self.numberOfCells)
         return numerix.array((c1 + 1, c1))
 
-    def _getNearestCellID(self, points):
-        """
-        Test cases
-
-           >>> from fipy import *
-           >>> m = Grid1D(nx=3)
-           >>> print(m._getNearestCellID(([0., .9, 3.],)))
-           [0 0 2]
-           >>> print(m._getNearestCellID(([1.1],)))
-           [1]
-           >>> m0 = Grid1D(nx=2, dx=1.)
-           >>> m1 = Grid1D(nx=4, dx=.5)
-           >>> print(m0._getNearestCellID(m1.cellCenters.globalValue))
-           [0 0 1 1]
-
-        """
-        nx = self.globalNumberOfCells
-
-        if nx == 0:
-            return numerix.arange(0)
-
-        x0, = self.cellCenters.globalValue[..., 0]
-        xi, = points
-        dx = self.dx
-
-        i = numerix.array(numerix.rint(((xi - x0) / dx)), 'l')
-        i[i < 0] = 0
-        i[i > nx - 1] = nx - 1
-
-        return i
+    @property
+    def _VTKCellType(self):
+        # VTK_LINE
+        return 3
 
     def _test(self):
         """
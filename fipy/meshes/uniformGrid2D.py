@@ -61,6 +61,7 @@ class UniformGrid2D(UniformGrid):
          self.numberOfFaces,
          self.numberOfCells,
          self.shape,
+         self._globalShape,
          self.physicalShape,
          self._meshSpacing,
          self.numberOfHorizontalRows,
@@ -532,6 +533,11 @@ class UniformGrid2D(UniformGrid):
     def _cellVertexIDs(self):
         return self._orderedCellVertexIDs
 
+    @property
+    def _VTKCellType(self):
+        # VTK_POLYGON
+        return 7
+
     @property
     def faceVertexIDs(self):
         Hids = numerix.zeros((2, self.nx, self.numberOfHorizontalRows), 'l')
@@ -560,43 +566,6 @@ class UniformGrid2D(UniformGrid):
 
         return ids.reshape((4, self.numberOfCells), order='F')
 
-    def _getNearestCellID(self, points):
-        """
-        Test cases
-
-           >>> from fipy import *
-           >>> m = Grid2D(nx=3, ny=2)
-           >>> eps = numerix.array([[1e-5, 1e-5]])
-           >>> print(m._getNearestCellID(((0., .9, 3.), (0., 2., 2.))))
-           [0 3 5]
-           >>> print(m._getNearestCellID(([1.1], [1.5])))
-           [4]
-           >>> m0 = Grid2D(nx=2, ny=2, dx=1., dy=1.)
-           >>> m1 = Grid2D(nx=4, ny=4, dx=.5, dy=.5)
-           >>> print(m0._getNearestCellID(m1.cellCenters.globalValue))
-           [0 0 1 1 0 0 1 1 2 2 3 3 2 2 3 3]
-
-        """
-        nx = self.args['nx']
-        ny = self.args['ny']
-
-        if nx == 0 or ny == 0:
-            return numerix.arange(0)
-
-        x0, y0 = self.cellCenters.globalValue[..., 0]
-        xi, yi = points
-        dx, dy = self.dx, self.dy
-
-        i = numerix.array(numerix.rint(((xi - x0) / dx)), 'l')
-        i[i < 0] = 0
-        i[i > nx - 1] = nx - 1
-
-        j = numerix.array(numerix.rint(((yi - y0) / dy)), 'l')
-        j[j < 0] = 0
-        j[j > ny - 1]  = ny - 1
-
-        return j * nx + i
-
     def _test(self):
         """
         These tests are not useful as documentation, but are here to ensure
@@ -69,6 +69,7 @@ class UniformGrid3D(UniformGrid):
          self.numberOfFaces,
          self.numberOfCells,
          self.shape,
+         self._globalShape,
          self.physicalShape,
          self._meshSpacing,
          self.numberOfXYFaces,
@@ -493,30 +494,6 @@ class UniformGrid3D(UniformGrid):
 
 ##     scaling
 
-    def _getNearestCellID(self, points):
-        nx = self.args['nx']
-        ny = self.args['ny']
-        nz = self.args['nz']
-
-        x0, y0, z0 = self.cellCenters[..., 0]
-        xi, yi, zi = points
-        nx, ny, nz = self.shape
-        dx, dy, dz = self.dx, self.dy, self.dz
-
-        i = numerix.array(numerix.rint(((xi - x0) / dx)), 'l')
-        i[i < 0] = 0
-        i[i > nx - 1] = nx - 1
-
-        j = numerix.array(numerix.rint(((yi - y0) / dy)), 'l')
-        j[j < 0] = 0
-        j[j > ny - 1]  = ny - 1
-
-        k = numerix.array(numerix.rint(((zi - z0) / dz)), 'l')
-        k[k < 0] = 0
-        k[k > nz - 1]  = nz - 1
-
-        return k * ny * nx + j * nx + i
-
     def _test(self):
         """
         These tests are not useful as documentation, but are here to ensure
@@ -1,3 +1,10 @@
+"""Solver packages
+
+The solver package is chosen when `fipy.solvers` is imported, by
+looking for the packages that are installed, but it is only imported
+when one of its solvers, its matrix class or its communicators is
+first needed.
+"""
 from __future__ import unicode_literals
 from builtins import str
 import os
@@ -5,135 +12,58 @@ import os
 from fipy.tools.parser import _parseSolver
 
 from fipy.solvers.solver import *
-__all__ = list(solver.__all__)
+from fipy.solvers import solver as _solverModule
+from fipy.solvers.solverPackages import SerialSolverError
+from fipy.solvers.solverPackages import _available, _LazyCommWrapper, _loadSolverPackage, _honorModuleGetattr
 from future.utils import text_to_native_str
-__all__ = [text_to_native_str(n) for n in __all__]
+_solverAll = [text_to_native_str(n) for n in _solverModule.__all__]
+# the `solver` submodule is shadowed by the name of the solver package
+del solver
 
 _desired_solver = _parseSolver()
 
 if _desired_solver is None and 'FIPY_SOLVERS' in os.environ:
     _desired_solver = os.environ['FIPY_SOLVERS'].lower()
 del os
-    
-try:
-    from mpi4py import MPI
-    _Nproc = MPI.COMM_WORLD.size
-    del MPI
-except ImportError:
-    _Nproc = 1
-
-_exceptions = []
-
-class SerialSolverError(Exception):
-    def __init__(self):
-        super(SerialSolverError, self).__init__('solver does not run in parallel')
-
-_exceptions = {}
 
-solver = None
-
-from fipy.tools.comms.dummyComm import DummyComm
-serialComm, parallelComm = DummyComm(), DummyComm()
-
-if solver is None and _desired_solver in ["pysparse", None]:
-    try:
-        if _Nproc > 1:
-            raise SerialSolverError()
-        from fipy.solvers.pysparse import *
-        __all__.extend(pysparse.__all__)
-        from fipy.matrices.pysparseMatrix import _PysparseMeshMatrix
-        _MeshMatrix =  _PysparseMeshMatrix
-        solver = "pysparse"
-    except Exception as inst:
-        _exceptions["pysparse"] = inst
-
-if solver is None and _desired_solver in ["petsc", None]:
+if _available("mpi4py"):
     try:
-        from fipy.solvers.petsc import *
-        __all__.extend(petsc.__all__)
+        from mpi4py import MPI
+        _Nproc = MPI.COMM_WORLD.size
+        del MPI
+    except ImportError:
+        _Nproc = 1
+else:
+    _Nproc = 1
 
-        from fipy.solvers.petsc.comms.serialPETScCommWrapper import SerialPETScCommWrapper
-        serialComm = SerialPETScCommWrapper()
+_exceptions = {}
 
-        if _Nproc > 1:
-            from fipy.solvers.petsc.comms.parallelPETScCommWrapper import ParallelPETScCommWrapper
-            parallelComm = ParallelPETScCommWrapper()
+# solver packages, in order of preference, with the names they answer to,
+# the modules they need and whether they can run in parallel
+_solverPackages = (("pysparse", ["pysparse", None], ("pysparse",), False),
+                   ("petsc", ["petsc", None], ("petsc4py",), True),
+                   ("trilinos", ["trilinos", "no-pysparse", None], ("PyTrilinos",), True),
+                   ("scipy", ["scipy", None], ("scipy",), False),
+                   ("pyamg", ["pyamg", None], ("pyamg", "scipy"), False),
+                   ("pyamgx", ["pyamgx", None], ("pyamgx", "scipy"), False))
+
+def _findCandidates():
+    candidates = []
+    for name, desires, modules, parallel in _solverPackages:
+        if _desired_solver not in desires:
+            continue
+        missing = [module for module in modules if not _available(module)]
+        if missing:
+            _exceptions[name] = ImportError("No module named '%s'" % missing[0])
+        elif _Nproc > 1 and not parallel:
+            _exceptions[name] = SerialSolverError()
         else:
-            parallelComm = SerialPETScCommWrapper()
+            candidates.append(name)
+    return candidates
 
-        from fipy.matrices.petscMatrix import _PETScMeshMatrix
-        _MeshMatrix =  _PETScMeshMatrix
-        solver = "petsc"
-    except Exception as inst:
-        _exceptions["petsc"] = inst
+_candidates = _findCandidates()
 
-if solver is None and _desired_solver in ["trilinos", "no-pysparse", None]:
-    try:
-        from fipy.solvers.trilinos import *
-        __all__.extend(trilinos.__all__)
-        
-        from fipy.solvers.trilinos.comms.serialEpetraCommWrapper import SerialEpetraCommWrapper
-        serialComm = SerialEpetraCommWrapper()
-
-        if _Nproc > 1:
-            from fipy.solvers.trilinos.comms.parallelEpetraCommWrapper import ParallelEpetraCommWrapper
-            parallelComm = ParallelEpetraCommWrapper()
-        else:
-            parallelComm = SerialEpetraCommWrapper()
-
-        if _desired_solver != "no-pysparse":
-            try:
-                from fipy.matrices.pysparseMatrix import _PysparseMeshMatrix
-                _MeshMatrix =  _PysparseMeshMatrix
-                solver = "trilinos"
-            except ImportError:
-                pass
-                
-        if solver is None:
-            # no-pysparse requested or pysparseMatrix failed to import
-            from fipy.matrices.trilinosMatrix import _TrilinosMeshMatrix
-            _MeshMatrix =  _TrilinosMeshMatrix
-            solver = "no-pysparse"
-    except Exception as inst:
-        _exceptions["trilinos"] = inst
-
-if solver is None and _desired_solver in ["scipy", None]:
-    try:
-        if _Nproc > 1:
-            raise SerialSolverError()
-        from fipy.solvers.scipy import *
-        __all__.extend(scipy.__all__)
-        from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
-        _MeshMatrix = _ScipyMeshMatrix
-        solver = "scipy"
-    except Exception as inst:
-        _exceptions["scipy"] = inst
-
-if solver is None and _desired_solver in ["pyamg", None]:
-    try:
-        if _Nproc > 1:
-            raise SerialSolverError()
-        from fipy.solvers.pyAMG import *
-        __all__.extend(pyAMG.__all__)
-        from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
-        _MeshMatrix = _ScipyMeshMatrix
-        solver = "pyamg"
-    except Exception as inst:
-        _exceptions["pyamg"] = inst
-
-if solver is None and _desired_solver in ["pyamgx", None]:
-    try:
-        if _parallelComm.Nproc > 1:
-            raise  SerialSolverError('pyamgx')
-        from fipy.solvers.pyamgx import *
-        __all__.extend(pyamgx.__all__)
-        from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
-        _MeshMatrix = _ScipyMeshMatrix
-        solver = "pyamgx"
-    except Exception as inst:
-        _exceptions["pyamgx"] = inst
-
-if solver is None:
+def _raiseImportError():
     if _desired_solver is None:
         raise ImportError('Unable to load a solver: %s' % str(_exceptions))
     else:
@@ -142,15 +72,85 @@ if solver is None:
         else:
             raise ImportError('Unknown solver package %s' % _desired_solver)
 
+if len(_candidates) == 0:
+    _raiseImportError()
+
+_namespace = None
+_loading = False
+
+def _load():
+    """Import the first solver package that loads
+
+    Returns
+    -------
+    dict
+        The names the solver package adds to `fipy.solvers`.
+    """
+    global _namespace, _loading
+    if _namespace is None:
+        if _loading:
+            # the solver package looks up its own names while importing
+            raise KeyError
+        _loading = True
+        try:
+            while _candidates and _namespace is None:
+                try:
+                    _namespace = _loadSolverPackage(_candidates[0],
+                                                    desired=_desired_solver,
+                                                    Nproc=_Nproc)
+                except Exception as inst:
+                    _exceptions[_candidates.pop(0)] = inst
+        finally:
+            _loading = False
+
+        if _namespace is None:
+            _raiseImportError()
+
+        _namespace["__all__"] = _solverAll + list(_namespace["__all__"])
+
+    return _namespace
+
+def __getattr__(name):
+    if name.startswith("__") and name != "__all__":
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    try:
+        return _load()[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+if any(parallel for name, desires, modules, parallel in _solverPackages
+       if name in _candidates):
+    serialComm = _LazyCommWrapper(lambda: _load()["serialComm"])
+    parallelComm = _LazyCommWrapper(lambda: _load()["parallelComm"])
+else:
+    # the serial solver packages all communicate with a `DummyComm`, so
+    # meshes need not import them to count the processors
+    from fipy.tools.comms.dummyComm import DummyComm
+    serialComm = DummyComm()
+    parallelComm = DummyComm()
+    del DummyComm
+
 from fipy.tests.doctestPlus import register_skipper
 
 register_skipper(flag='PYSPARSE_SOLVER',
-                 test=lambda: solver == 'pysparse',
+                 test=lambda: _load()["solver"] == 'pysparse',
                  why="the Pysparse solvers are not being used.",
                  skipWarning=True)
 
+register_skipper(flag='PETSC_SOLVER',
+                 test=lambda: _load()["solver"] == 'petsc',
+                 why="the PETSc solvers are not being used.",
+                 skipWarning=True)
+
+register_skipper(flag='TRILINOS_SOLVER',
+                 test=lambda: _load()["solver"] in ('trilinos', 'no-pysparse'),
+                 why="the Trilinos solvers are not being used.",
+                 skipWarning=True)
+
 register_skipper(flag='NOT_PYAMGX_SOLVER',
-                 test=lambda: solver != 'pyamgx',
+                 test=lambda: _load()["solver"] != 'pyamgx',
                  why="the PyAMGX solver is being used.",
                  skipWarning=True)
 del register_skipper
+
+_honorModuleGetattr(__name__)
@@ -15,7 +15,8 @@ class LinearLUSolver(PETScSolver):
 
     """
     The `LinearLUSolver` is an interface to the LU preconditioner in PETSc.
-    A direct solve is performed.
+    A direct solve is performed.  The factorization is kept between calls
+    and is only recomputed when the matrix changes.
 
     """
       
@@ -30,7 +31,7 @@ class LinearLUSolver(PETScSolver):
         PETScSolver.__init__(self, tolerance=tolerance,
                              iterations=iterations, precon="lu")
 
-    def _solve_(self, L, x, b):
+    def _factorize(self, L):
         ksp = PETSc.KSP()
         ksp.create(PETSc.COMM_WORLD)
         ksp.setType("preonly")
@@ -38,12 +39,23 @@ class LinearLUSolver(PETScSolver):
         # TODO: SuperLU invoked with PCFactorSetMatSolverType(pc, MATSOLVERSUPERLU)
         #       see: http://www.mcs.anl.gov/petsc/petsc-dev/src/ksp/ksp/examples/tutorials/ex52.c.html
         # PETSc.PC().setFactorSolverType("superlu")
-        
-        L.assemblyBegin()
-        L.assemblyEnd()
+
         ksp.setOperators(L)
         ksp.setFromOptions()
-        
+        ksp.setUp()
+
+        return ksp
+
+    def _solve_(self, L, x, b):
+        L.assemblyBegin()
+        L.assemblyEnd()
+
+        # the factorization held by `ksp` is reused for as long as
+        # `L` is unchanged on every processor
+        ksp = self._reuseFactorization(list(L.getValuesCSR()),
+                                       lambda: self._factorize(L),
+                                       communicator=self.var.mesh.communicator)
+
         for iteration in range(self.iterations):
             errorVector = L * x - b
             tol = errorVector.norm()
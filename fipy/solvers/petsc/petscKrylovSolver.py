@@ -37,33 +37,55 @@ class PETScKrylovSolver(PETScSolver):
 
     """
       
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=None):
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None, preconReuse=None):
         """
         :Parameters:
           - `tolerance`: The required error tolerance.
           - `iterations`: The maximum number of iterative steps to perform.
           - `precon`: Preconditioner to use (string). 
+          - `preconReuse`: When to build the preconditioner anew
+            (`PreconditionerReuse` or int).
 
         """
         if self.__class__ is PETScKrylovSolver:
             raise NotImplementedError("can't instantiate abstract base class")
             
         PETScSolver.__init__(self, tolerance=tolerance,
-                             iterations=iterations, precon=precon)
+                             iterations=iterations, precon=precon,
+                             preconReuse=preconReuse)
+
+    _ksp = None
 
     def _solve_(self, L, x, b):
-        ksp = PETSc.KSP()
-        ksp.create(L.comm)
-        ksp.setType(self.solver)
-        if self.preconditioner is not None:
-            ksp.getPC().setType(self.preconditioner)
-        ksp.setTolerances(rtol=self.tolerance, max_it=self.iterations)
-        L.assemblyBegin()
-        L.assemblyEnd()
-        ksp.setOperators(L)
-        ksp.setFromOptions()
+        # the matrix, `KSP` and `PC` of the previous solve are kept,
+        # and only their values updated, while `L` has the same sizes
+        L, newPattern = self._persistentMatrix(L)
+        reuse = self._canReusePreconditioner(L.getSize())
+
+        if self._ksp is None or self._ksp.getOperators()[0].getSizes() != L.getSizes():
+            ksp = PETSc.KSP()
+            ksp.create(L.comm)
+            ksp.setType(self.solver)
+            if self.preconditioner is not None:
+                ksp.getPC().setType(self.preconditioner)
+            ksp.setTolerances(rtol=self.tolerance, max_it=self.iterations)
+            ksp.setOperators(L)
+            ksp.setFromOptions()
+            self._ksp = ksp
+        else:
+            ksp = self._ksp
+            if newPattern:
+                ksp.setOperators(L)
+
+        # PETSc sets up the preconditioner again when its matrix has
+        # changed, unless told to reuse it; a new preconditioner is
+        # always set up
+        ksp.setReusePreconditioner(reuse)
+
         ksp.solve(b, x)
 
+        self._recordIterations(ksp.its)
+
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             from fipy.tools.debug import PRINT
 #             L.view()
@@ -17,12 +17,23 @@ class PETScSolver(Solver):
         else:
             Solver.__init__(self, *args, **kwargs)
 
+    _ghostMesh = None
+    _ghostVectors = (None, None)
+    _operator = None
+
     @property
     def _globalMatrixAndVectors(self):
         if not hasattr(self, 'globalVectors'):
             globalMatrix = self.matrix
 
-            overlappingVector = self.matrix._fipy2petscGhost(var=self.var)
+            # the `GhostVec`s of the previous solve are refilled in place
+            # for as long as the matrix is laid out on the same mesh
+            if globalMatrix.mesh is not self._ghostMesh:
+                self._ghostMesh = globalMatrix.mesh
+                self._ghostVectors = (None, None)
+            x, b = self._ghostVectors
+
+            overlappingVector = self.matrix._fipy2petscGhost(var=self.var, vec=x)
 
             from fipy.variables.coupledCellVariable import _CoupledCellVariable
             if isinstance(self.RHSvector, _CoupledCellVariable):
@@ -30,12 +41,91 @@ class PETScSolver(Solver):
             else:
                 RHSvector = numerix.reshape(numerix.asarray(self.RHSvector), self.var.shape)
                 
-            overlappingRHSvector = self.matrix._fipy2petscGhost(var=RHSvector)
+            overlappingRHSvector = self.matrix._fipy2petscGhost(var=RHSvector, vec=b)
 
+            self._ghostVectors = (overlappingVector, overlappingRHSvector)
             self.globalVectors = (globalMatrix, overlappingVector, overlappingRHSvector)
 
         return self.globalVectors
 
+    def _persistentMatrix(self, L):
+        """The matrix of the previous solve, holding the values of `L`
+
+        While the nonzero pattern of the matrix of the previous solve
+        holds that of `L`, on every processor, that matrix is zeroed and
+        the values of `L` are inserted into it, so `KSP` and `PC` objects
+        that hold it can be kept.
+
+        >>> from fipy import (CellVariable, Grid1D, DiffusionTerm,
+        ...                   TransientTerm, LinearPCGSolver, numerix)
+        >>> mesh = Grid1D(nx=10)
+        >>> var = CellVariable(mesh=mesh, value=0., hasOld=True)
+        >>> var.constrain(1., where=mesh.facesLeft)
+        >>> eq = TransientTerm() == DiffusionTerm()
+        >>> solver = LinearPCGSolver(tolerance=1e-12)
+        >>> eq.solve(var=var, dt=1., solver=solver) # doctest: +PETSC_SOLVER
+        >>> operator = solver._operator
+        >>> x, b = solver._ghostVectors
+
+        The matrix and the ghost vectors of the first solve are used
+        again for the next
+
+        >>> var.updateOld()
+        >>> eq.solve(var=var, dt=2., solver=solver) # doctest: +PETSC_SOLVER
+        >>> print(solver._operator is operator) # doctest: +PETSC_SOLVER
+        True
+        >>> print(solver._ghostVectors[0] is x
+        ...       and solver._ghostVectors[1] is b) # doctest: +PETSC_SOLVER
+        True
+
+        and give the same solution as a new solver
+
+        >>> fresh = CellVariable(mesh=mesh, value=var.old, hasOld=True)
+        >>> fresh.constrain(1., where=mesh.facesLeft)
+        >>> (TransientTerm() == DiffusionTerm()).solve(var=fresh, dt=2.,
+        ...     solver=LinearPCGSolver(tolerance=1e-12)) # doctest: +PETSC_SOLVER
+        >>> print(numerix.allclose(var, fresh)) # doctest: +PETSC_SOLVER
+        True
+
+        A solver that last held a diagonal matrix needs a new `Mat` for
+        the matrix of `eq`, which then holds any diagonal matrix
+
+        >>> solver = LinearPCGSolver(tolerance=1e-12)
+        >>> (TransientTerm() == 0).solve(var=var, dt=1.,
+        ...                              solver=solver) # doctest: +PETSC_SOLVER
+        >>> operator = solver._operator
+        >>> eq.solve(var=var, dt=1., solver=solver) # doctest: +PETSC_SOLVER
+        >>> print(solver._operator is operator) # doctest: +PETSC_SOLVER
+        False
+        >>> operator = solver._operator
+        >>> (TransientTerm() == 0).solve(var=var, dt=1.,
+        ...                              solver=solver) # doctest: +PETSC_SOLVER
+        >>> print(solver._operator is operator) # doctest: +PETSC_SOLVER
+        True
+
+        Returns
+        -------
+        Mat
+            The persistent matrix.
+        bool
+            Whether it is a new `Mat`, with a new nonzero pattern.
+        """
+        from fipy.matrices.petscMatrix import _PETScMatrix
+
+        held = self._operator
+        fits = (held is not None
+                and held.getSizes() == L.getSizes()
+                and _PETScMatrix(matrix=L)._insertInto(held))
+
+        if self.var.mesh.communicator.all(numerix.array(fits)):
+            held.assemblyBegin()
+            held.assemblyEnd()
+        else:
+            # `L` may be cached by its `Term`, so hold a copy
+            self._operator = L.copy()
+
+        return self._operator, not fits
+
     def _deleteGlobalMatrixAndVectors(self):
         self.matrix.flush()
         del self.globalVectors
@@ -93,3 +183,10 @@ class PETScSolver(Solver):
         
     def _calcRHSNorm(self):
         return self.nonOverlappingRHSvector.Norm2()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
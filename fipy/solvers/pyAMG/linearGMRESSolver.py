@@ -13,7 +13,7 @@ class LinearGMRESSolver(ScipyLinearGMRESSolver):
     default.
     """
 
-    def __init__(self, tolerance=1e-15, iterations=2000, precon=SmoothedAggregationPreconditioner()):
+    def __init__(self, tolerance=1e-15, iterations=2000, precon=SmoothedAggregationPreconditioner(), preconReuse=None):
         """
         Parameters
         ----------
@@ -22,6 +22,8 @@ class LinearGMRESSolver(ScipyLinearGMRESSolver):
         iterations : int
             Maximum number of iterative steps to perform.
         precon : ~fipy.solvers.pyAMG.preconditioners.smoothedAggregationPreconditioner.SmoothedAggregationPreconditioner, optional
+        preconReuse : ~fipy.solvers.solver.PreconditionerReuse or int, optional
+            When to build the preconditioner anew.
         """
 
-        super(LinearGMRESSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+        super(LinearGMRESSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon, preconReuse=preconReuse)
@@ -12,7 +12,7 @@ class LinearPCGSolver(ScipyLinearPCGSolver):
     using the PyAMG `SmoothedAggregationPreconditioner` by default.
     """
 
-    def __init__(self, tolerance=1e-15, iterations=2000, precon=SmoothedAggregationPreconditioner()):
+    def __init__(self, tolerance=1e-15, iterations=2000, precon=SmoothedAggregationPreconditioner(), preconReuse=None):
         """
         Parameters
         ----------
@@ -21,6 +21,8 @@ class LinearPCGSolver(ScipyLinearPCGSolver):
         iterations : int
             Maximum number of iterative steps to perform.
         precon : ~fipy.solvers.pyAMG.preconditioners.smoothedAggregationPreconditioner.SmoothedAggregationPreconditioner, optional
+        preconReuse : ~fipy.solvers.solver.PreconditionerReuse or int, optional
+            When to build the preconditioner anew.
         """
 
-        super(LinearPCGSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+        super(LinearPCGSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon, preconReuse=preconReuse)
@@ -29,6 +29,8 @@ class LinearLUSolver(PysparseSolver):
 
     .. _Pysparse: http://pysparse.sourceforge.net
 
+    The factorization is kept between calls and is only recomputed when
+    the matrix changes.
     """
 
     def __init__(self, tolerance=1e-10, iterations=10,
@@ -58,7 +60,9 @@ class LinearLUSolver(PysparseSolver):
         L = L * (1 / maxdiag)
         b = b * (1 / maxdiag)
 
-        LU = superlu.factorize(L.matrix.to_csr())
+        values, irow, jcol = L.matrix.find()
+        LU = self._reuseFactorization([irow, jcol, values],
+                                      lambda: superlu.factorize(L.matrix.to_csr()))
 
         if DEBUG:
             import sys
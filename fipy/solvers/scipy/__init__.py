@@ -4,6 +4,9 @@ from fipy.solvers.scipy.linearGMRESSolver import *
 from fipy.solvers.scipy.linearBicgstabSolver import *
 from fipy.solvers.scipy.linearLUSolver import *
 from fipy.solvers.scipy.linearPCGSolver import *
+from fipy.solvers.scipy.linearMultigridSolver import *
+
+from fipy.solvers.scipy.preconditioners import *
 
 DefaultSolver = LinearLUSolver
 DummySolver = LinearGMRESSolver
@@ -22,3 +25,5 @@ __all__.extend(linearGMRESSolver.__all__)
 __all__.extend(linearBicgstabSolver.__all__)
 __all__.extend(linearLUSolver.__all__)
 __all__.extend(linearPCGSolver.__all__)
+__all__.extend(linearMultigridSolver.__all__)
+__all__.extend(preconditioners.__all__)
@@ -19,6 +19,28 @@ class LinearLUSolver(_ScipySolver):
     The `LinearLUSolver` solves a linear system of equations using
     LU-factorization.  The `LinearLUSolver` is a wrapper class for the
     the Scipy `scipy.sparse.linalg.splu` module.
+
+    The factorization is kept between calls and is only recomputed when
+    the matrix changes, so repeatedly solving the same linear system, e.g.,
+    a constant-coefficient transient problem with a fixed time step, only
+    costs one factorization.
+
+    >>> from fipy import *
+    >>> m = Grid1D(nx=10)
+    >>> v = CellVariable(mesh=m, hasOld=True)
+    >>> v.constrain(1., where=m.facesLeft)
+    >>> eq = TransientTerm() == DiffusionTerm()
+    >>> solver = LinearLUSolver()
+    >>> eq.solve(var=v, dt=1., solver=solver)
+    >>> LU = solver._factorization[1]
+    >>> v.updateOld()
+    >>> eq.solve(var=v, dt=1., solver=solver)
+    >>> print(solver._factorization[1] is LU)
+    True
+    >>> v.updateOld()
+    >>> eq.solve(var=v, dt=2., solver=solver)
+    >>> print(solver._factorization[1] is LU)
+    False
     """
 
     def _solve_(self, L, x, b):
@@ -28,10 +50,13 @@ class LinearLUSolver(_ScipySolver):
         L = L * (1 / maxdiag)
         b = b * (1 / maxdiag)
 
-        LU = splu(L.matrix.asformat("csc"), diag_pivot_thresh=1.,
-                                            relax=1,
-                                            panel_size=10,
-                                            permc_spec=3)
+        A = L.matrix
+        LU = self._reuseFactorization([A.indptr, A.indices, A.data],
+                                      lambda: splu(A.asformat("csc"),
+                                                   diag_pivot_thresh=1.,
+                                                   relax=1,
+                                                   panel_size=10,
+                                                   permc_spec=3))
 
         error0 = numerix.sqrt(numerix.sum((L * x - b)**2))
 
@@ -50,3 +75,10 @@ class LinearLUSolver(_ScipySolver):
             PRINT('residual:', numerix.sqrt(numerix.sum(errorVector**2)))
 
         return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
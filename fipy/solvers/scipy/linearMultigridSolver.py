@@ -0,0 +1,110 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import os
+
+from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.scipy.preconditioners.multigridPreconditioner import MultigridPreconditioner
+from fipy.tools import numerix
+
+__all__ = ["LinearMultigridSolver"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class LinearMultigridSolver(_ScipySolver):
+    """
+    The `LinearMultigridSolver` solves a linear system of equations on a
+    `Grid1D`, `Grid2D` or `Grid3D` mesh by repeating the cycles of a
+    `MultigridPreconditioner` until the residual is `tolerance` times
+    the right hand side.  The cycles are also available to the SciPy
+    Krylov solvers, as their `precon`.
+
+    The hierarchy of coarse operators is kept between calls and is only
+    rebuilt when the matrix changes.
+
+    >>> from fipy import *
+    >>> from fipy.solvers.scipy import LinearMultigridSolver
+    >>> mesh = Grid2D(nx=40, ny=30)
+    >>> var = CellVariable(mesh=mesh, hasOld=True)
+    >>> var.constrain(0., where=mesh.facesLeft)
+    >>> var.constrain(1., where=mesh.facesRight)
+    >>> eq = TransientTerm() == DiffusionTerm(coeff=1. + mesh.x)
+    >>> eq.solve(var=var, dt=1., solver=LinearLUSolver())
+    >>> expected = var.copy()
+    >>> var.setValue(0.)
+    >>> solver = LinearMultigridSolver(tolerance=1e-12)
+    >>> eq.solve(var=var, dt=1., solver=solver)
+    >>> print(numerix.allclose(var, expected))
+    True
+    >>> levels = solver._factorization[1]
+    >>> eq.solve(var=var, dt=1., solver=solver)
+    >>> print(solver._factorization[1] is levels)
+    True
+    """
+
+    def __init__(self, tolerance=1e-10, iterations=1000, cycle="V", presmooth=2, postsmooth=2, damping=0.8, levels=None, coarsest=256):
+        """
+        Parameters
+        ----------
+        tolerance : float
+            Required error tolerance.
+        iterations : int
+            Maximum number of cycles to perform.
+        cycle : {"V", "W", "F"}
+            Order in which the levels are visited.
+        presmooth : int
+            Number of Jacobi sweeps before the coarse correction.
+        postsmooth : int
+            Number of Jacobi sweeps after the coarse correction.
+        damping : float
+            Damping of the Jacobi sweeps.
+        levels : int, optional
+            Maximum number of levels, including the finest.
+        coarsest : int
+            Number of unknowns below which a grid is solved directly
+            instead of being coarsened further.
+        """
+        super(LinearMultigridSolver, self).__init__(tolerance=tolerance, iterations=iterations)
+        self.multigrid = MultigridPreconditioner(cycle=cycle,
+                                                 presmooth=presmooth,
+                                                 postsmooth=postsmooth,
+                                                 damping=damping,
+                                                 levels=levels,
+                                                 coarsest=coarsest)
+
+    def _solve_(self, L, x, b):
+        A = L.matrix
+        shape = self.multigrid._gridShape(L.mesh)
+        levels, coarseSolve = self._reuseFactorization([A.indptr, A.indices, A.data],
+                                                       lambda: self.multigrid._hierarchy(A, shape))
+
+        bNorm = numerix.sqrt(numerix.sum(b**2))
+        if bNorm == 0:
+            bNorm = 1.
+
+        for iteration in range(self.iterations):
+            residual = b - A.dot(x)
+            if numerix.sqrt(numerix.sum(residual**2)) / bNorm <= self.tolerance:
+                break
+
+            x = x + self.multigrid._cycle(levels, coarseSolve, 0, residual,
+                                          numerix.zeros(residual.shape),
+                                          self.multigrid.cycle)
+
+        self._recordIterations(iteration + 1)
+
+        if 'FIPY_VERBOSE_SOLVER' in os.environ:
+            from fipy.tools.debug import PRINT
+            PRINT('iterations: %d / %d' % (iteration+1, self.iterations))
+            PRINT('residual:', numerix.sqrt(numerix.sum(residual**2)))
+
+        return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -15,7 +15,7 @@ class LinearPCGSolver(_ScipyKrylovSolver):
     with no preconditioning by default.
     """
 
-    def __init__(self, tolerance=1e-15, iterations=2000, precon=None):
+    def __init__(self, tolerance=1e-15, iterations=2000, precon=None, preconReuse=None, matrixFree=False):
         """
         Parameters
         ----------
@@ -25,9 +25,14 @@ class LinearPCGSolver(_ScipyKrylovSolver):
             Maximum number of iterative steps to perform.
         precon
             Preconditioner to use.
+        preconReuse : ~fipy.solvers.solver.PreconditionerReuse or int, optional
+            When to build the preconditioner anew.
+        matrixFree : bool
+            Whether to apply the matrix by gathering and scattering over
+            the faces, without assembling it.
         """
 
-        super(LinearPCGSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+        super(LinearPCGSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon, preconReuse=preconReuse, matrixFree=matrixFree)
         self.solveFnc = cg
 
     def _canSolveAsymmetric(self):
@@ -0,0 +1,7 @@
+from __future__ import unicode_literals
+from fipy.solvers.scipy.preconditioners.schwarzPreconditioner import *
+from fipy.solvers.scipy.preconditioners.multigridPreconditioner import *
+
+__all__ = []
+__all__.extend(schwarzPreconditioner.__all__)
+__all__.extend(multigridPreconditioner.__all__)
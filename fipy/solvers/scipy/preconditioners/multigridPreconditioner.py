@@ -0,0 +1,302 @@
+from __future__ import print_function
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import itertools
+
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, splu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["MultigridPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class MultigridPreconditioner(Preconditioner):
+    r"""
+    Geometric multigrid preconditioner for the SciPy solvers.
+
+    The cells of a `Grid1D`, `Grid2D` or `Grid3D` mesh, uniform or not,
+    are coarsened by a factor of 2 along each axis, so the hierarchy of
+    grids is known from the shape of the mesh instead of being
+    rediscovered from the matrix, as algebraic multigrid does.  Coarse
+    values are interpolated linearly between cell centers to the fine
+    cells and the coarse operators are built by Galerkin projection,
+    :math:`A_{2h} = P^T A_h P`, so they suit any equation discretized on
+    the mesh.  Each level is smoothed by damped Jacobi sweeps and the
+    coarsest grid is solved directly.
+
+    A `"V"`, `"W"` or `"F"` `cycle` is applied each time the
+    preconditioner is applied.  With as many sweeps before as after the
+    coarse correction, the cycle is symmetric and suits
+    `LinearPCGSolver`.
+
+    >>> from fipy import *
+    >>> from fipy.solvers.scipy import LinearPCGSolver, LinearGMRESSolver
+    >>> from fipy.solvers.scipy.preconditioners import MultigridPreconditioner
+
+    >>> mesh = Grid2D(nx=32, ny=32)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(0., where=mesh.facesLeft)
+    >>> var.constrain(1., where=mesh.facesRight)
+    >>> eq = DiffusionTerm() == 0
+    >>> eq.solve(var=var,
+    ...          solver=LinearPCGSolver(tolerance=1e-10,
+    ...                                 precon=MultigridPreconditioner()))
+    >>> print(numerix.allclose(var, mesh.x / 32., atol=1e-8))
+    True
+
+    The grid is halved until it has no more than `coarsest` cells
+
+    >>> from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
+    >>> L = DiffusionTerm()._buildMatrix(var, _ScipyMeshMatrix)[1]
+    >>> precon = MultigridPreconditioner(coarsest=16)
+    >>> levels, coarseSolve = precon._hierarchy(L.matrix, mesh.shape)
+    >>> print([A.shape[0] for A, R, P, invDiagonal in levels])
+    [1024, 256, 64]
+
+    and the cells of a non-uniform grid are coarsened just the same
+
+    >>> mesh = Grid2D(dx=0.5 * 1.1**numerix.arange(20), dy=1., ny=12)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(1., where=mesh.facesLeft)
+    >>> eq = DiffusionTerm(coeff=1. + mesh.y) == ImplicitSourceTerm(coeff=0.1)
+    >>> eq.solve(var=var, solver=DefaultSolver())
+    >>> expected = var.copy()
+    >>> for cycle in ("V", "W", "F"):
+    ...     var.setValue(0.)
+    ...     precon = MultigridPreconditioner(cycle=cycle, coarsest=4)
+    ...     eq.solve(var=var,
+    ...              solver=LinearGMRESSolver(tolerance=1e-12, precon=precon))
+    ...     print(numerix.allclose(var, expected))
+    True
+    True
+    True
+
+    Each cycle reduces the residual of the Poisson equation by about the
+    same factor, whatever the size of the grid, so the work to solve it
+    grows in proportion to the number of cells
+
+    >>> def reduction(n):
+    ...     mesh = Grid2D(nx=n, ny=n)
+    ...     var = CellVariable(mesh=mesh)
+    ...     var.constrain(0., where=mesh.facesLeft | mesh.facesRight)
+    ...     A = DiffusionTerm()._buildMatrix(var, _ScipyMeshMatrix)[1].matrix
+    ...     M = MultigridPreconditioner(coarsest=16)._operator(A, mesh.shape)
+    ...     b = numerix.random.random(A.shape[0])
+    ...     x = numerix.zeros(A.shape[0])
+    ...     for cycle in range(5):
+    ...         x = x + M.matvec(b - A.dot(x))
+    ...     return (numerix.linalg.norm(b - A.dot(x)) / numerix.linalg.norm(b))**(1. / 5)
+    >>> print(reduction(32) < 0.2, reduction(128) < 0.2)
+    True True
+    """
+
+    def __init__(self, cycle="V", presmooth=2, postsmooth=2, damping=0.8, levels=None, coarsest=256):
+        """
+        Parameters
+        ----------
+        cycle : {"V", "W", "F"}
+            Order in which the levels are visited.
+        presmooth : int
+            Number of Jacobi sweeps before the coarse correction.
+        postsmooth : int
+            Number of Jacobi sweeps after the coarse correction.
+        damping : float
+            Damping of the Jacobi sweeps.
+        levels : int, optional
+            Maximum number of levels, including the finest.
+        coarsest : int
+            Number of unknowns below which a grid is solved directly
+            instead of being coarsened further.
+        """
+        if cycle not in ("V", "W", "F"):
+            raise ValueError("cycle must be 'V', 'W' or 'F', not %r" % (cycle,))
+        self.cycle = cycle
+        self.presmooth = presmooth
+        self.postsmooth = postsmooth
+        self.damping = damping
+        self.levels = levels
+        self.coarsest = coarsest
+
+    @staticmethod
+    def _gridShape(mesh):
+        """Number of cells along each axis of a grid `mesh`
+        """
+        shape = getattr(mesh, "shape", None)
+        if shape is None or int(numerix.prod(shape)) != mesh.numberOfCells:
+            raise TypeError("%s needs a Grid1D, Grid2D or Grid3D mesh"
+                            % MultigridPreconditioner.__name__)
+        return tuple(int(n) for n in shape)
+
+    @staticmethod
+    def _reflections(A, index, boundary, inward):
+        """How the values beyond the `boundary` cells of a grid follow
+        the values of those cells, as found from the operator `A`
+
+        The row of a boundary cell with a fixed flux has no more on its
+        diagonal than the row of its neighbor in the `inward` direction,
+        as the value beyond it equals its own (1).  The row of one with a
+        fixed value has twice its coupling to that neighbor in excess, as
+        the value beyond it is its own, negated (-1).
+        """
+        sign = numerix.where(A.diagonal() < 0, -1., 1.)
+        excess = sign * numerix.asarray(A.sum(axis=1)).ravel()
+        excess = excess[boundary] - excess[boundary + inward]
+
+        rows = A[boundary].tocoo()
+        layer = index[rows.col] - index[boundary[rows.row]]
+        coupling = numerix.bincount(rows.row,
+                                    weights=(abs(rows.data)
+                                             * (layer == numerix.sign(inward[rows.row]))),
+                                    minlength=len(boundary))
+
+        reflections = numerix.ones(len(boundary))
+        coupled = coupling > 0
+        reflections[coupled] = 1. - excess[coupled] / coupling[coupled]
+
+        return reflections.clip(-1., 1.)
+
+    @classmethod
+    def _interpolation(cls, A, shape):
+        """Interpolation of one variable, whose operator is `A`, from the
+        cells of the grid coarsened by 2 to the cells of the `shape` grid
+
+        Each fine cell takes 3/4 of the value of the coarse cell that
+        contains it and 1/4 of the value of the coarse cell on its other
+        side, along each axis.  At the boundaries, the value beyond the
+        coarse cell follows the boundary condition.
+
+        >>> from fipy import Grid1D, CellVariable, DiffusionTerm
+        >>> from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
+        >>> mesh = Grid1D(nx=5)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> A = DiffusionTerm()._buildMatrix(var, _ScipyMeshMatrix)[1].matrix
+        >>> print(MultigridPreconditioner._interpolation(A, mesh.shape).toarray())
+        [[ 0.5   0.    0.  ]
+         [ 0.75  0.25  0.  ]
+         [ 0.25  0.75  0.  ]
+         [ 0.    0.75  0.25]
+         [ 0.    0.25  0.75]]
+        """
+        N = int(numerix.prod(shape))
+        coarseShape = tuple((n + 1) // 2 for n in shape)
+
+        # cell IDs increase fastest along x
+        index = numerix.indices(shape[::-1]).reshape((len(shape), N))[::-1]
+        strides = numerix.cumprod((1,) + shape[:-1])
+        coarseStrides = numerix.cumprod((1,) + coarseShape[:-1])
+
+        choices = []
+        for axis, n in enumerate(shape):
+            fine = index[axis]
+            coarse = fine // 2
+            other = numerix.where(fine % 2 == 0, coarse - 1, coarse + 1)
+            hasOther = (other >= 0) & (other < coarseShape[axis])
+
+            weight = numerix.where(hasOther, 0.75, 1.)
+            boundary = numerix.nonzero(~hasOther)[0]
+            if n > 1 and len(boundary) > 0:
+                inward = numerix.where(fine[boundary] == 0, 1, -1) * strides[axis]
+                weight[boundary] = 0.75 + 0.25 * cls._reflections(A, fine, boundary, inward)
+
+            choices.append(((coarse, weight),
+                            (numerix.where(hasOther, other, coarse),
+                             numerix.where(hasOther, 0.25, 0.))))
+
+        rows = []
+        cols = []
+        weights = []
+        for choice in itertools.product((0, 1), repeat=len(shape)):
+            col = numerix.zeros((N,), dtype=int)
+            weight = numerix.ones((N,))
+            for axis, which in enumerate(choice):
+                coarse, w = choices[axis][which]
+                col = col + coarse * coarseStrides[axis]
+                weight = weight * w
+            nonzero = weight != 0
+            rows.append(numerix.arange(N)[nonzero])
+            cols.append(col[nonzero])
+            weights.append(weight[nonzero])
+
+        return sparse.csr_matrix((numerix.concatenate(weights),
+                                  (numerix.concatenate(rows), numerix.concatenate(cols))),
+                                 shape=(N, int(numerix.prod(coarseShape))))
+
+    def _hierarchy(self, A, shape):
+        """Operators, restrictions, interpolations and inverse diagonals of
+        each level but the coarsest, and the direct solver of the coarsest
+        """
+        A = sparse.csr_matrix(A)
+        numberOfVariables = A.shape[0] // max(int(numerix.prod(shape)), 1)
+
+        levels = []
+        while (A.shape[0] > self.coarsest
+               and max(shape) > 1
+               and (self.levels is None or len(levels) < self.levels - 1)):
+            N = int(numerix.prod(shape))
+            P = sparse.block_diag([self._interpolation(A[i * N:(i + 1) * N, i * N:(i + 1) * N], shape)
+                                   for i in range(numberOfVariables)]).tocsr()
+            R = P.transpose().tocsr()
+
+            diagonal = A.diagonal()
+            invDiagonal = numerix.zeros(diagonal.shape)
+            invDiagonal[diagonal != 0] = 1. / diagonal[diagonal != 0]
+
+            levels.append((A, R, P, invDiagonal))
+
+            A = (R * A * P).tocsr()
+            shape = tuple((n + 1) // 2 for n in shape)
+
+        coarseSolve = splu(A.tocsc()).solve
+
+        return levels, coarseSolve
+
+    def _smooth(self, A, invDiagonal, b, x, sweeps):
+        for sweep in range(sweeps):
+            x = x + self.damping * invDiagonal * (b - A.dot(x))
+        return x
+
+    def _cycle(self, levels, coarseSolve, level, b, x, cycle):
+        if level == len(levels):
+            return coarseSolve(b)
+
+        A, R, P, invDiagonal = levels[level]
+
+        x = self._smooth(A, invDiagonal, b, x, self.presmooth)
+
+        residual = R.dot(b - A.dot(x))
+        correction = numerix.zeros(residual.shape)
+        for visit in {"V": ("V",), "W": ("W", "W"), "F": ("F", "V")}[cycle]:
+            correction = self._cycle(levels, coarseSolve, level + 1,
+                                     residual, correction, visit)
+        x = x + P.dot(correction)
+
+        return self._smooth(A, invDiagonal, b, x, self.postsmooth)
+
+    def _operator(self, A, shape):
+        levels, coarseSolve = self._hierarchy(A, shape)
+
+        def matvec(b):
+            b = numerix.ravel(b)
+            return self._cycle(levels, coarseSolve, 0, b, numerix.zeros(b.shape), self.cycle)
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=float)
+
+    def _applyToMatrix(self, A):
+        return self._operator(A, shape=(A.shape[0],))
+
+    def _applyToMeshMatrix(self, L):
+        return self._operator(L.matrix, shape=self._gridShape(L.mesh))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
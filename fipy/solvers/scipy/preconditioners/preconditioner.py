@@ -0,0 +1,35 @@
+from __future__ import unicode_literals
+from builtins import object
+__all__ = ["Preconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class Preconditioner(object):
+    """
+    Base preconditioner class
+
+    .. attention:: This class is abstract. Always create one of its subclasses.
+    """
+
+    def __init__(self):
+        """
+        Create a `Preconditioner` object.
+        """
+        if self.__class__ is Preconditioner:
+            raise NotImplementedError("can't instantiate abstract base class")
+
+    def _applyToMatrix(self, matrix):
+        """
+        Returns a `scipy.sparse.linalg.LinearOperator` that approximates
+        the inverse of the scipy sparse `matrix`.
+        """
+        raise NotImplementedError
+
+    def _applyToMeshMatrix(self, L):
+        """
+        Returns the preconditioning operator for the `_ScipyMeshMatrix` `L`.
+
+        Preconditioners that need the mesh behind the matrix override
+        this; the rest only see the sparse matrix.
+        """
+        return self._applyToMatrix(L.matrix)
@@ -0,0 +1,220 @@
+from __future__ import division
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+from builtins import map
+import multiprocessing
+
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import LinearOperator, splu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["SchwarzPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class SchwarzPreconditioner(Preconditioner):
+    r"""
+    Additive Schwarz preconditioner for the SciPy solvers.
+
+    The cells of the mesh are split into `blocks` subdomains of
+    consecutive cell IDs, the way the grid builders slice a mesh among
+    processors, and each subdomain is grown by `overlap` layers of
+    neighboring cells, the way a processor's cells are surrounded by
+    ghost cells.  The diagonal block of the matrix that belongs to each
+    subdomain is factorized on its own, in a pool of `threads`, and the
+    preconditioner sums the subdomain solutions.  SuperLU releases the
+    global interpreter lock, so the factorizations and the subdomain
+    solves run concurrently on a multi-core machine.  Without
+    :mod:`concurrent.futures` (Python 2 without the `futures` backport),
+    the subdomains are solved in turn.
+
+    With `overlap=0` this is block Jacobi.  With `restricted=True`, each
+    subdomain only contributes the solution in the cells it owns
+    (restricted additive Schwarz), which usually converges faster, but
+    is not symmetric and so does not suit `LinearPCGSolver`.
+
+    >>> from fipy import *
+    >>> from fipy.solvers.scipy import LinearPCGSolver, LinearGMRESSolver
+    >>> from fipy.solvers.scipy.preconditioners import SchwarzPreconditioner
+
+    >>> mesh = Grid2D(nx=20, ny=20)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(0., where=mesh.facesLeft)
+    >>> var.constrain(1., where=mesh.facesRight)
+    >>> eq = DiffusionTerm() == 0
+
+    >>> precon = SchwarzPreconditioner(blocks=4, overlap=2)
+    >>> eq.solve(var=var,
+    ...          solver=LinearPCGSolver(tolerance=1e-10, precon=precon))
+    >>> print(numerix.allclose(var, mesh.x / 20., atol=1e-8))
+    True
+
+    >>> var.setValue(0.)
+    >>> precon = SchwarzPreconditioner(blocks=4, overlap=1, restricted=True)
+    >>> eq.solve(var=var,
+    ...          solver=LinearGMRESSolver(tolerance=1e-10, precon=precon))
+    >>> print(numerix.allclose(var, mesh.x / 20., atol=1e-8))
+    True
+
+    The subdomains share cells where they overlap
+
+    >>> subdomains, owned = precon._subdomains(mesh, mesh.numberOfCells)
+    >>> print([len(cells) for cells in owned])
+    [100, 100, 100, 100]
+    >>> print([len(cells) for cells in subdomains])
+    [120, 140, 140, 120]
+
+    and a single subdomain is an exact solve
+
+    >>> from scipy.sparse import csr_matrix
+    >>> A = csr_matrix([[ 4., -1.,  0.,  0.],
+    ...                 [-1.,  4., -1.,  0.],
+    ...                 [ 0., -1.,  4., -1.],
+    ...                 [ 0.,  0., -1.,  4.]])
+    >>> M = SchwarzPreconditioner(blocks=1)._applyToMatrix(A)
+    >>> x = numerix.array([1., 2., 3., 4.])
+    >>> print(numerix.allclose(M.matvec(A.dot(x)), x))
+    True
+
+    while disjoint subdomains only see their own diagonal block
+
+    >>> M = SchwarzPreconditioner(blocks=2, overlap=0)._applyToMatrix(A)
+    >>> print(numerix.allclose(M.matvec(A.dot(x)), x))
+    False
+    >>> print(numerix.allclose(M.matvec([3., 6., 9., 12.]),
+    ...                        [1.2, 1.8, 3.2, 3.8]))
+    True
+    """
+
+    def __init__(self, blocks=None, overlap=1, restricted=False, threads=None):
+        """
+        Parameters
+        ----------
+        blocks : int, optional
+            Number of subdomains.  Defaults to the number of `threads`.
+        overlap : int
+            Number of layers of neighboring cells added to each subdomain.
+        restricted : bool
+            Whether each subdomain only updates the cells it owns.
+        threads : int, optional
+            Number of threads that factorize and solve the subdomains.
+            Defaults to the number of processors of the machine.
+        """
+        self.threads = threads or self._cpuCount()
+        self.blocks = blocks or self.threads
+        self.overlap = overlap
+        self.restricted = restricted
+        self._pool = None
+
+    @staticmethod
+    def _cpuCount():
+        try:
+            return multiprocessing.cpu_count()
+        except NotImplementedError:
+            return 1
+
+    @property
+    def _threadPool(self):
+        """Pool of `threads`, or `None` if the subdomains are solved in turn
+        """
+        if self._pool is None and self.threads > 1:
+            try:
+                from concurrent.futures import ThreadPoolExecutor
+            except ImportError:
+                # Python 2, without the `futures` backport
+                return None
+            self._pool = ThreadPoolExecutor(max_workers=self.threads)
+        return self._pool
+
+    def _map(self, function, *iterables):
+        """Apply `function` to each subdomain, concurrently if there is a
+        pool of threads
+        """
+        pool = self._threadPool
+        if pool is None:
+            return list(map(function, *iterables))
+        else:
+            return list(pool.map(function, *iterables))
+
+    @staticmethod
+    def _adjacency(mesh, N):
+        """Symmetric `N` by `N` sparse matrix of cells that share a face
+        or, when `mesh` is a sparse matrix, of its nonzero pattern.
+        """
+        if hasattr(mesh, "faceCellIDs"):
+            faceCellIDs = mesh.faceCellIDs
+            interior = ~numerix.MA.getmaskarray(faceCellIDs[1])
+            ids = numerix.MA.filled(faceCellIDs[..., interior])
+            row = numerix.concatenate((ids[0], ids[1]))
+            col = numerix.concatenate((ids[1], ids[0]))
+        else:
+            pattern = mesh.tocoo()
+            row, col = pattern.row, pattern.col
+        return coo_matrix((numerix.ones(len(row), dtype=int), (row, col)),
+                          shape=(N, N)).tocsr()
+
+    def _subdomains(self, mesh, N):
+        """IDs of the cells in each subdomain, including the overlap, and
+        of the cells each subdomain owns.
+        """
+        adjacency = self._adjacency(mesh, N)
+        blocks = max(1, min(self.blocks, N))
+        owned = numerix.array_split(numerix.arange(N), blocks)
+
+        subdomains = []
+        for cells in owned:
+            inside = numerix.zeros(N, dtype=bool)
+            inside[cells] = True
+            for layer in range(self.overlap):
+                inside |= adjacency.dot(inside.astype(int)) > 0
+            subdomains.append(numerix.nonzero(inside)[0])
+
+        return subdomains, owned
+
+    def _operator(self, A, mesh, N):
+        A = A.tocsr()
+        numberOfVariables = A.shape[0] // max(N, 1)
+
+        def rowsOf(cells):
+            return numerix.concatenate([cells + i * N
+                                        for i in range(numberOfVariables)])
+
+        subdomains, owned = self._subdomains(mesh, N)
+        rows = [rowsOf(cells) for cells in subdomains]
+        if self.restricted:
+            keep = [numerix.in1d(r, rowsOf(cells))
+                    for r, cells in zip(rows, owned)]
+        else:
+            keep = [slice(None)] * len(rows)
+
+        def factorize(r):
+            return splu(A[r][:, r].tocsc())
+
+        factors = self._map(factorize, rows)
+
+        def matvec(b):
+            b = numerix.ravel(b)
+            x = numerix.zeros(b.shape, dtype=numerix.result_type(A.dtype, b.dtype))
+            solutions = self._map(lambda lu, r: lu.solve(b[r]),
+                                  factors, rows)
+            for r, k, solution in zip(rows, keep, solutions):
+                x[r[k]] += solution[k]
+            return x
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
+
+    def _applyToMatrix(self, A):
+        return self._operator(A, mesh=A, N=A.shape[0])
+
+    def _applyToMeshMatrix(self, L):
+        return self._operator(L.matrix, mesh=L.mesh, N=L.mesh.numberOfCells)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
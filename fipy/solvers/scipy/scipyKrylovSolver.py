@@ -1,3 +1,4 @@
+from __future__ import print_function
 from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
@@ -6,29 +7,155 @@ __all__ = []
 import os
 
 from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.matrices.matrixFreeMatrix import _MatrixFreeMatrix, _MatrixFreeMeshMatrix
+
+def _acceptsKeyword(function, name):
+    """Whether `function` takes the keyword argument `name`
+
+    >>> def f(a, b=1):
+    ...     pass
+    >>> print(_acceptsKeyword(f, "b"), _acceptsKeyword(f, "c"))
+    True False
+    """
+    try:
+        from inspect import signature
+    except ImportError:
+        # Python 2
+        from inspect import getargspec
+        return name in getargspec(function).args
+    return name in signature(function).parameters
 
 class _ScipyKrylovSolver(_ScipySolver):
     """
     The base `ScipyKrylovSolver` class.
 
     .. attention:: This class is abstract. Always create one of its subclasses.
+
+    The preconditioner is built for every solve, unless a `preconReuse`
+    policy says otherwise.
+
+    >>> from fipy import *
+    >>> from fipy.solvers.scipy.linearGMRESSolver import LinearGMRESSolver
+    >>> class _CountingPreconditioner(object):
+    ...     builds = 0
+    ...     def _applyToMatrix(self, A):
+    ...         self.builds += 1
+    ...         from scipy.sparse.linalg import LinearOperator
+    ...         return LinearOperator(A.shape, matvec=lambda x: x)
+    >>> m = Grid1D(nx=10)
+    >>> v = CellVariable(mesh=m)
+    >>> v.constrain(1., where=m.facesLeft)
+    >>> eq = DiffusionTerm() == ImplicitSourceTerm(coeff=v)
+    >>> precon = _CountingPreconditioner()
+    >>> solver = LinearGMRESSolver(precon=precon, preconReuse=3)
+    >>> for sweep in range(7):
+    ...     res = eq.sweep(var=v, solver=solver)
+    >>> print(precon.builds)
+    3
+
+    With `matrixFree=True`, the matrix is never assembled.  The Krylov
+    iterations apply it by gathering from the cells on either side of
+    each face and scattering back, and only a preconditioner, if there
+    is one, assembles it.
+
+    >>> from fipy.solvers.scipy.linearLUSolver import LinearLUSolver
+    >>> m = Grid2D(nx=10, ny=10)
+    >>> v = CellVariable(mesh=m)
+    >>> v.constrain(1., where=m.facesLeft)
+    >>> eq = (DiffusionTerm(coeff=2.) + PowerLawConvectionTerm(coeff=(1., 0.))
+    ...       == ImplicitSourceTerm(coeff=1.))
+    >>> eq.solve(var=v, solver=LinearLUSolver())
+    >>> expected = v.copy()
+    >>> v.setValue(0.)
+    >>> solver = LinearGMRESSolver(tolerance=1e-12, matrixFree=True)
+    >>> eq.solve(var=v, solver=solver)
+    >>> print(isinstance(solver.matrix, _MatrixFreeMatrix))
+    True
+    >>> print(numerix.allclose(v, expected))
+    True
+
+    Higher-order terms multiply matrices together, and the products are
+    assembled before their elements are kept.
+
+    >>> m = Grid1D(nx=20)
+    >>> v = CellVariable(mesh=m)
+    >>> v.constrain(0., where=m.facesLeft)
+    >>> v.constrain(1., where=m.facesRight)
+    >>> v.faceGrad.constrain(0., where=m.exteriorFaces)
+    >>> eq = DiffusionTerm(coeff=(1., 1.)) == ImplicitSourceTerm(coeff=1.)
+    >>> eq.solve(var=v, solver=LinearLUSolver())
+    >>> expected = v.copy()
+    >>> v.setValue(0.)
+    >>> eq.solve(var=v, solver=LinearGMRESSolver(tolerance=1e-12, matrixFree=True))
+    >>> print(numerix.allclose(v, expected))
+    True
     """
 
+    _preconditionerOperator = None
+
+    def __init__(self, tolerance=1e-15, iterations=2000, precon=None, preconReuse=None, matrixFree=False):
+        super(_ScipyKrylovSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon, preconReuse=preconReuse)
+        self.matrixFree = matrixFree
+
+    @property
+    def _matrixClass(self):
+        if self.matrixFree:
+            return _MatrixFreeMeshMatrix
+        else:
+            return super(_ScipyKrylovSolver, self)._matrixClass
+
+    _callbackType = None
+
+    def _applyPreconditioner(self, L):
+        if isinstance(L, _MatrixFreeMatrix):
+            L = L._assembledMeshMatrix()
+
+        if isinstance(self.preconditioner, Preconditioner):
+            return self.preconditioner._applyToMeshMatrix(L)
+        else:
+            return self.preconditioner._applyToMatrix(L.matrix)
+
     def _solve_(self, L, x, b):
         A = L.matrix
         if self.preconditioner is None:
             M = None
+        elif self._canReusePreconditioner(A.shape):
+            M = self._preconditionerOperator
         else:
-            M = self.preconditioner._applyToMatrix(A)
+            M = self._applyPreconditioner(L)
+            if self.preconReuse is not None:
+                self._preconditionerOperator = M
+
+        iterations = [0]
+        def count(*args):
+            iterations[0] += 1
+
+        kwargs = dict()
+        # SciPy has only told `callback` what to report since 1.4
+        if (self._callbackType is not None
+            and _acceptsKeyword(self.solveFnc, 'callback_type')):
+            kwargs['callback_type'] = self._callbackType
 
         x, info = self.solveFnc(A, b, x,
                                 tol=self.tolerance,
                                 maxiter=self.iterations,
                                 M=M,
-                                atol='legacy')
+                                callback=count,
+                                atol='legacy',
+                                **kwargs)
+
+        self._recordIterations(iterations[0])
 
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             if info < 0:
                 PRINT('failure', self._warningList[info].__class__.__name__)
 
         return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -22,7 +22,8 @@ from fipy.tools import numerix
 __all__ = ["SolverConvergenceWarning", "MaximumIterationWarning",
            "PreconditionerWarning", "IllConditionedPreconditionerWarning",
            "PreconditionerNotPositiveDefiniteWarning", "MatrixIllConditionedWarning",
-           "StagnatedSolverWarning", "ScalarQuantityOutOfRangeWarning", "Solver"]
+           "StagnatedSolverWarning", "ScalarQuantityOutOfRangeWarning",
+           "PreconditionerReuse", "Solver"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
@@ -62,6 +63,77 @@ class ScalarQuantityOutOfRangeWarning(SolverConvergenceWarning):
     def __str__(self):
         return "A scalar quantity became too small or too large to continue computing. Iterations: %g. Relative error: %g" % (self.iter, self.relres)
 
+class PreconditionerReuse(object):
+    """Policy for when a Krylov `Solver` builds its preconditioner anew
+
+    Without a policy, the preconditioner is built for every solve.  With
+    one, the preconditioner of an earlier solve is applied to later
+    matrices until either limit is reached.  This amortizes expensive
+    preconditioners, such as incomplete factorizations or algebraic
+    multigrid, over the sweeps of a slowly changing nonlinear problem.
+
+    >>> policy = PreconditionerReuse(every=3)
+    >>> print([policy._rebuild() for solve in range(7)])
+    [True, False, False, True, False, False, True]
+
+    >>> policy = PreconditionerReuse(growth=0.5)
+    >>> for iterations in (10, 12, 16, 11):
+    ...     print(policy._rebuild())
+    ...     policy._record(iterations)
+    True
+    False
+    False
+    True
+
+    Parameters
+    ----------
+    every : int, optional
+        Build the preconditioner anew after it has been used for this
+        many solves.
+    growth : float, optional
+        Build the preconditioner anew once a solve needs more than
+        `(1 + growth)` times the iterations of the first solve with the
+        current preconditioner.
+
+    If neither is given, the first preconditioner is used for as long as
+    the size of the matrix does not change.
+    """
+
+    def __init__(self, every=None, growth=None):
+        self.every = every
+        self.growth = growth
+        self._invalidate()
+
+    def _invalidate(self):
+        self._uses = 0
+        self._baseline = None
+        self._stale = True
+
+    def _rebuild(self):
+        """Whether the next solve should build its preconditioner
+        """
+        rebuild = (self._stale
+                   or (self.every is not None and self._uses >= self.every))
+        if rebuild:
+            self._invalidate()
+            self._stale = False
+
+        self._uses += 1
+
+        return rebuild
+
+    def _record(self, iterations):
+        """Note the number of `iterations` needed by the latest solve
+        """
+        if self._baseline is None:
+            self._baseline = iterations
+        elif (self.growth is not None
+              and iterations > self._baseline * (1 + self.growth)):
+            self._stale = True
+
+    def __repr__(self):
+        return "%s(every=%s, growth=%s)" % (self.__class__.__name__, self.every, self.growth)
+
 class Solver(object):
     """
     The base `LinearXSolver` class.
@@ -69,7 +141,9 @@ class Solver(object):
     .. attention:: This class is abstract. Always create one of its subclasses.
     """
 
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=None):
+    _preconditionerShape = None
+
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None, preconReuse=None):
         """
         Create a `Solver` object.
 
@@ -82,6 +156,10 @@ class Solver(object):
         precon
             Preconditioner to use.  Not all solver suites support
             preconditioners.
+        preconReuse : ~fipy.solvers.solver.PreconditionerReuse or int, optional
+            When to build the preconditioner anew.  An integer `N` is
+            short for `PreconditionerReuse(every=N)`.  By default, the
+            preconditioner is built for every solve.
         """
         if self.__class__ is Solver:
             raise NotImplementedError("can't instantiate abstract base class")
@@ -91,6 +169,33 @@ class Solver(object):
 
         self.preconditioner = precon
 
+        if preconReuse is None:
+            pass
+        elif isinstance(preconReuse, PreconditionerReuse):
+            # the policy keeps count of this solver's solves
+            preconReuse = PreconditionerReuse(every=preconReuse.every,
+                                              growth=preconReuse.growth)
+        else:
+            preconReuse = PreconditionerReuse(every=preconReuse)
+        self.preconReuse = preconReuse
+
+    def _canReusePreconditioner(self, shape):
+        """Whether the preconditioner of the previous solve may be applied
+        to a matrix of `shape`, according to the `preconReuse` policy
+        """
+        if self.preconReuse is None:
+            return False
+
+        if shape != self._preconditionerShape:
+            self._preconditionerShape = shape
+            self.preconReuse._invalidate()
+
+        return not self.preconReuse._rebuild()
+
+    def _recordIterations(self, iterations):
+        if self.preconReuse is not None:
+            self.preconReuse._record(iterations)
+
     def _storeMatrix(self, var, matrix, RHSvector):
         self.var = var
         self.matrix = matrix
@@ -102,6 +207,61 @@ class Solver(object):
     def _solve_(self, L, x, b):
         raise NotImplementedError
 
+    def _reuseFactorization(self, arrays, factorize, communicator=None):
+        """Factorize a matrix, unless it is identical to the previous one
+
+        Parameters
+        ----------
+        arrays : list of ndarray
+            Arrays that fully describe the (local part of the) matrix,
+            e.g., the `data`, `indices` and `indptr` of a CSR matrix.
+        factorize : callable
+            Returns the factorization of the matrix.
+        communicator : ~fipy.tools.comms.abstractCommWrapper.AbstractCommWrapper, optional
+            If given, the previous factorization is only reused if the
+            matrix is unchanged on every processor.
+
+        Returns
+        -------
+        object
+            The result of `factorize()`, possibly from an earlier call.
+
+        >>> from fipy.solvers import DefaultSolver
+        >>> from fipy.tools.comms.dummyComm import DummyComm
+        >>> solver = DefaultSolver()
+        >>> factorizations = []
+        >>> def factorize():
+        ...     factorizations.append(len(factorizations))
+        ...     return factorizations[-1]
+        >>> A = [numerix.array([0, 1, 2]), numerix.array([1., 2.])]
+        >>> for values in ([1., 2.], [1., 2.], [3., 2.]):
+        ...     A[1] = numerix.array(values)
+        ...     print(solver._reuseFactorization(A, factorize,
+        ...                                      communicator=DummyComm()))
+        0
+        0
+        1
+        """
+        previous = getattr(self, '_factorization', None)
+
+        unchanged = (previous is not None
+                     and len(previous[0]) == len(arrays)
+                     and all(numerix.array_equal(old, new)
+                             for old, new in zip(previous[0], arrays)))
+        if communicator is not None:
+            unchanged = communicator.all(numerix.array(unchanged))
+
+        if unchanged:
+            return previous[1]
+
+        # drop the old factorization before building its replacement
+        self._factorization = None
+        factorization = factorize()
+        self._factorization = ([numerix.array(a, copy=True) for a in arrays],
+                               factorization)
+
+        return factorization
+
     def _applyUnderRelaxation(self, underRelaxation=None):
         if underRelaxation is not None:
             self.matrix.putDiagonal(numerix.asarray(self.matrix.takeDiagonal()) / underRelaxation)
@@ -164,3 +324,10 @@ class Solver(object):
 
     def __exit__(self, exc_type, exc_value, traceback):
         pass
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,274 @@
+"""Find and import the solver packages
+
+Looking for a solver package does not import it.  `import fipy` leaves
+the solver package, and the libraries it wraps, unimported
+
+>>> print(_importedSolverPackages("import fipy"))
+[]
+
+nor does building a mesh with a solver package that only runs in serial
+
+>>> print(_importedSolverPackages("import os; os.environ['FIPY_SOLVERS'] = 'scipy'; "
+...                               "import fipy; fipy.Grid1D(nx=3).communicator.Nproc"))
+[]
+
+until something needs it
+
+>>> from fipy.solvers import solver
+>>> imported = _importedSolverPackages("import fipy; fipy.DefaultSolver")
+>>> print(_modulePrefix(solver) in imported)
+True
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+import sys
+import types
+from importlib import import_module
+
+__all__ = ["SerialSolverError"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class SerialSolverError(Exception):
+    def __init__(self):
+        super(SerialSolverError, self).__init__('solver does not run in parallel')
+
+def _available(module):
+    """Whether the top-level `module` is installed, without importing it
+
+    >>> print(_available("fipy"))
+    True
+    >>> print(_available("fipy_no_such_module"))
+    False
+    """
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        # Python 2
+        import imp
+        try:
+            imp.find_module(module)
+            return True
+        except ImportError:
+            return False
+
+    try:
+        return find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+class _LazyModule(types.ModuleType):
+    """Module that looks up the attributes it lacks with the
+    `__getattr__` function it defines
+
+    Python only honors a module `__getattr__` from 3.7 (:pep:`562`).
+
+    >>> module = _LazyModule(str("lazy"))
+    >>> module.__getattr__ = lambda name: name.upper()
+    >>> print(module.solver)
+    SOLVER
+    """
+
+    def __getattr__(self, name):
+        if name == "__getattr__":
+            raise AttributeError(name)
+        return self.__dict__["__getattr__"](name)
+
+def _honorModuleGetattr(name):
+    """Have the `__getattr__` function of module `name` look up its
+    missing attributes on Pythons that ignore it
+
+    From 3.5, the class of the module is changed in place.  Before, the
+    module is replaced in `sys.modules` by a copy, which keeps the
+    original alive, as its functions still refer to its globals.  Call
+    this at the end of the module.
+    """
+    module = sys.modules[name]
+    if sys.version_info >= (3, 7):
+        return
+    elif sys.version_info >= (3, 5):
+        module.__class__ = _LazyModule
+    else:
+        lazy = _LazyModule(str(name), module.__doc__)
+        lazy.__dict__.update(module.__dict__)
+        lazy._module = module
+        sys.modules[name] = lazy
+
+class _LazyCommWrapper(object):
+    """Stands in for a communicator of the solver package
+
+    The solver package is only imported when the communicator is first
+    used.
+
+    >>> from fipy.tools.comms.dummyComm import DummyComm
+    >>> created = []
+    >>> def create():
+    ...     created.append(DummyComm())
+    ...     return created[-1]
+    >>> comm = _LazyCommWrapper(create)
+    >>> print(len(created))
+    0
+    >>> print(comm.Nproc, comm.procID)
+    1 0
+    >>> print(comm)
+    DummyComm()
+    >>> print(len(created))
+    1
+    """
+
+    def __init__(self, create):
+        self._create = create
+        self._comm = None
+
+    @property
+    def _wrapped(self):
+        if self._comm is None:
+            self._comm = self._create()
+        return self._comm
+
+    def __getattr__(self, attr):
+        if attr.startswith("__") or attr in ("_create", "_comm"):
+            raise AttributeError(attr)
+        return getattr(self._wrapped, attr)
+
+    def __repr__(self):
+        return repr(self._wrapped)
+
+def _exports(package, solver, _MeshMatrix, serialComm=None, parallelComm=None):
+    from fipy.tools.comms.dummyComm import DummyComm
+
+    namespace = dict((name, getattr(package, name)) for name in package.__all__)
+    namespace.update(__all__=list(package.__all__),
+                     solver=solver,
+                     _MeshMatrix=_MeshMatrix,
+                     serialComm=serialComm or DummyComm(),
+                     parallelComm=parallelComm or DummyComm())
+
+    return namespace
+
+def _loadPysparse(desired, Nproc):
+    pysparse = import_module("fipy.solvers.pysparse")
+    from fipy.matrices.pysparseMatrix import _PysparseMeshMatrix
+    return _exports(pysparse, solver="pysparse", _MeshMatrix=_PysparseMeshMatrix)
+
+def _loadPETSc(desired, Nproc):
+    petsc = import_module("fipy.solvers.petsc")
+
+    from fipy.solvers.petsc.comms.serialPETScCommWrapper import SerialPETScCommWrapper
+    serialComm = SerialPETScCommWrapper()
+
+    if Nproc > 1:
+        from fipy.solvers.petsc.comms.parallelPETScCommWrapper import ParallelPETScCommWrapper
+        parallelComm = ParallelPETScCommWrapper()
+    else:
+        parallelComm = SerialPETScCommWrapper()
+
+    from fipy.matrices.petscMatrix import _PETScMeshMatrix
+    return _exports(petsc, solver="petsc", _MeshMatrix=_PETScMeshMatrix,
+                    serialComm=serialComm, parallelComm=parallelComm)
+
+def _loadTrilinos(desired, Nproc):
+    trilinos = import_module("fipy.solvers.trilinos")
+
+    from fipy.solvers.trilinos.comms.serialEpetraCommWrapper import SerialEpetraCommWrapper
+    serialComm = SerialEpetraCommWrapper()
+
+    if Nproc > 1:
+        from fipy.solvers.trilinos.comms.parallelEpetraCommWrapper import ParallelEpetraCommWrapper
+        parallelComm = ParallelEpetraCommWrapper()
+    else:
+        parallelComm = SerialEpetraCommWrapper()
+
+    solver = None
+    if desired != "no-pysparse":
+        try:
+            from fipy.matrices.pysparseMatrix import _PysparseMeshMatrix
+            _MeshMatrix =  _PysparseMeshMatrix
+            solver = "trilinos"
+        except ImportError:
+            pass
+
+    if solver is None:
+        # no-pysparse requested or pysparseMatrix failed to import
+        from fipy.matrices.trilinosMatrix import _TrilinosMeshMatrix
+        _MeshMatrix =  _TrilinosMeshMatrix
+        solver = "no-pysparse"
+
+    return _exports(trilinos, solver=solver, _MeshMatrix=_MeshMatrix,
+                    serialComm=serialComm, parallelComm=parallelComm)
+
+def _loadScipy(desired, Nproc):
+    scipy = import_module("fipy.solvers.scipy")
+    from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
+    return _exports(scipy, solver="scipy", _MeshMatrix=_ScipyMeshMatrix)
+
+def _loadPyAMG(desired, Nproc):
+    pyAMG = import_module("fipy.solvers.pyAMG")
+    from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
+    return _exports(pyAMG, solver="pyamg", _MeshMatrix=_ScipyMeshMatrix)
+
+def _loadPyAMGX(desired, Nproc):
+    pyamgx = import_module("fipy.solvers.pyamgx")
+    from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
+    return _exports(pyamgx, solver="pyamgx", _MeshMatrix=_ScipyMeshMatrix)
+
+_loaders = {"pysparse": _loadPysparse,
+            "petsc": _loadPETSc,
+            "trilinos": _loadTrilinos,
+            "scipy": _loadScipy,
+            "pyamg": _loadPyAMG,
+            "pyamgx": _loadPyAMGX}
+
+def _loadSolverPackage(name, desired, Nproc):
+    """Import the solver package `name`
+
+    Parameters
+    ----------
+    name : str
+        One of "pysparse", "petsc", "trilinos", "scipy", "pyamg" or "pyamgx".
+    desired : str
+        The solver package that was asked for, if any.
+    Nproc : int
+        Number of processors.
+
+    Returns
+    -------
+    dict
+        The names the solver package adds to `fipy.solvers`, including
+        `solver`, `_MeshMatrix`, `serialComm` and `parallelComm`.
+    """
+    return _loaders[name](desired=desired, Nproc=Nproc)
+
+def _modulePrefix(solver):
+    """The `fipy.solvers` subpackage of the solver package `solver`
+    """
+    return {"no-pysparse": "fipy.solvers.trilinos",
+            "pyamg": "fipy.solvers.pyAMG"}.get(solver, "fipy.solvers." + solver)
+
+def _importedSolverPackages(statement):
+    """The `fipy.solvers` subpackages that a fresh interpreter has
+    imported after executing `statement`
+
+    This is a regression test for the time taken by `import fipy`,
+    which must not load the solver package before it is needed.
+    """
+    import subprocess
+    import sys
+
+    script = ("import sys; %s; "
+              "print(' '.join(sorted(name for name in sys.modules "
+              "if name.count('.') == 2 and name.startswith('fipy.solvers.'))))"
+              % statement)
+    output = subprocess.check_output([sys.executable, "-c", script])
+    prefixes = set(_modulePrefix(solver) for solver in _loaders)
+    return sorted(name for name in output.decode().split() if name in prefixes)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
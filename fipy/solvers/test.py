@@ -1,12 +1,27 @@
 from __future__ import unicode_literals
 __all__ = []
 
-from fipy.tests.lateImportTest import _LateImportTestSuite
+from fipy.tests.doctestPlus import _LateImportDocTestSuite
 import fipy.tests.testProgram
+from fipy.solvers import solver
+
+if solver == 'scipy':
+    docTestModuleNames = ('scipy.linearLUSolver', 'scipy.scipyKrylovSolver',
+                          'scipy.linearMultigridSolver',
+                          'scipy.preconditioners.schwarzPreconditioner',
+                          'scipy.preconditioners.multigridPreconditioner')
+elif solver in ('trilinos', 'no-pysparse'):
+    docTestModuleNames = ('trilinos.trilinosAztecOOSolver',)
+elif solver == 'petsc':
+    docTestModuleNames = ('petsc.petscSolver',)
+else:
+    docTestModuleNames = ()
+
+docTestModuleNames = ('solver', 'solverPackages') + docTestModuleNames
 
 def _suite():
-    return _LateImportTestSuite(testModuleNames = (),
-                                base = __name__)
+    return _LateImportDocTestSuite(docTestModuleNames=docTestModuleNames,
+                                   base=__name__)
 
 if __name__ == '__main__':
     fipy.tests.testProgram.main(defaultTest='_suite')
@@ -18,7 +18,7 @@ class LinearCGSSolver(TrilinosAztecOOSolver):
 
     """
 
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=MultilevelDDPreconditioner()):
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=MultilevelDDPreconditioner(), preconReuse=None):
         """
         Parameters
         ----------
@@ -27,7 +27,10 @@ class LinearCGSSolver(TrilinosAztecOOSolver):
         iterations : int
             Maximum number of iterative steps to perform.
         precon : ~fipy.solvers.trilinos.preconditioners.preconditioner.Preconditioner
+        preconReuse : ~fipy.solvers.solver.PreconditionerReuse or int, optional
+            When to build the preconditioner anew.
         """
         TrilinosAztecOOSolver.__init__(self, tolerance=tolerance,
-                                       iterations=iterations, precon=precon)
+                                       iterations=iterations, precon=precon,
+                                       preconReuse=preconReuse)
         self.solver = AztecOO.AZ_cgs
@@ -1,3 +1,4 @@
+from __future__ import print_function
 from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
@@ -18,9 +19,42 @@ class TrilinosAztecOOSolver(TrilinosSolver):
     .. attention:: This class is abstract, always create on of its subclasses.
        It provides the code to call all solvers from the Trilinos AztecOO package.
 
+    With a `preconReuse` policy, a preconditioner built outside AztecOO
+    is applied again to later matrices, and the matrix it was built from
+    is kept for as long as it is
+
+    >>> from fipy import (CellVariable, Grid2D, DiffusionTerm,
+    ...                   TransientTerm, numerix)
+    >>> from fipy.solvers.trilinos import LinearGMRESSolver
+    >>> from fipy.solvers.trilinos.preconditioners import MultilevelDDPreconditioner
+    >>> mesh = Grid2D(nx=10, ny=10)
+    >>> def solve(solver):
+    ...     var = CellVariable(mesh=mesh, hasOld=True)
+    ...     var.constrain(1., where=mesh.facesLeft)
+    ...     eq = TransientTerm() == DiffusionTerm()
+    ...     operators = []
+    ...     for step in range(3):
+    ...         var.updateOld()
+    ...         eq.solve(var=var, dt=1., solver=solver)
+    ...         operators.append(solver._preconditionerOperator)
+    ...     return var, operators
+    >>> var, operators = solve(LinearGMRESSolver(tolerance=1e-10,
+    ...                                          precon=MultilevelDDPreconditioner(),
+    ...                                          preconReuse=2)) # doctest: +TRILINOS_SOLVER
+    >>> print(operators[0] is not None, operators[1] is operators[0],
+    ...       operators[2] is operators[1]) # doctest: +TRILINOS_SOLVER
+    True True False
+    >>> fresh, operators = solve(LinearGMRESSolver(tolerance=1e-10,
+    ...                                            precon=MultilevelDDPreconditioner())) # doctest: +TRILINOS_SOLVER
+    >>> print(numerix.allclose(var, fresh, atol=1e-6)) # doctest: +TRILINOS_SOLVER
+    True
+
     """
 
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=JacobiPreconditioner()):
+    _preconditionerOperator = None
+    _preconditionerMatrix = None
+
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=JacobiPreconditioner(), preconReuse=None):
         """
         Parameters
         ----------
@@ -29,12 +63,15 @@ class TrilinosAztecOOSolver(TrilinosSolver):
         iterations : int
             Maximum number of iterative steps to perform.
         precon : ~fipy.solvers.trilinos.preconditioners.preconditioner.Preconditioner
+        preconReuse : ~fipy.solvers.solver.PreconditionerReuse or int, optional
+            When to build the preconditioner anew.
         """
         if self.__class__ is TrilinosAztecOOSolver:
             raise NotImplementedError("can't instantiate abstract base class")
 
         TrilinosSolver.__init__(self, tolerance=tolerance,
-                                iterations=iterations, precon=None)
+                                iterations=iterations, precon=None,
+                                preconReuse=preconReuse)
         self.preconditioner = precon
 
     def _solve_(self, L, x, b):
@@ -46,13 +83,29 @@ class TrilinosAztecOOSolver(TrilinosSolver):
 
         Solver.SetAztecOption(AztecOO.AZ_output, AztecOO.AZ_none)
 
-        if self.preconditioner is not None:
-            self.preconditioner._applyToSolver(solver=Solver, matrix=L)
-        else:
+        shape = (L.NumGlobalRows(), L.NumGlobalCols())
+        if self.preconditioner is None:
             Solver.SetAztecOption(AztecOO.AZ_precond, AztecOO.AZ_none)
+        elif (self._preconditionerOperator is not None
+              and self._canReusePreconditioner(shape)):
+            Solver.SetPrecOperator(self._preconditionerOperator)
+        else:
+            # preconditioners internal to AztecOO are always built anew
+            self.preconditioner._applyToSolver(solver=Solver, matrix=L)
+            if self.preconReuse is not None:
+                operator = getattr(self.preconditioner, 'Prec', None)
+                if operator is not None and self._preconditionerOperator is None:
+                    # the policy counts this first build as a rebuild
+                    self._canReusePreconditioner(shape)
+                self._preconditionerOperator = operator
+                # the operator refers to the matrix it was built from,
+                # which must outlive it
+                self._preconditionerMatrix = L if operator is not None else None
 
         output = Solver.Iterate(self.iterations, self.tolerance)
 
+        self._recordIterations(Solver.NumIters())
+
         if self.preconditioner is not None:
             if hasattr(self.preconditioner, 'Prec'):
                 del self.preconditioner.Prec
@@ -78,3 +131,10 @@ class TrilinosAztecOOSolver(TrilinosSolver):
             PRINT('AztecOO.AZ_Aztec_version:', status[AztecOO.AZ_Aztec_version])
 
         return output
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
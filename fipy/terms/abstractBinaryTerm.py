@@ -82,6 +82,11 @@ class _AbstractBinaryTerm(Term):
         self.term._checkVar(var)
         self.other._checkVar(var)
 
+    def reuseMatrix(self, reuse=True):
+        Term.reuseMatrix(self, reuse=reuse)
+        self.term.reuseMatrix(reuse=reuse)
+        self.other.reuseMatrix(reuse=reuse)
+
 
 from fipy.terms.nonDiffusionTerm import _NonDiffusionTerm
 class __NonDiffusionTerm(_NonDiffusionTerm):
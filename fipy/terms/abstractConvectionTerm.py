@@ -155,6 +155,13 @@ class _AbstractConvectionTerm(FaceTerm):
             if (coeffShape is ()) or (coeffShape[0] != var.mesh.dim):
                 raise VectorCoeffError
 
+    @property
+    def _matrixVariables(self):
+        matrixVariables = FaceTerm._matrixVariables.fget(self)
+        if matrixVariables is None or not hasattr(self, 'constraintL'):
+            return None
+        return matrixVariables + [self.constraintL]
+
     def _buildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
 
         var, L, b = FaceTerm._buildMatrix(self, var, SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
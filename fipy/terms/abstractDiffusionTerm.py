@@ -247,6 +247,12 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
         return coefficientMatrix, boundaryB
 
+    @property
+    def _matrixVariables(self):
+        if self.order != 2 or not hasattr(self, 'coeffDict') or not hasattr(self, 'constraintL'):
+            return None
+        return list(self.coeffDict.values()) + [self.constraintL]
+
     def _buildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
         """
         Test to ensure that a changing coefficient influences the boundary conditions.
@@ -87,6 +87,12 @@ class CellTerm(_NonDiffusionTerm):
 
         return self.coeffVectors
 
+    @property
+    def _matrixVariables(self):
+        if self.coeffVectors is None:
+            return None
+        return [self.coeffVectors['new value'], self.coeffVectors['diagonal']]
+
     def _buildMatrixInline_(self, L, oldArray, b, dt, coeffVectors):
         oldArray = oldArray.value.ravel()
         N = len(oldArray)
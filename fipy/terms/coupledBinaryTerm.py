@@ -55,44 +55,157 @@ class _CoupledBinaryTerm(_AbstractBinaryTerm):
     def _buildExplcitIfOther(self):
         return False
 
+    def _blocks(self, var):
+        """The non-zero (equation, variable) blocks of the coupled matrix
+
+        Returns a list, for each equation, of the indices of the solution
+        variables that its `Term` acts on. All other blocks are zero and
+        are not built.
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=3)
+        >>> v0 = CellVariable(mesh=m, name='v0')
+        >>> v1 = CellVariable(mesh=m, name='v1')
+        >>> v2 = CellVariable(mesh=m, name='v2')
+        >>> eq0 = TransientTerm(var=v0) == DiffusionTerm(var=v0) + ImplicitSourceTerm(var=v2)
+        >>> eq1 = TransientTerm(var=v1) == DiffusionTerm(var=v1)
+        >>> eq2 = TransientTerm(var=v2) == DiffusionTerm(var=v2) - ImplicitSourceTerm(var=v0)
+        >>> eq = eq0 & eq1 & eq2
+        >>> print(eq._blocks(eq._verifyVar(None)))
+        [[0, 2], [1], [0, 2]]
+
+        """
+        blocks = []
+        for uncoupledTerm in self._uncoupledTerms:
+            termVars = [id(tmpVar) for tmpVar in uncoupledTerm._vars]
+            if id(None) in termVars:
+                # a `Term` without a variable is built against every variable
+                blocks.append(list(range(len(var.vars))))
+            else:
+                blocks.append([varIndex for varIndex, tmpVar in enumerate(var.vars)
+                               if id(tmpVar) in termVars])
+
+        return blocks
+
+    def _coupledStructure(self, var, SparseMatrix, blocks):
+        """The pattern of the non-zero `blocks` of the coupled matrix, if
+        it is known in advance and `SparseMatrix` can be laid out on it
+        """
+        from fipy.matrices.sparseMatrix import _StencilStructure, _CoupledStructure
+
+        stencilShape = var.mesh._cellStencilShape
+        if stencilShape is None or SparseMatrix._structure is not None:
+            return None
+
+        structure = _CoupledStructure.forBlocks(_StencilStructure.forShape(stencilShape), blocks)
+        if SparseMatrix._withStructure(structure) is SparseMatrix:
+            return None
+
+        return structure
+
     def _buildAndAddMatrices(self, var, SparseMatrix,  boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None, buildExplicitIfOther=False):
         """Build matrices of constituent Terms and collect them
 
         Only called at top-level by `_prepareLinearSystem()`
 
+        Only the non-zero blocks, given by `_blocks()`, are built. Unless
+        the matrix of an equation is to be cached, each block is added
+        directly to the global matrix.
+
+        On a grid, the global matrix is allocated once on the pattern of
+        the non-zero blocks and each block is built on its own part of
+        that pattern, so that it is added by adding its values in place
+
+        >>> from fipy import *
+        >>> from fipy.solvers.scipy import LinearLUSolver
+        >>> from fipy.matrices.sparseMatrix import _StencilStructure
+        >>> m = Grid2D(nx=4, ny=3)
+        >>> v0 = CellVariable(mesh=m, value=m.x)
+        >>> v1 = CellVariable(mesh=m, value=m.y)
+        >>> v0.constrain(1., where=m.facesLeft)
+        >>> eq0 = TransientTerm(var=v0) == DiffusionTerm(var=v0) - ImplicitSourceTerm(coeff=2., var=v1)
+        >>> eq1 = TransientTerm(var=v1) == DiffusionTerm(coeff=3., var=v1)
+        >>> eq = eq0 & eq1
+        >>> solver = LinearLUSolver()
+        >>> var, matrix, RHSvector = eq._buildAndAddMatrices(eq._verifyVar(None),
+        ...                                                  solver._matrixClass, dt=1.)
+        >>> print(matrix._sharesStructure)
+        True
+        >>> print(matrix.matrix.nnz == 3 * _StencilStructure.forShape((4, 3)).nnz)
+        True
+        >>> A = matrix.numpyArray
+        >>> L0 = (eq._uncoupledTerms[0]._buildAndAddMatrices(v0, solver._matrixClass, dt=1.)[1]).numpyArray
+        >>> L1 = (eq._uncoupledTerms[1]._buildAndAddMatrices(v1, solver._matrixClass, dt=1.)[1]).numpyArray
+        >>> print(numerix.allclose(A[:12, :12], L0) and numerix.allclose(A[12:, 12:], L1))
+        True
+        >>> print(numerix.allclose(A[:12, 12:], 2 * numerix.identity(12)))
+        True
+        >>> print(numerix.allclose(A[12:, :12], 0))
+        True
         """
 
         from fipy.matrices.offsetSparseMatrix import OffsetSparseMatrix
-        SparseMatrix =  OffsetSparseMatrix(SparseMatrix=SparseMatrix,
-                                           numberOfVariables=len(self._vars),
-                                           numberOfEquations=len(self._uncoupledTerms))
-        matrix = SparseMatrix(mesh=var.mesh)
+
+        if buildExplicitIfOther:
+            # every variable contributes to the right hand side
+            blocks = [list(range(len(var.vars)))] * len(self._uncoupledTerms)
+        else:
+            blocks = self._blocks(var)
+
+        structure = self._coupledStructure(var, SparseMatrix, blocks)
+
+        def matrixClass(pattern=None):
+            if pattern is None:
+                MatrixClass = SparseMatrix
+            else:
+                MatrixClass = SparseMatrix._withStructure(pattern)
+            return OffsetSparseMatrix(SparseMatrix=MatrixClass,
+                                      numberOfVariables=len(self._vars),
+                                      numberOfEquations=len(self._uncoupledTerms))
+
+        GlobalMatrix = matrixClass(structure)
+        if structure is None:
+            BlockMatrix = GlobalMatrix
+
+        matrix = GlobalMatrix(mesh=var.mesh)
         RHSvectors = []
 
-        for equationIndex, uncoupledTerm in enumerate(self._uncoupledTerms):
+        for equationIndex, (uncoupledTerm, varIndices) in enumerate(zip(self._uncoupledTerms, blocks)):
 
-            SparseMatrix.equationIndex = equationIndex
+            GlobalMatrix.equationIndex = equationIndex
             termRHSvector = 0
-            termMatrix = SparseMatrix(mesh=var.mesh)
+            if uncoupledTerm._cacheMatrix:
+                termMatrix = GlobalMatrix(mesh=var.mesh)
+            else:
+                termMatrix = None
 
-            for varIndex, tmpVar in enumerate(var.vars):
+            for varIndex in varIndices:
+                tmpVar = var.vars[varIndex]
 
-                SparseMatrix.varIndex = varIndex
+                if structure is not None:
+                    # built on its own part of the global pattern
+                    BlockMatrix = matrixClass(structure._block(equationIndex, varIndex))
+                BlockMatrix.equationIndex = equationIndex
+                BlockMatrix.varIndex = varIndex
 
                 tmpVar, tmpMatrix, tmpRHSvector = uncoupledTerm._buildAndAddMatrices(tmpVar,
-                                                                                     SparseMatrix,
+                                                                                     BlockMatrix,
                                                                                      boundaryConditions=(),
                                                                                      dt=dt,
                                                                                      transientGeomCoeff=uncoupledTerm._getTransientGeomCoeff(tmpVar),
                                                                                      diffusionGeomCoeff=uncoupledTerm._getDiffusionGeomCoeff(tmpVar),
                                                                                      buildExplicitIfOther=buildExplicitIfOther)
 
-                termMatrix += tmpMatrix
+                if termMatrix is None:
+                    matrix += tmpMatrix
+                else:
+                    termMatrix += tmpMatrix
                 termRHSvector += tmpRHSvector
 
             uncoupledTerm._buildCache(termMatrix, termRHSvector)
             RHSvectors += [CellVariable(value=termRHSvector, mesh=var.mesh)]
-            matrix += termMatrix
+            if termMatrix is not None:
+                matrix += termMatrix
 
         return (var, matrix, _CoupledCellVariable(RHSvectors))
 
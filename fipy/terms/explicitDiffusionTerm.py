@@ -2,6 +2,7 @@ from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
 from fipy.terms.abstractDiffusionTerm import _AbstractDiffusionTerm
+from fipy.matrices.matrixFreeMatrix import _matrixFreeClassFor
 
 __all__ = ["ExplicitDiffusionTerm"]
 from future.utils import text_to_native_str
@@ -20,6 +21,19 @@ class ExplicitDiffusionTerm(_AbstractDiffusionTerm):
     variable. The term is added to the RHS vector and makes no contribution to
     the solution matrix.
 
+    The matrix of the old values is only ever multiplied by them, so it
+    is gathered and scattered over the faces without being assembled
+
+    >>> from fipy import *
+    >>> mesh = Grid2D(nx=3, ny=3)
+    >>> var = CellVariable(mesh=mesh, value=mesh.x * mesh.y, hasOld=True)
+    >>> explicit = ExplicitDiffusionTerm(coeff=2.)
+    >>> implicit = DiffusionTerm(coeff=2.)
+    >>> from fipy.solvers import _MeshMatrix
+    >>> L, b = implicit._buildMatrix(var, _MeshMatrix)[1:]
+    >>> bb = explicit._buildMatrix(var, _MeshMatrix)[2]
+    >>> print(numerix.allclose(bb, b - L * var.value))
+    True
     """
 
     def _buildMatrix(self, var, SparseMatrix, boundaryConditions = (), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
@@ -28,7 +42,12 @@ class ExplicitDiffusionTerm(_AbstractDiffusionTerm):
         else:
             varOld = var
 
-        varOld, L, b = _AbstractDiffusionTerm._buildMatrix(self, varOld, SparseMatrix, boundaryConditions = boundaryConditions, dt = dt,
+        if self.order == 2:
+            MatrixClass = _matrixFreeClassFor(SparseMatrix)
+        else:
+            MatrixClass = SparseMatrix
+
+        varOld, L, b = _AbstractDiffusionTerm._buildMatrix(self, varOld, MatrixClass, boundaryConditions = boundaryConditions, dt = dt,
                                                   transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
 
         return (var, SparseMatrix(mesh=var.mesh), b - L * var.value)
@@ -38,3 +57,10 @@ class ExplicitDiffusionTerm(_AbstractDiffusionTerm):
 
     def _treatMeshAsOrthogonal(self, mesh):
         return mesh._isOrthogonal
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
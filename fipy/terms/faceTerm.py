@@ -8,6 +8,7 @@ from fipy.terms.nonDiffusionTerm import _NonDiffusionTerm
 from fipy.tools import vector
 from fipy.tools import numerix
 from fipy.tools import inline
+from fipy.matrices.matrixFreeMatrix import _matrixFreeClassFor
 
 __all__ = ["FaceTerm"]
 from future.utils import text_to_native_str
@@ -34,6 +35,12 @@ class FaceTerm(_NonDiffusionTerm):
                                 'cell 2 offdiag': coeff * weight['cell 2 offdiag']}
         return self.coeffMatrix
 
+    @property
+    def _matrixVariables(self):
+        if self.coeffMatrix is None:
+            return None
+        return list(self.coeffMatrix.values())
+
     def _implicitBuildMatrix_(self, SparseMatrix, L, id1, id2, b, weight, var, boundaryConditions, interiorFaces, dt):
         mesh = var.mesh
         coeffMatrix = self._getCoeffMatrix_(var, weight)
@@ -72,6 +79,9 @@ class FaceTerm(_NonDiffusionTerm):
         N = mesh.numberOfCells
         M = mesh._maxFacesPerCell
 
+        # the boundary matrices are only applied to the old values
+        SparseMatrix = _matrixFreeClassFor(SparseMatrix)
+
         for boundaryCondition in boundaryConditions:
 
             LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffMatrix)
@@ -19,6 +19,11 @@ class Term(object):
     .. attention:: This class is abstract. Always create one of its subclasses.
     """
 
+    _matrixStructure = None
+    _reuseMatrix = False
+    _reusableMatrix = None
+    _matrixWatcher = None
+
     def __init__(self, coeff=1., var=None):
         """
         Create a `Term`.
@@ -102,6 +107,9 @@ class Term(object):
         else:
             SparseMatrix = solver._matrixClass
 
+        if self._matrixStructure is not None:
+            SparseMatrix = SparseMatrix._withStructure(self._matrixStructure)
+
         return SparseMatrix
 
     def _prepareLinearSystem(self, var, solver, boundaryConditions, dt):
@@ -121,6 +129,9 @@ class Term(object):
                 from fipy.viewers.matplotlibViewer.matplotlibSparseMatrixViewer import MatplotlibSparseMatrixViewer
                 Term._viewer = MatplotlibSparseMatrixViewer()
 
+        if self._matrixStructure is not None:
+            self._matrixStructure._beginBuild()
+
         var, matrix, RHSvector = self._buildAndAddMatrices(var,
                                                            self._getMatrixClass(solver, var),
                                                            boundaryConditions=boundaryConditions,
@@ -129,6 +140,9 @@ class Term(object):
                                                            diffusionGeomCoeff=self._getDiffusionGeomCoeff(var),
                                                            buildExplicitIfOther=self._buildExplcitIfOther)
 
+        if self._matrixStructure is not None:
+            self._matrixStructure._endBuild()
+
         self._buildCache(matrix, RHSvector)
 
         solver._storeMatrix(var=var, matrix=matrix, RHSvector=RHSvector)
@@ -355,6 +369,123 @@ class Term(object):
         """
         self._cacheMatrix = True
 
+    def freezeMatrixStructure(self):
+        r"""
+        Informs `solve()` and `sweep()` that the sparsity pattern of the
+        matrix does not change from one call to the next.
+
+        The first build records the pattern and later builds only write
+        the coefficient values into it, rather than deriving the pattern
+        anew. This is only of benefit when the `Term` is repeatedly solved
+        for the same variable on the same mesh. Matrix classes that do not
+        support reusing their structure (currently all but the SciPy
+        matrices) ignore this setting.
+
+        >>> from fipy import *
+        >>> m = Grid2D(nx=3, ny=3)
+        >>> v0 = CellVariable(mesh=m, hasOld=True)
+        >>> v0.constrain(1., where=m.facesLeft)
+        >>> v1 = CellVariable(mesh=m, hasOld=True)
+        >>> v1.constrain(1., where=m.facesLeft)
+        >>> D = Variable(1.)
+        >>> eq0 = TransientTerm(var=v0) == DiffusionTerm(coeff=D, var=v0) + ImplicitSourceTerm(coeff=-v0, var=v0)
+        >>> eq1 = TransientTerm(var=v1) == DiffusionTerm(coeff=D, var=v1) + ImplicitSourceTerm(coeff=-v1, var=v1)
+        >>> eq1.freezeMatrixStructure()
+        >>> for step in range(3):
+        ...     D.value = step + 1.
+        ...     v0.updateOld()
+        ...     v1.updateOld()
+        ...     eq0.solve(dt=1.)
+        ...     eq1.solve(dt=1.)
+        ...     print(numerix.allclose(v0, v1))
+        True
+        True
+        True
+        >>> print(eq1._matrixStructure.frozen)
+        True
+
+        Changing the constraints changes the sparsity pattern, which is
+        detected and the pattern recorded again
+
+        >>> v0.constrain(0., where=m.facesRight)
+        >>> v1.constrain(0., where=m.facesRight)
+        >>> for step in range(2):
+        ...     eq0.solve(dt=1.)
+        ...     eq1.solve(dt=1.)
+        ...     print(numerix.allclose(v0, v1))
+        True
+        True
+        """
+        from fipy.matrices.sparseMatrix import _SparseMatrixStructure
+        self._matrixStructure = _SparseMatrixStructure()
+
+    def thawMatrixStructure(self):
+        r"""
+        Informs `solve()` and `sweep()` to derive the sparsity pattern of
+        the matrix anew on each build (the default).
+        """
+        self._matrixStructure = None
+
+    def reuseMatrix(self, reuse=True):
+        r"""
+        Informs `solve()` and `sweep()` to reuse the matrix of each
+        constituent `Term` for as long as the coefficients it was built from
+        remain unchanged, building only the right hand side vector anew.
+
+        A coefficient is considered changed whenever any `Variable` it
+        depends on has been altered since the previous build.  The time
+        step, the boundary conditions and the solution variable must also
+        be the same as before.  Terms that need their matrix in order to
+        build the right hand side vector, e.g., explicit terms, are always
+        built in full.
+
+        >>> from fipy import *
+        >>> m = Grid2D(nx=3, ny=3)
+        >>> mask = FaceVariable(mesh=m, value=m.facesLeft)
+        >>> v0 = CellVariable(mesh=m, hasOld=True)
+        >>> v0.constrain(1., where=mask)
+        >>> v1 = CellVariable(mesh=m, hasOld=True)
+        >>> v1.constrain(1., where=mask)
+        >>> D = Variable(1.)
+        >>> eq0 = DiffusionTerm(coeff=D, var=v0) + ImplicitSourceTerm(coeff=-1., var=v0) - TransientTerm(var=v0)
+        >>> diff1 = DiffusionTerm(coeff=D, var=v1)
+        >>> eq1 = diff1 + ImplicitSourceTerm(coeff=-1., var=v1) - TransientTerm(var=v1)
+        >>> eq1.reuseMatrix()
+        >>> def step():
+        ...     v0.updateOld()
+        ...     v1.updateOld()
+        ...     eq0.solve(dt=1.)
+        ...     eq1.solve(dt=1.)
+        ...     print(numerix.allclose(v0, v1))
+        >>> step()
+        True
+        >>> L = diff1._reusableMatrix
+        >>> step()
+        True
+        >>> print(diff1._reusableMatrix is L)
+        True
+
+        The matrix is built again when the coefficient changes
+
+        >>> D.value = 2.
+        >>> step()
+        True
+        >>> print(diff1._reusableMatrix is L)
+        False
+
+        or when the constrained faces change
+
+        >>> L = diff1._reusableMatrix
+        >>> mask.value = m.facesLeft | m.facesRight
+        >>> step()
+        True
+        >>> print(diff1._reusableMatrix is L)
+        False
+        """
+        self._reuseMatrix = reuse
+        self._reusableMatrix = None
+        self._matrixWatcher = None
+
     @property
     def matrix(self):
         r"""
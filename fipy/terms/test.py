@@ -10,6 +10,7 @@ def _suite():
             'cellTerm',
             'abstractDiffusionTerm',
             'diffusionTerm',
+            'explicitDiffusionTerm',
             'term',
             'abstractConvectionTerm',
             'transientTerm',
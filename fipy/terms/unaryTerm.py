@@ -59,12 +59,12 @@ class _UnaryTerm(Term):
         """
 
         if var is self.var or self.var is None:
-            var, matrix, RHSvector = self._buildMatrix(var,
-                                                       SparseMatrix,
-                                                       boundaryConditions=boundaryConditions,
-                                                       dt=dt,
-                                                       transientGeomCoeff=transientGeomCoeff,
-                                                       diffusionGeomCoeff=diffusionGeomCoeff)
+            var, matrix, RHSvector = self._buildMatrixOrReuse(var,
+                                                              SparseMatrix,
+                                                              boundaryConditions=boundaryConditions,
+                                                              dt=dt,
+                                                              transientGeomCoeff=transientGeomCoeff,
+                                                              diffusionGeomCoeff=diffusionGeomCoeff)
         elif buildExplicitIfOther:
             _, matrix, RHSvector = self._buildMatrix(self.var,
                                                      SparseMatrix,
@@ -86,6 +86,88 @@ class _UnaryTerm(Term):
 
         return (var, matrix, RHSvector)
 
+    @property
+    def _matrixVariables(self):
+        """`Variable` objects that the matrix of this `Term` is built from
+
+        `None` if not known, in which case the matrix is never reused.
+        """
+        return None
+
+    def _reuseKey(self, var, SparseMatrix, boundaryConditions, dt):
+        if dt is not None:
+            dt = float(dt)
+        return ((var,) + tuple(boundaryConditions),
+                (dt,
+                 getattr(SparseMatrix, "equationIndex", 0),
+                 getattr(SparseMatrix, "varIndex", 0)))
+
+    def _canReuseMatrix(self, key):
+        if (not self._reuseMatrix
+            or self._reusableMatrix is None
+            or self._matrixWatcher.stale
+            or 'FIPY_DISPLAY_MATRIX' in os.environ):
+            return False
+
+        objects, values = self._reusableMatrixKey
+        return (len(objects) == len(key[0])
+                and all(a is b for a, b in zip(objects, key[0]))
+                and values == key[1])
+
+    def _buildMatrixOrReuse(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        """Build the matrix and right hand side vector of this `Term`
+
+        If `reuseMatrix()` is in effect and nothing that the matrix depends
+        on has changed since the last build, the previous matrix is
+        returned and only the right hand side vector is built.
+        """
+        from fipy.matrices.sparseMatrix import _UnassembledMatrix, _MatrixRequiredError
+
+        key = self._reuseKey(var, SparseMatrix, boundaryConditions, dt)
+
+        if self._canReuseMatrix(key):
+            applied = [bc.boundaryConditionApplied for bc in boundaryConditions]
+            try:
+                var, _, RHSvector = self._buildMatrix(var,
+                                                      _UnassembledMatrix,
+                                                      boundaryConditions=boundaryConditions,
+                                                      dt=dt,
+                                                      transientGeomCoeff=transientGeomCoeff,
+                                                      diffusionGeomCoeff=diffusionGeomCoeff)
+            except _MatrixRequiredError:
+                # the right hand side cannot be built without the matrix
+                for bc, wasApplied in zip(boundaryConditions, applied):
+                    bc.boundaryConditionApplied = wasApplied
+                self._reuseMatrix = False
+                self._reusableMatrix = None
+            else:
+                # evaluating the coefficients may have flagged them as changed
+                self._matrixWatcher._markFresh()
+                return (var, self._reusableMatrix.copy(), RHSvector)
+
+        var, matrix, RHSvector = self._buildMatrix(var,
+                                                   SparseMatrix,
+                                                   boundaryConditions=boundaryConditions,
+                                                   dt=dt,
+                                                   transientGeomCoeff=transientGeomCoeff,
+                                                   diffusionGeomCoeff=diffusionGeomCoeff)
+
+        matrixVariables = self._matrixVariables
+        if self._reuseMatrix and matrixVariables is not None:
+            from fipy.variables.variable import Variable
+            watcher = Variable()
+            for matrixVariable in matrixVariables:
+                if isinstance(matrixVariable, Variable):
+                    watcher._requires(matrixVariable)
+            watcher._markFresh()
+
+            self._matrixWatcher = watcher
+            self._reusableMatrixKey = key
+            self._reusableMatrix = matrix
+            matrix = matrix.copy()
+
+        return (var, matrix, RHSvector)
+
     def _reshapeIDs(self, var, ids):
         shape = (self._vectorSize(var), self._vectorSize(var), ids.shape[-1])
         ids = numerix.resize(ids, shape)
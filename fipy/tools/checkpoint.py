@@ -0,0 +1,440 @@
+"""Checkpoint and restart a simulation
+
+Unlike :mod:`fipy.tools.dump`, which pickles whole objects from processor 0,
+a checkpoint stores the raw arrays of each `CellVariable` (its value, its old
+value, and its constraints) in an uncompressed `.npz` file for each
+processor, along with a reference to the mesh, saved once by
+:func:`~fipy.meshes.meshCache.saveMesh`, and whatever stepper state is
+needed to resume, such as the elapsed time and the time step.
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+import hashlib
+import numbers
+import os
+import pickle
+import re
+import threading
+
+from fipy.tools import numerix
+from fipy.tools import parallelComm
+
+__all__ = ["Checkpointer", "read"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+def _checkpointFilename(filename, index):
+    """The file of checkpoint `index`
+
+    >>> print(_checkpointFilename("run.npz", 12))
+    run.000012.npz
+    >>> print(_checkpointFilename("run.npz", "mesh"))
+    run.mesh.npz
+    """
+    root, ext = os.path.splitext(filename)
+    if isinstance(index, numbers.Integral):
+        index = "%06d" % index
+    return "%s.%s%s" % (root, index, ext)
+
+def _checkpointIndices(filename, communicator):
+    """The indices of the checkpoints of this processor found on disk
+
+    >>> import os
+    >>> import shutil
+    >>> import tempfile
+    >>> from fipy.tools.comms.dummyComm import DummyComm
+    >>> dir = tempfile.mkdtemp()
+    >>> for name in ("run.000003.npz", "run.000001.npz", "run.mesh.npz",
+    ...              "run.000002.npz.1234.tmp", "other.000004.npz"):
+    ...     open(os.path.join(dir, name), 'w').close()
+    >>> print(_checkpointIndices(os.path.join(dir, "run.npz"), DummyComm()))
+    [1, 3]
+    >>> shutil.rmtree(dir)
+    """
+    from fipy.meshes.meshCache import _rankFilename
+
+    # no file name holds a NUL, so it marks where the index goes
+    prefix, suffix = _rankFilename(_checkpointFilename(os.path.basename(filename), "\0"),
+                                   communicator).split("\0")
+    pattern = re.compile(re.escape(prefix) + r"(\d{6})" + re.escape(suffix) + "$")
+    dirname = os.path.dirname(filename) or os.curdir
+    if not os.path.isdir(dirname):
+        return []
+    matches = [pattern.match(name) for name in os.listdir(dirname)]
+    return sorted(int(match.group(1)) for match in matches if match is not None)
+
+def _constraintsOf(var):
+    """The constraints of `var` and of its `faceGrad`"""
+    constraints = [("value", c) for c in var.constraints]
+    constraints += [("value", c) for c in getattr(var, "faceConstraints", [])]
+    if hasattr(var, "_faceGrad"):
+        constraints += [("faceGrad", c) for c in var._faceGrad.constraints]
+    return constraints
+
+def _numericValue(value):
+    return numerix.array(getattr(value, "numericValue", value))
+
+class Checkpointer(object):
+    """Periodically save `CellVariable` objects so a simulation can restart
+
+    >>> import os
+    >>> import shutil
+    >>> import tempfile
+    >>> from fipy import CellVariable, Grid1D, TransientTerm, DiffusionTerm
+    >>> m = Grid1D(nx=10)
+    >>> phi = CellVariable(mesh=m, name="phi", hasOld=True)
+    >>> phi.constrain(1., where=m.facesLeft)
+    >>> phi.faceGrad.constrain([0.5], where=m.facesRight)
+    >>> psi = CellVariable(mesh=m, name="psi", value=m.x, elementshape=(2,))
+    >>> eq = TransientTerm() == DiffusionTerm()
+
+    >>> dir = tempfile.mkdtemp()
+    >>> checkpoints = Checkpointer(os.path.join(dir, "run.npz"),
+    ...                            {"phi": phi, "psi": psi},
+    ...                            background=True)
+    >>> for step in range(3):
+    ...     phi.updateOld()
+    ...     eq.solve(var=phi, dt=1.)
+    ...     print(checkpoints.write(step=step, elapsed=step + 1.))
+    0
+    1
+    2
+    >>> checkpoints.wait()
+
+    Only the arrays that change are written again
+
+    >>> for index in range(3):
+    ...     members = checkpoints.members(index)
+    ...     print(" ".join(sorted(key for key in members if members[key] == index)))
+    ... # doctest: +NORMALIZE_WHITESPACE
+    phi phi.constraint0 phi.constraint0.where
+     phi.constraint1 phi.constraint1.where phi.old psi
+    phi phi.old
+    phi phi.old
+
+    The latest checkpoint is read by default
+
+    >>> variables, state = read(os.path.join(dir, "run.npz"))
+    >>> print(sorted(state.items()))
+    [('elapsed', 3.0), ('step', 2)]
+    >>> newPhi = variables["phi"]
+    >>> print(newPhi.name, numerix.allclose(newPhi, phi))
+    phi True
+    >>> print(numerix.allclose(newPhi.old, phi.old))
+    True
+    >>> print(numerix.allclose(variables["psi"], psi))
+    True
+
+    The constraints are restored, so the simulation continues as before
+
+    >>> print(numerix.allclose(newPhi.faceValue, phi.faceValue))
+    True
+    >>> for var in (phi, newPhi):
+    ...     var.updateOld()
+    ...     eq.solve(var=var, dt=1.)
+    >>> print(numerix.allclose(newPhi, phi))
+    True
+
+    An earlier checkpoint can be read instead
+
+    >>> variables, state = read(os.path.join(dir, "run.npz"), index=0)
+    >>> print(state["step"])
+    0
+
+    A simulation restarted from a checkpoint carries on numbering after
+    the checkpoints already written, and keeps the mesh file, from which
+    its own mesh is mapped, and the files that earlier checkpoints refer to
+
+    >>> variables, state = read(os.path.join(dir, "run.npz"))
+    >>> newPhi = variables["phi"]
+    >>> restarted = Checkpointer(os.path.join(dir, "run.npz"), variables)
+    >>> newPhi.updateOld()
+    >>> eq.solve(var=newPhi, dt=1.)
+    >>> print(restarted.write(step=3, elapsed=4.))
+    3
+    >>> print(numerix.allclose(newPhi.mesh.cellCenters, m.cellCenters))
+    True
+    >>> variables, state = read(os.path.join(dir, "run.npz"), index=2)
+    >>> print(numerix.allclose(variables["phi"], phi.old))
+    True
+
+    A different mesh can not be checkpointed under the same name
+
+    >>> other = CellVariable(mesh=Grid1D(nx=5))
+    >>> Checkpointer(os.path.join(dir, "run.npz"), {"phi": other}).write() # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+        ...
+    ValueError: '...run.npz' holds checkpoints of a different mesh
+
+    >>> del variables, newPhi, restarted
+    >>> shutil.rmtree(dir)
+
+    Parameters
+    ----------
+    filename : str
+        Name of the checkpoint files. Checkpoint `n` is written to
+        `filename` with `.n` (zero padded) inserted before the extension
+        and the mesh is written, once, with `.mesh` inserted.
+        Numbering starts after any checkpoints already written under
+        this name, whose files, like the mesh, are never rewritten.
+        In parallel, each processor writes its own files.
+    variables : dict
+        The `CellVariable` objects to save, all on the same mesh, by name
+    differential : bool
+        Whether to write only those arrays that have changed since the
+        last checkpoint. Arrays that have not changed are read from the
+        checkpoint they were last written to, so all checkpoint files
+        must be kept.
+    background : bool
+        Whether to write in a background thread, so that the time loop
+        only waits for the arrays to be copied.
+    """
+    def __init__(self, filename, variables, differential=True, background=False):
+        from fipy.variables.cellVariable import CellVariable
+
+        self.filename = filename
+        self.variables = dict(variables)
+        self.differential = differential
+        self.background = background
+
+        for name, var in self.variables.items():
+            if not isinstance(var, CellVariable):
+                raise TypeError("'%s' is not a CellVariable" % name)
+        meshes = set([id(var.mesh) for var in self.variables.values()])
+        if len(meshes) != 1:
+            raise ValueError("All checkpointed variables must be on the same mesh")
+
+        self.mesh = list(self.variables.values())[0].mesh
+        self.communicator = self.mesh.communicator
+
+        # resume after the checkpoints already written under this name,
+        # which later differential checkpoints may still refer to
+        indices = _checkpointIndices(self.filename, self.communicator)
+        self.index = int(self.communicator.MaxAll(indices[-1] + 1 if indices else 0))
+        self._meshSaved = False
+        self._digests = {}
+        self._members = {}
+        self._thread = None
+        self._error = None
+
+    def _snapshot(self):
+        """Copy every array to be saved, and describe how to restore them"""
+        arrays = {}
+        descriptions = {}
+        for name, var in self.variables.items():
+            arrays[name] = numerix.array(var.numericValue)
+            if var.old is not var:
+                arrays[name + ".old"] = numerix.array(var.old.numericValue)
+
+            constraints = []
+            for j, (kind, constraint) in enumerate(_constraintsOf(var)):
+                key = "%s.constraint%d" % (name, j)
+                arrays[key] = _numericValue(constraint.value)
+                if constraint.where is not None:
+                    arrays[key + ".where"] = _numericValue(constraint.where)
+                constraints.append((kind, key, constraint.where is not None))
+
+            unit = var.unit
+            if unit.isDimensionless():
+                unit = None
+
+            descriptions[name] = dict(name=var.name,
+                                      elementshape=var.shape[:-1],
+                                      unit=unit,
+                                      hasOld=(var.old is not var),
+                                      constraints=constraints)
+
+        return arrays, descriptions
+
+    def write(self, **state):
+        """Checkpoint the variables
+
+        Parameters
+        ----------
+        **state
+            Anything else needed to restart, such as the elapsed time,
+            the time step, or the step number
+
+        Returns
+        -------
+        int
+            The index of the checkpoint
+        """
+        self.wait()
+
+        if not self._meshSaved:
+            self._saveMesh()
+            self._meshSaved = True
+
+        arrays, descriptions = self._snapshot()
+        index = self.index
+        self.index += 1
+
+        if self.background:
+            self._thread = threading.Thread(target=self._save,
+                                            args=(index, arrays, descriptions, state))
+            self._thread.start()
+        else:
+            self._save(index, arrays, descriptions, state)
+            self._raise()
+
+        return index
+
+    def _saveMesh(self):
+        """Save the mesh, unless a checkpoint already saved it
+
+        The mesh file is never written again, as the variables of a
+        restarted simulation may still be mapped from it.
+        """
+        from fipy.meshes.meshCache import _rankFilename, loadMesh, saveMesh
+
+        filename = _checkpointFilename(self.filename, "mesh")
+        if os.path.exists(_rankFilename(filename, self.communicator)):
+            saved = loadMesh(filename, communicator=self.communicator)
+            same = (saved.cellCenters.shape == self.mesh.cellCenters.shape
+                    and numerix.allclose(saved.cellCenters, self.mesh.cellCenters))
+            if not self.communicator.all(numerix.array(same)):
+                raise ValueError("'%s' holds checkpoints of a different mesh" % self.filename)
+        else:
+            saveMesh(self.mesh, filename)
+
+    def _save(self, index, arrays, descriptions, state):
+        from fipy.meshes.meshCache import _rankFilename
+
+        try:
+            members = {}
+            written = {}
+            for key, array in arrays.items():
+                digest = (hashlib.sha1(numerix.ascontiguousarray(array).tobytes()).hexdigest(),
+                          array.dtype.str, array.shape)
+                if self.differential and self._digests.get(key, (None,))[0] == digest:
+                    members[key] = self._digests[key][1]
+                else:
+                    members[key] = index
+                    written[key] = array
+                    self._digests[key] = (digest, index)
+
+            header = dict(index=index,
+                          mesh=os.path.basename(_checkpointFilename(self.filename, "mesh")),
+                          variables=descriptions,
+                          members=members,
+                          state=state)
+            written["checkpoint"] = numerix.frombuffer(pickle.dumps(header, protocol=2),
+                                                       dtype=numerix.uint8)
+
+            # an open file keeps `savez` from appending `.npz`, and an
+            # exclusive one keeps an existing checkpoint from being rewritten
+            descriptor = os.open(_rankFilename(_checkpointFilename(self.filename, index),
+                                               self.communicator),
+                                 os.O_WRONLY | os.O_CREAT | os.O_EXCL
+                                 | getattr(os, "O_BINARY", 0))
+            with os.fdopen(descriptor, 'wb') as fileobj:
+                numerix.savez(fileobj, **written)
+
+            self._members[index] = members
+        except Exception as e:
+            self._error = e
+
+    def _raise(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def wait(self):
+        """Wait for a checkpoint being written in the background to finish
+        """
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._raise()
+
+    def members(self, index):
+        """The checkpoint that holds each array saved in checkpoint `index`
+        """
+        self.wait()
+        return self._members[index]
+
+def read(filename, index=None, communicator=parallelComm, constrain=True):
+    """Restart from a checkpoint written by a `Checkpointer`
+
+    Parameters
+    ----------
+    filename : str
+        Name of the checkpoint files given to the `Checkpointer`
+    index : int
+        Which checkpoint to read. The latest, by default.
+    communicator : ~fipy.tools.comms.commWrapper.CommWrapper
+        Generally, `fipy.tools.serialComm` or `fipy.tools.parallelComm`.
+        Must have as many processors as the checkpoint was written with.
+    constrain : bool
+        Whether to constrain the variables as they were
+
+    Returns
+    -------
+    variables : dict
+        New `CellVariable` objects, on a new mesh, by name
+    state : dict
+        The state passed to :meth:`Checkpointer.write`
+    """
+    from fipy.meshes.meshCache import _rankFilename, loadMesh
+    from fipy.variables.cellVariable import CellVariable
+
+    if index is None:
+        indices = _checkpointIndices(filename, communicator)
+        if len(indices) == 0:
+            raise IOError("No checkpoints found for '%s'" % filename)
+        index = indices[-1]
+
+    archives = {}
+
+    def archive(i):
+        if i not in archives:
+            archives[i] = numerix.load(_rankFilename(_checkpointFilename(filename, i),
+                                                     communicator))
+        return archives[i]
+
+    try:
+        header = pickle.loads(archive(index)["checkpoint"].tobytes())
+        members = header["members"]
+
+        def array(key):
+            return archive(members[key])[key]
+
+        mesh = loadMesh(os.path.join(os.path.dirname(filename), header["mesh"]),
+                        communicator=communicator)
+
+        variables = {}
+        for name, description in header["variables"].items():
+            var = CellVariable(mesh=mesh,
+                               name=description["name"],
+                               value=array(name),
+                               unit=description["unit"],
+                               elementshape=description["elementshape"],
+                               hasOld=description["hasOld"])
+            if description["hasOld"]:
+                var.old.value = array(name + ".old")
+
+            if constrain:
+                for kind, key, hasWhere in description["constraints"]:
+                    where = array(key + ".where") if hasWhere else None
+                    if kind == "faceGrad":
+                        var.faceGrad.constrain(array(key), where=where)
+                    else:
+                        var.constrain(array(key), where=where)
+
+            variables[name] = var
+    finally:
+        for npz in archives.values():
+            npz.close()
+
+    return variables, header["state"]
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -8,6 +8,7 @@ def _suite():
     theSuite = _LateImportDocTestSuite(docTestModuleNames = (
             'dimensions.physicalField',
             'numerix',
+            'checkpoint',
             'dump',
             'vector',
         ), base = __name__)
@@ -27,6 +27,17 @@ class _ArithmeticCellToFaceVariable(_CellToFaceVariable):
             return self._makeValue(value = val)
     else:
         def _calcValue_(self, alpha, id1, id2):
-            cell1 = numerix.take(self.var, id1, axis=-1)
-            cell2 = numerix.take(self.var, id2, axis=-1)
-            return (cell2 - cell1) * alpha + cell1
+            value = self.var.value
+            if (type(value) is type(alpha) is numerix.ndarray
+                and value.dtype == alpha.dtype == float):
+                # `cell2` is a new array, so the arithmetic can be done in place
+                cell1 = numerix.take(value, id1, axis=-1)
+                cell2 = numerix.take(value, id2, axis=-1)
+                cell2 -= cell1
+                cell2 *= alpha
+                cell2 += cell1
+                return cell2
+            else:
+                cell1 = numerix.take(self.var, id1, axis=-1)
+                cell2 = numerix.take(self.var, id2, axis=-1)
+                return (cell2 - cell1) * alpha + cell1
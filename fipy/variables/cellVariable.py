@@ -135,10 +135,17 @@ class CellVariable(_MeshVariable):
 
     def __call__(self, points=None, order=0, nearestCellIDs=None):
         r"""
-        Interpolates the `CellVariable` to a set of points using a
-        method that has a memory requirement on the order of `Ncells` by
-        `Npoints` in general, but uses only `Ncells` when the
-        `CellVariable`'s mesh is a `UniformGrid` object.
+        Interpolates the `CellVariable` to a set of points. The nearest
+        cells are found with a k-d tree of the cell centers that is built on
+        first use and kept by the mesh, or directly from the grid spacing
+        when the `CellVariable`'s mesh is a `UniformGrid` object.
+
+        On a `UniformGrid`, first order interpolation is (bi/tri)linear
+        between the centers of the cells around each point, taking the value
+        of the outermost cells beyond their centers. It only touches those
+        cells, so it costs the same for any size of mesh. On other meshes, or
+        if `nearestCellIDs` are given, first order interpolation extrapolates
+        from the nearest cell along the `grad` of the `CellVariable`.
 
         Tests
 
@@ -148,6 +155,9 @@ class CellVariable(_MeshVariable):
             >>> print(v(((0., 1.1, 1.2), (0., 1., 1.))))
             [ 0.5  1.5  1.5]
             >>> print(v(((0., 1.1, 1.2), (0., 1., 1.)), order=1))
+            [ 0.5  1.1  1.2]
+            >>> print(v(((0., 1.1, 1.2), (0., 1., 1.)), order=1,
+            ...         nearestCellIDs=m._getNearestCellID(((0., 1.1, 1.2), (0., 1., 1.)))))
             [ 0.25  1.1   1.2 ]
             >>> m0 = Grid2D(nx=2, ny=2, dx=1., dy=1.)
             >>> m1 = Grid2D(nx=4, ny=4, dx=.5, dy=.5)
@@ -157,8 +167,21 @@ class CellVariable(_MeshVariable):
             [ 0.25  0.25  0.75  0.75  0.25  0.25  0.75  0.75  0.75  0.75  2.25  2.25
               0.75  0.75  2.25  2.25]
             >>> print(v0(m1.cellCenters.globalValue, order=1))
-            [ 0.125  0.25   0.5    0.625  0.25   0.375  0.875  1.     0.5    0.875
-              1.875  2.25   0.625  1.     2.25   2.625]
+            [ 0.25    0.375   0.625   0.75    0.375   0.5625  0.9375  1.125   0.625
+              0.9375  1.5625  1.875   0.75    1.125   1.875   2.25  ]
+
+        Linear interpolation on a `UniformGrid` matches that on a
+        non-uniform mesh of the same cells, away from the outermost cells
+
+            >>> from fipy.meshes.nonUniformGrid3D import NonUniformGrid3D
+            >>> points = numerix.random.random((3, 1000)) * 2. + 1.
+            >>> for mesh in (Grid3D(nx=4, ny=4, nz=4),
+            ...              NonUniformGrid3D(nx=4, ny=4, nz=4)):
+            ...     x, y, z = mesh.cellCenters
+            ...     v = CellVariable(mesh=mesh, value=2 * x - y + 3 * z)
+            ...     print(numerix.allclose(v(points, order=1), 2 * points[0] - points[1] + 3 * points[2]))
+            True
+            True
 
         Parameters
         ----------
@@ -172,6 +195,11 @@ class CellVariable(_MeshVariable):
         """
         if points is not None:
 
+            if (order == 1 and nearestCellIDs is None
+                and hasattr(self.mesh, "_getInterpolationStencil")):
+                cellIDs, weights = self.mesh._getInterpolationStencil(points)
+                return (self.globalValue[..., cellIDs] * weights).sum(axis=-weights.ndim)
+
             if nearestCellIDs is None:
                 nearestCellIDs = self.mesh._getNearestCellID(points)
 
@@ -649,8 +677,19 @@ class CellVariable(_MeshVariable):
         """
 
 class _ReMeshedCellVariable(CellVariable):
+    """
+    A `CellVariable` with the values of `oldVar` at the nearest cells of
+    its old mesh
+
+        >>> from fipy import *
+        >>> m0 = Grid2D(dx=(.1, 1., 10.), dy=(.1, 1., 10.))
+        >>> v0 = CellVariable(mesh=m0, value=m0.cellCenters[0], name="x")
+        >>> m1 = Grid2D(nx=2, ny=2, dx=5., dy=5.) + ((0.,), (0.,))
+        >>> print(_ReMeshedCellVariable(v0, m1))
+        [ 0.6  6.1  0.6  6.1]
+    """
     def __init__(self, oldVar, newMesh):
-        newValues = oldVar.getValue(points = newMesh.cellCenters)
+        newValues = oldVar(points=newMesh.cellCenters.value)
         CellVariable.__init__(self, newMesh, name = oldVar.name, value = newValues, unit = oldVar.unit)
 
 def _test():
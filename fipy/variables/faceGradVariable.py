@@ -141,7 +141,18 @@ class _FaceGradVariable(FaceVariable):
         T1 = (t1grad1 + t1grad2) / 2.
         T2 = (t2grad1 + t2grad2) / 2.
 
-        return normals[s] * N[numerix.newaxis] + tangents1[s] * T1[numerix.newaxis] + tangents2[s] * T2[numerix.newaxis]
+        terms = ((normals[s], N[numerix.newaxis]),
+                 (tangents1[s], T1[numerix.newaxis]),
+                 (tangents2[s], T2[numerix.newaxis]))
+
+        if all(type(a) is numerix.ndarray and a.dtype == float for term in terms for a in term):
+            out = self._valueBuffer(numerix.broadcast(*terms[0]).shape, float)
+            value = numerix.multiply(*terms[0], out=out)
+            value += terms[1][0] * terms[1][1]
+            value += terms[2][0] * terms[2][1]
+            return value
+        else:
+            return normals[s] * N[numerix.newaxis] + tangents1[s] * T1[numerix.newaxis] + tangents2[s] * T2[numerix.newaxis]
 
 def _test():
     import fipy.tests.doctestPlus
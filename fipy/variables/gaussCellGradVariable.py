@@ -70,8 +70,16 @@ class _GaussCellGradVariable(CellVariable):
 
     def _calcValueNoInline(self, N, M, ids, orientations, volumes):
         contributions = numerix.take(self.faceGradientContributions, ids, axis=-1)
-        grad = numerix.array(numerix.sum(orientations * contributions, -2))
-        return grad / volumes
+        contributions = orientations * contributions
+        if (type(contributions) is type(volumes) is numerix.ndarray
+            and contributions.dtype == volumes.dtype == float):
+            # the sum is a new array, which can be divided in place
+            grad = numerix.sum(contributions, -2)
+            grad /= volumes
+            return grad
+        else:
+            grad = numerix.array(numerix.sum(contributions, -2))
+            return grad / volumes
 
     def _calcValue(self):
         if inline.doInline and self.var.rank == 0:
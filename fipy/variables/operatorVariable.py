@@ -1,3 +1,4 @@
+from __future__ import print_function
 from __future__ import unicode_literals
 from builtins import zip
 from builtins import str
@@ -51,12 +52,82 @@ def _OperatorVariableClass(baseClass=object):
                 from fipy.tools import inline
                 if inline.doInline:
                     return self._execInline(comment=self.comment)
+                elif self._fuse and (self._isCached()
+                                     or any(_canFuse(var) for var in self.var)):
+                    return self._calcValueFused()
                 else:
                     return self._calcValue_()
 
         def _calcValue_(self):
             pass
 
+        @property
+        def _fuse(self):
+            """Whether the result is large enough for fused evaluation to pay
+            for its overhead
+            """
+            if not hasattr(self, "_fuseCache"):
+                self._fuseCache = (self.opShape is not None
+                                   and numerix.prod(self.opShape) >= _fuseMinimumSize)
+            return self._fuseCache
+
+        @property
+        def _fusedCall(self):
+            """The `ufunc` and arguments that `op` is equivalent to
+
+            `None` if `op` is not a single element-wise `ufunc` of the
+            arguments.
+            """
+            if not hasattr(self, "_fusedCallCache"):
+                self._fusedCallCache = _traceUfunc(self.op, len(self.var))
+            return self._fusedCallCache
+
+        def _calcValueFused(self):
+            """Evaluate the tree of uncached operators below this one
+
+            Each `op` is applied as its `ufunc`, writing into a temporary
+            array of an operand, or into the previous value of a cached
+            result, wherever the shape and type allow, rather than
+            allocating a new array for every node of the tree.
+
+            Only results of at least `_fuseMinimumSize` elements are evaluated
+            this way.
+            """
+            ufunc, args = self._fusedCall
+            values = []
+            temporaries = []
+            for var in self.var:
+                if _canFuse(var):
+                    value = var._calcValueFused()
+                    var._setValueInternal(value=None)
+                    var._markFresh()
+                    if type(value) is numerix.ndarray:
+                        temporaries.append(value)
+                else:
+                    value = var.value
+                values.append(value)
+
+            values = [values[arg.index] if type(arg) is _Operand else arg for arg in args]
+
+            if ufunc is numerix.power:
+                ufunc, values = _fastPower(values)
+
+            out = None
+            if temporaries or self._isCached():
+                # type and shape of the result, without computing it
+                resultType = ufunc(*[value if numerix.ndim(value) == 0
+                                     else numerix.asarray(value).flat[:0]
+                                     for value in values]).dtype
+                resultShape = numerix.broadcast(*values).shape
+                out = self._valueBuffer(resultShape, resultType)
+                if out is None:
+                    for temporary in temporaries:
+                        if temporary.dtype == resultType and temporary.shape == resultShape:
+                            out = temporary
+                            break
+
+            return ufunc(*values, out=out)
+
         def _isCached(self):
             return (Variable._isCached(self)
                     or (len(self.subscribedVariables) > 1 and not self._cacheNever))
@@ -279,6 +350,160 @@ def _OperatorVariableClass(baseClass=object):
 
     return _OperatorVariable
 
+# below this many elements, allocating temporaries is cheaper than the
+# bookkeeping of fused evaluation
+_fuseMinimumSize = 2**12
+
+def _canFuse(var):
+    """Whether `var` can be evaluated as part of a fused operator tree
+
+    >>> from fipy import Grid1D, CellVariable, numerix
+    >>> m = Grid1D(nx=_fuseMinimumSize)
+    >>> phi = CellVariable(mesh=m, value=numerix.linspace(0., 1., m.numberOfCells))
+    >>> T = CellVariable(mesh=m, value=numerix.linspace(1., 4., m.numberOfCells))
+    >>> D = 2. * (1 - phi)**2 * numerix.exp(-1. / T)
+    >>> print(D._fuse)
+    True
+    >>> print(numerix.allequal(D, 2. * (1 - phi.value)**2 * numerix.exp(-1. / T.value)))
+    True
+    >>> phi.value = 0.25
+    >>> print(numerix.allequal(D, 2. * 0.75**2 * numerix.exp(-1. / T.value)))
+    True
+
+    A cached result is written into its previous value
+
+    >>> D.cacheMe()
+    >>> buffer = id(D.value)
+    >>> phi.value = 0.5
+    >>> print(numerix.allequal(D, 2. * 0.5**2 * numerix.exp(-1. / T.value)))
+    True
+    >>> print(id(D.value) == buffer)
+    True
+
+    Comparisons and integer division keep their result type
+
+    >>> n = CellVariable(mesh=m, value=1)
+    >>> print((n / (n + 1)).value.dtype == numerix.float64)
+    True
+    >>> print(((n + 1) < 3).value.dtype == numerix.bool_)
+    True
+    """
+    return (isinstance(var, Variable)
+            and hasattr(var, "_calcValueFused")
+            and var.canInline
+            and not var._isCached()
+            and len(var.constraints) == 0
+            and var._fusedCall is not None
+            and all(isinstance(v, Variable) for v in var.var))
+
+class _Operand(object):
+    """Stand-in for an argument of an operator, to find the `ufunc` it calls
+    """
+    def __init__(self, index):
+        self.index = index
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs or ufunc.nout != 1:
+            return NotImplemented
+        return _UfuncCall(ufunc, inputs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        return NotImplemented
+
+def _binaryOperand(ufunc, reflected=False):
+    if reflected:
+        return lambda self, other: _UfuncCall(ufunc, (other, self))
+    else:
+        return lambda self, other: _UfuncCall(ufunc, (self, other))
+
+for _name, _ufunc in (("add", numerix.add),
+                      ("sub", numerix.subtract),
+                      ("mul", numerix.multiply),
+                      ("div", numerix.divide),
+                      ("truediv", numerix.true_divide),
+                      ("floordiv", numerix.floor_divide),
+                      ("mod", numerix.remainder),
+                      ("pow", numerix.power)):
+    setattr(_Operand, "__%s__" % _name, _binaryOperand(_ufunc))
+    setattr(_Operand, "__r%s__" % _name, _binaryOperand(_ufunc, reflected=True))
+
+for _name, _ufunc in (("lt", numerix.less),
+                      ("le", numerix.less_equal),
+                      ("eq", numerix.equal),
+                      ("ne", numerix.not_equal),
+                      ("gt", numerix.greater),
+                      ("ge", numerix.greater_equal)):
+    setattr(_Operand, "__%s__" % _name, _binaryOperand(_ufunc))
+
+for _name, _ufunc in (("neg", numerix.negative),
+                      ("pos", numerix.positive),
+                      ("abs", numerix.absolute),
+                      ("invert", numerix.invert)):
+    setattr(_Operand, "__%s__" % _name, (lambda u: lambda self: _UfuncCall(u, (self,)))(_ufunc))
+
+class _UfuncCall(object):
+    __array_ufunc__ = None
+
+    def __init__(self, ufunc, args):
+        self.ufunc = ufunc
+        self.args = args
+
+def _fastPower(values):
+    """The `ufunc` that `ndarray.__pow__` uses for common scalar exponents
+
+        >>> print(_fastPower([numerix.arange(3.), 2])[0].__name__)
+        square
+        >>> print(_fastPower([numerix.arange(3), 0.5])[0].__name__)
+        power
+    """
+    base, exponent = values
+    if numerix.ndim(exponent) == 0 and numerix.ndim(base) > 0:
+        exponent = float(exponent)
+        if exponent == 2.:
+            return numerix.square, [base]
+        elif numerix.asarray(base).dtype.kind in "fc":
+            if exponent == 0.5:
+                return numerix.sqrt, [base]
+            elif exponent == -1.:
+                return numerix.reciprocal, [base]
+
+    return numerix.power, values
+
+def _traceUfunc(op, nargs):
+    """Find the single `ufunc` that `op` applies to its arguments
+
+    Returns the `ufunc` and its arguments, with `_Operand` objects
+    standing for the arguments of `op`, or `None`.
+
+        >>> call = _traceUfunc(lambda a, b: b / a, 2)
+        >>> print(call[0] in (numerix.divide, numerix.true_divide),
+        ...       [getattr(arg, "index", arg) for arg in call[1]])
+        True [1, 0]
+        >>> call = _traceUfunc(lambda a: pow(a, 2), 1)
+        >>> print(call[0].__name__, [getattr(arg, "index", arg) for arg in call[1]])
+        power [0, 2]
+        >>> print(_traceUfunc(numerix.exp, 1)[0].__name__)
+        exp
+        >>> print(_traceUfunc(lambda a: a[0], 1))
+        None
+        >>> print(_traceUfunc(lambda a: numerix.sum(a, axis=0), 1))
+        None
+        >>> print(_traceUfunc(lambda a: -(a * 2), 1))
+        None
+    """
+    operands = [_Operand(i) for i in range(nargs)]
+    try:
+        call = op(*operands)
+    except Exception:
+        return None
+
+    if (not isinstance(call, _UfuncCall)
+        or not all(type(arg) is _Operand or numerix.isscalar(arg)
+                   for arg in call.args)):
+        return None
+
+    return (call.ufunc, call.args)
+
 def _testBinOp(self):
     """
     Test of `_getRepresentation`
@@ -6,6 +6,7 @@ from future.utils import string_types
 __docformat__ = 'restructuredtext'
 
 import os
+import sys
 
 from fipy.tools.dimensions import physicalField
 from fipy.tools import numerix
@@ -799,6 +800,46 @@ class Variable(object):
     def _calcValueInline(self):
         raise NotImplementedError
 
+    def _valueBuffer(self, shape, dtype):
+        """The array of the current value, if the new value can be written into it
+
+        `_calcValue()` can write into this array, instead of allocating a
+        new one, when the value is cached, has the same shape and type as
+        the new value, and nothing but this `Variable` refers to it.
+
+            >>> from fipy import Grid1D, CellVariable
+            >>> v = CellVariable(mesh=Grid1D(nx=3), value=(0., 1., 4.))
+            >>> print(v.faceGrad)
+            [[ 0.  1.  3.  0.]]
+            >>> buffer = id(v.faceGrad._value)
+            >>> v.value = (4., 1., 0.)
+            >>> print(v.faceGrad)
+            [[ 0. -3. -1.  0.]]
+            >>> print(id(v.faceGrad._value) == buffer)
+            True
+
+        A value that is held elsewhere is left alone
+
+            >>> old = v.faceGrad.value
+            >>> v.value = (0., 1., 4.)
+            >>> print(v.faceGrad)
+            [[ 0.  1.  3.  0.]]
+            >>> print(old)
+            [[ 0. -3. -1.  0.]]
+        """
+        value = getattr(self, "_value", None)
+        if (type(value) is numerix.ndarray
+            and value.shape == shape
+            and value.dtype == dtype
+            and value.flags.writeable
+            and self._isCached()
+            and hasattr(sys, "getrefcount")
+            # referred to by `self`, `value` and the argument
+            and sys.getrefcount(value) == 3):
+            return value
+        else:
+            return None
+
     def _getSubscribedVariables(self):
         self._subscribedVariables = [sub for sub in self._subscribedVariables if sub() is not None]
 
@@ -19,10 +19,12 @@ except:
 from fipy.viewers.multiViewer import *
 from fipy.viewers.tsvViewer import *
 from fipy.viewers.vtkViewer import *
+from fipy.viewers.xdmfViewer import *
 
 __all__.extend(multiViewer.__all__)
 __all__.extend(tsvViewer.__all__)
 __all__.extend(vtkViewer.__all__)
+__all__.extend(xdmfViewer.__all__)
 
 # what about vector variables?
 
@@ -0,0 +1,101 @@
+"""Write files in a background thread, so a time loop need not wait for them
+"""
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+__all__ = ["BackgroundWriter"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class BackgroundWriter(object):
+    """Calls functions, in order, in a background thread
+
+    The functions are given snapshots of the data to write, so they must
+    not refer to anything that changes once they are submitted.
+
+    >>> written = []
+    >>> writer = BackgroundWriter(maxPending=2)
+    >>> for i in range(5):
+    ...     writer.submit(written.append, i)
+    >>> writer.wait()
+    >>> print(written)
+    [0, 1, 2, 3, 4]
+
+    Errors in the background are raised by the next call
+
+    >>> def fail(message):
+    ...     raise ValueError(message)
+    >>> writer.submit(fail, "cannot write")
+    >>> writer.wait()
+    Traceback (most recent call last):
+    ...
+    ValueError: cannot write
+
+    Parameters
+    ----------
+    maxPending : int
+        How many functions may wait to be called. Once this many are
+        waiting, `submit` blocks until the oldest is called, so a
+        simulation cannot get arbitrarily far ahead of its output.
+    """
+    def __init__(self, maxPending=2):
+        self._queue = queue.Queue(maxsize=maxPending)
+        self._lock = threading.Lock()
+        self._running = False
+        self._errors = []
+
+    def _run(self):
+        while True:
+            with self._lock:
+                try:
+                    function, args = self._queue.get_nowait()
+                except queue.Empty:
+                    # the thread stops when idle, so it never keeps the
+                    # interpreter from exiting
+                    self._running = False
+                    return
+            try:
+                function(*args)
+            except Exception as e:
+                self._errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def _raise(self):
+        if len(self._errors) > 0:
+            error = self._errors[0]
+            del self._errors[:]
+            raise error
+
+    def submit(self, function, *args):
+        """Call `function(*args)` in the background
+
+        Blocks while `maxPending` calls are already waiting.
+        """
+        self._raise()
+        self._queue.put((function, args))
+        with self._lock:
+            if not self._running:
+                self._running = True
+                threading.Thread(target=self._run).start()
+
+    def wait(self):
+        """Wait for every submitted call to finish
+        """
+        self._queue.join()
+        self._raise()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
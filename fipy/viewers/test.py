@@ -12,7 +12,9 @@ def _suite():
     return _LateImportDocTestSuite(testModuleNames = (
         'vtkViewer.test',),
                                    docTestModuleNames = (
+        'backgroundWriter',
         'tsvViewer',
+        'xdmfViewer',
         ), base = __name__)
 
 if __name__ == '__main__':
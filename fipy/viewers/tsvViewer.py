@@ -31,7 +31,7 @@ class TSVViewer(AbstractViewer):
     """
     _axis = ["x", "y", "z"]
 
-    def __init__(self, vars, title=None, limits={}, **kwlimits):
+    def __init__(self, vars, title=None, limits={}, background=False, maxPending=2, **kwlimits):
         """
         Creates a `TSVViewer`.
 
@@ -51,6 +51,13 @@ class TSVViewer(AbstractViewer):
             displayed at the top of the `Viewer` window
         limits : dict, optional
             a (deprecated) alternative to limit keyword arguments
+        background : bool, optional
+            whether to write files in a background thread. :meth:`plot`
+            then only gathers the values and returns; call :meth:`wait`
+            before reading the files.
+        maxPending : int, optional
+            how many files may wait to be written in the background before
+            :meth:`plot` waits, too
         float xmin, xmax, ymin, ymax, zmin, zmax, datamin, datamax : float, optional
             displayed range of data. Any limit set to
             a (default) value of `None` will autoscale.
@@ -63,16 +70,21 @@ class TSVViewer(AbstractViewer):
         for var in self.vars:
             assert mesh is var.mesh
 
+        if background:
+            from fipy.viewers.backgroundWriter import BackgroundWriter
+            self._writer = BackgroundWriter(maxPending=maxPending)
 
-    def _plot(self, values, f, dim):
+
+    @staticmethod
+    def _plot(values, f, dim, limits):
         for index in range(values.shape[-1]):
             lineValues = values[..., index]
 
             # omit any elements whose cell centers lie outside of the specified limits
             skip = False
             for axis in range(dim):
-                mini = self._getLimit("%smin" % self._axis[axis])
-                maxi = self._getLimit("%smax" % self._axis[axis])
+                mini = limits.get("%smin" % TSVViewer._axis[axis])
+                maxi = limits.get("%smax" % TSVViewer._axis[axis])
 
                 if (mini and lineValues[axis] < mini) or (maxi and lineValues[axis] > maxi):
                     skip = True
@@ -83,8 +95,8 @@ class TSVViewer(AbstractViewer):
 
             # replace any values that lie outside of the specified datalimits with 'nan'
             for valIndex in range(dim, len(lineValues)):
-                mini = self._getLimit("datamin")
-                maxi = self._getLimit("datamax")
+                mini = limits.get("datamin")
+                maxi = limits.get("datamax")
 
                 if (mini and lineValues[valIndex] < mini) or (maxi and lineValues[valIndex] > maxi):
                     lineValues[valIndex] = float("NaN")
@@ -119,6 +131,27 @@ class TSVViewer(AbstractViewer):
         0.05    0.45    -2      35      -3.33333333333333
         0.15    0.45    5       35      5
 
+        Files can be written in the background, from a snapshot of the
+        values at the time of the call
+
+        >>> import os
+        >>> import tempfile
+        >>> f, name = tempfile.mkstemp(".tsv")
+        >>> os.close(f)
+        >>> viewer = TSVViewer(vars=v, background=True)
+        >>> viewer.plot(name)
+        >>> v.value = 0.
+        >>> viewer.wait()
+        >>> with open(name) as f:
+        ...     print(f.read()) #doctest: +NORMALIZE_WHITESPACE, +PROCESSOR_0
+        var
+        x       y       var
+        0.05    0.15    0
+        0.15    0.15    2
+        0.05    0.45    -2
+        0.15    0.45    5
+        >>> os.remove(name)
+
         Parameters
         ----------
         filename : str
@@ -128,23 +161,6 @@ class TSVViewer(AbstractViewer):
         mesh = self.vars[0].mesh
         dim = mesh.dim
 
-        if filename is not None:
-            import os
-            if mesh.communicator.procID == 0:
-                if os.path.splitext(filename)[1] == ".gz":
-                    import gzip
-                    f = gzip.GzipFile(filename = filename, mode = 'w', fileobj = None)
-                else:
-                    f = open(filename, "w")
-            else:
-                f = open(os.devnull, mode='w')
-        else:
-            f = sys.stdout
-
-        if self.title and len(self.title) > 0:
-            f.write(self.title)
-            f.write("\n")
-
         headings = []
         for index in range(dim):
             headings.extend(self._axis[index])
@@ -157,12 +173,11 @@ class TSVViewer(AbstractViewer):
             else:
                 headings.extend([name])
 
-        f.write("\t".join(headings))
-        f.write("\n")
-
         cellVars = [var for var in self.vars if isinstance(var, CellVariable)]
         faceVars = [var for var in self.vars if isinstance(var, FaceVariable)]
 
+        # gathering is collective, so every processor takes part
+        blocks = []
         if len(cellVars) > 0:
             values = mesh.cellCenters.globalValue
             for var in self.vars:
@@ -171,7 +186,7 @@ class TSVViewer(AbstractViewer):
                 else:
                     values = numerix.concatenate((values, (numerix.array(var.globalValue),)))
 
-            self._plot(values, f, dim)
+            blocks.append(values)
 
         if len(faceVars) > 0:
             values = mesh.faceCenters.globalValue
@@ -181,9 +196,39 @@ class TSVViewer(AbstractViewer):
                 else:
                     values = numerix.concatenate((values, (numerix.array(var.globalValue),)))
 
-            self._plot(values, f, dim)
+            blocks.append(values)
+
+        # `values` are new arrays, so they can be written while the
+        # variables change
+        if filename is None:
+            self._writeTo(sys.stdout, self.title, headings, blocks, dim, dict(self.limits))
+        elif mesh.communicator.procID == 0:
+            self._write(self._writeFile, filename, self.title, headings, blocks, dim, dict(self.limits))
+
+    @staticmethod
+    def _writeTo(f, title, headings, blocks, dim, limits):
+        if title and len(title) > 0:
+            f.write(title)
+            f.write("\n")
+
+        f.write("\t".join(headings))
+        f.write("\n")
+
+        for values in blocks:
+            TSVViewer._plot(values, f, dim, limits)
+
+    @staticmethod
+    def _writeFile(filename, title, headings, blocks, dim, limits):
+        import os
+        if os.path.splitext(filename)[1] == ".gz":
+            import gzip
+            f = gzip.GzipFile(filename = filename, mode = 'wt', fileobj = None)
+        else:
+            f = open(filename, "w")
 
-        if f is not sys.stdout:
+        try:
+            TSVViewer._writeTo(f, title, headings, blocks, dim, limits)
+        finally:
             f.close()
 
 def _test():
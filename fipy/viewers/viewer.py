@@ -41,6 +41,8 @@ class AbstractViewer(object):
 
         self.title = title
 
+        self._writer = None
+
     def _getSuitableVars(self, vars):
         if type(vars) not in [type([]), type(())]:
             vars = [vars]
@@ -101,6 +103,21 @@ class AbstractViewer(object):
 
         raise NotImplementedError
 
+    def _write(self, function, *args):
+        """Call `function(*args)`, in the background if this viewer writes there
+        """
+        if self._writer is None:
+            function(*args)
+        else:
+            self._writer.submit(function, *args)
+
+    def wait(self):
+        """
+        Wait for any files still being written in the background.
+        """
+        if self._writer is not None:
+            self._writer.wait()
+
     def plotMesh(self, filename=None):
         """
         Display a representation of the mesh
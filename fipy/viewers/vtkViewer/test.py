@@ -10,7 +10,8 @@ import fipy.tests.testProgram
 def _suite():
     return _LateImportDocTestSuite(docTestModuleNames=(
         'vtkCellViewer',
-        'vtkFaceViewer'
+        'vtkFaceViewer',
+        'vtuViewer'
         ), base = __name__)
 
 if __name__ == '__main__':
@@ -26,7 +26,7 @@ register_skipper(flag="TVTK",
 class VTKViewer(AbstractViewer):
     """Renders `_MeshVariable` data in VTK format
     """
-    def __init__(self, vars, title=None, limits={}, **kwlimits):
+    def __init__(self, vars, title=None, limits={}, background=False, maxPending=2, **kwlimits):
         """Creates a `VTKViewer`
 
         Parameters
@@ -37,6 +37,13 @@ class VTKViewer(AbstractViewer):
             displayed at the top of the `Viewer` window
         limits : dict, optional
             a (deprecated) alternative to limit keyword arguments
+        background : bool, optional
+            whether to write files in a background thread. :meth:`plot`
+            then only copies the values and returns; call :meth:`wait`
+            before reading the files.
+        maxPending : int, optional
+            how many files may wait to be written in the background before
+            :meth:`plot` waits, too
         float xmin, xmax, ymin, ymax, zmin, zmax, datamin, datamax : float, optional
             displayed range of data. Any limit set to
             a (default) value of `None` will autoscale.
@@ -63,6 +70,10 @@ class VTKViewer(AbstractViewer):
             else:
                 data.set_active_tensors(name)
 
+        if background:
+            from fipy.viewers.backgroundWriter import BackgroundWriter
+            self._writer = BackgroundWriter(maxPending=maxPending)
+
     def _makeDataSet(self, mesh):
         pass
 
@@ -75,15 +86,23 @@ class VTKViewer(AbstractViewer):
         return (name, rank, value)
 
     def plot(self, filename=None):
-        data = self._data
-
         from fipy.tools import numerix
 
+        values = []
         for var in self.vars:
             name, rank, value = self._nameRankValue(var)
 
             if not (numerix.array(value.shape) == 0).any():
-                data.get_array(name).to_array()[:] = value
+                # a copy, so it can be written while `var` changes
+                values.append((name, numerix.array(value)))
+
+        self._write(self._writeData, values, filename)
+
+    def _writeData(self, values, filename):
+        data = self._data
+
+        for name, value in values:
+            data.get_array(name).to_array()[:] = value
 
         try:
             from tvtk.misc import write_data
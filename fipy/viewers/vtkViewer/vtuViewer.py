@@ -0,0 +1,420 @@
+"""Write `CellVariable` data to VTK XML files, without `tvtk`
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import os
+import re
+import zlib
+from xml.sax.saxutils import quoteattr
+
+from fipy.tools import numerix
+from fipy.viewers.viewer import AbstractViewer
+
+__all__ = ["VTUViewer"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+# uncompressed size of each zlib block, as VTK writes them
+_blockSize = 2**15
+
+def _VTKType(dtype):
+    """The name VTK gives to arrays of `dtype`
+
+    >>> print(_VTKType(numerix.dtype("float64")))
+    Float64
+    >>> print(_VTKType(numerix.dtype("uint8")))
+    UInt8
+    """
+    kind = {"f": "Float", "i": "Int", "u": "UInt"}[dtype.kind]
+    return "%s%d" % (kind, 8 * dtype.itemsize)
+
+def _asVTKArray(value):
+    """`value` as a contiguous, little-endian array that VTK can read"""
+    value = numerix.asarray(value)
+    if value.dtype.kind == "b":
+        value = value.astype("uint8")
+    return numerix.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+
+def _encode(value, compress):
+    """The bytes of `value` in a `raw` VTK appended data block
+
+    Each block starts with a `UInt64` header giving its size or, if
+    `compress`, the sizes of its zlib compressed parts.
+
+    >>> data = numerix.arange(5, dtype="int64")
+    >>> block = _encode(data, compress=False)
+    >>> print([int(n) for n in numerix.frombuffer(block[:8], dtype="<u8")])
+    [40]
+    >>> print(numerix.allclose(_decode(block, "Int64", compress=False)[0], data))
+    True
+    >>> block = _encode(data, compress=True)
+    >>> print([int(n) for n in numerix.frombuffer(block[:24], dtype="<u8")])
+    [1, 32768, 40]
+    >>> print(numerix.allclose(_decode(block, "Int64", compress=True)[0], data))
+    True
+    """
+    data = _asVTKArray(value).tobytes()
+    if not compress:
+        return numerix.array([len(data)], dtype="<u8").tobytes() + data
+
+    parts = [zlib.compress(data[start:start + _blockSize])
+             for start in range(0, len(data), _blockSize)]
+    lastSize = len(data) - (len(parts) - 1) * _blockSize if parts else 0
+    header = [len(parts), _blockSize, lastSize] + [len(part) for part in parts]
+    return numerix.array(header, dtype="<u8").tobytes() + b"".join(parts)
+
+def _decode(data, VTKType, compress, offset=0):
+    """The array in the `raw` VTK appended data block at `offset`
+
+    Returns
+    -------
+    value : ~numpy.ndarray
+        The flattened contents of the block
+    end : int
+        Where the next block starts
+    """
+    kind, bits = re.match(r"([A-Za-z]+)([0-9]+)$", VTKType).groups()
+    dtype = numerix.dtype("<%s%d" % ({"Float": "f", "Int": "i", "UInt": "u"}[kind], int(bits) // 8))
+    if compress:
+        count = int(numerix.frombuffer(data, dtype="<u8", count=1, offset=offset)[0])
+        header = numerix.frombuffer(data, dtype="<u8", count=3 + count, offset=offset)
+        start = offset + 8 * (3 + count)
+        parts = []
+        for size in header[3:]:
+            parts.append(zlib.decompress(data[start:start + int(size)]))
+            start += int(size)
+        return numerix.frombuffer(b"".join(parts), dtype=dtype), start
+    else:
+        size = int(numerix.frombuffer(data, dtype="<u8", count=1, offset=offset)[0])
+        start = offset + 8
+        return numerix.frombuffer(data[start:start + size], dtype=dtype), start + size
+
+def _readVTU(filename):
+    """The arrays of a `.vtu` file written by `VTUViewer`, by name
+
+    Points, connectivity, offsets, and types are named as in the file.
+    """
+    from xml.etree import ElementTree
+
+    with open(filename, "rb") as f:
+        contents = f.read()
+
+    # the appended data is not XML
+    start = contents.index(b"<AppendedData")
+    start = contents.index(b"_", start) + 1
+    end = contents.rindex(b"</AppendedData>")
+    appended = contents[start:end]
+    root = ElementTree.fromstring(contents[:start - 1] + b"</AppendedData></VTKFile>")
+
+    compress = root.get("compressor") is not None
+
+    arrays = {}
+    for element in root.iter("DataArray"):
+        value, _ = _decode(appended, element.get("type"), compress,
+                           offset=int(element.get("offset")))
+        components = int(element.get("NumberOfComponents", "1"))
+        if components > 1:
+            value = value.reshape((-1, components))
+        arrays[element.get("Name")] = value
+
+    return arrays
+
+class _Piece(object):
+    """The geometry of the cells of one processor, encoded once"""
+    def __init__(self, mesh, compress):
+        cellIDs = mesh._localNonOverlappingCellIDs
+
+        vertexIDs = mesh._orderedCellVertexIDs[..., cellIDs]
+        if isinstance(vertexIDs, numerix.ma.masked_array):
+            counts = vertexIDs.count(axis=0)
+            connectivity = vertexIDs.swapaxes(0, 1).compressed()
+        else:
+            counts = numerix.zeros((len(cellIDs),), dtype="int64") + vertexIDs.shape[0]
+            connectivity = vertexIDs.swapaxes(0, 1).flatten()
+
+        points = mesh._toVTK3D(numerix.array(mesh.vertexCoords, dtype=float))
+        types = numerix.zeros((len(cellIDs),), dtype="uint8") + mesh._VTKCellType
+
+        self.cellIDs = cellIDs
+        self.numberOfPoints = points.shape[0]
+        self.numberOfCells = len(cellIDs)
+
+        self.arrays = []
+        self.blocks = []
+        for name, value, components in (("Points", points, 3),
+                                        ("connectivity", connectivity.astype("int64"), 1),
+                                        ("offsets", numerix.cumsum(counts).astype("int64"), 1),
+                                        ("types", types, 1)):
+            self.arrays.append((name, _VTKType(_asVTKArray(value).dtype), components))
+            self.blocks.append(_encode(value, compress))
+
+class VTUViewer(AbstractViewer):
+    """Writes `CellVariable` data to VTK XML unstructured grid files
+
+    Unlike :class:`~fipy.viewers.vtkViewer.VTKCellViewer`, this viewer does
+    not need `tvtk`. Arrays are written as raw binary, optionally zlib
+    compressed, data appended to the file. The mesh is encoded only once;
+    each call to :meth:`plot` encodes just the values of the variables.
+
+    >>> import os
+    >>> import shutil
+    >>> import tempfile
+    >>> from fipy import CellVariable, Grid2D, Tri2D, numerix
+    >>> dir = tempfile.mkdtemp()
+
+    >>> m = Grid2D(nx=3, ny=2)
+    >>> x, y = m.cellCenters
+    >>> v1 = CellVariable(mesh=m, value=x * y, name="x*y")
+    >>> v2 = CellVariable(mesh=m, value=x > 1, name="x>1")
+    >>> viewer = VTUViewer(vars=(v1, v2, v1.grad), compress=True)
+    >>> viewer.plot(os.path.join(dir, "grid.vtu"))
+
+    >>> arrays = _readVTU(os.path.join(dir, "grid.vtu")) # doctest: +SERIAL
+    >>> print(arrays["Points"].shape) # doctest: +SERIAL
+    (12, 3)
+    >>> print(arrays["offsets"].tolist()) # doctest: +SERIAL
+    [4, 8, 12, 16, 20, 24]
+    >>> print(numerix.allclose(arrays["x*y"], v1)) # doctest: +SERIAL
+    True
+    >>> print(arrays["x>1"].tolist()) # doctest: +SERIAL
+    [0, 1, 1, 0, 1, 1]
+    >>> print(numerix.allclose(arrays["x*y_gauss_grad"][..., :2],
+    ...                        v1.grad.value.swapaxes(0, 1))) # doctest: +SERIAL
+    True
+
+    A time series is recorded in a `.pvd` file, which refers to each of
+    the files that are plotted
+
+    >>> m = Tri2D(nx=2, ny=1)
+    >>> phi = CellVariable(mesh=m, name="phi")
+    >>> viewer = VTUViewer(vars=phi, timeSeries=os.path.join(dir, "phi.pvd"),
+    ...                    background=True)
+    >>> for step in range(3):
+    ...     phi.value = step
+    ...     viewer.plot(os.path.join(dir, "phi.%d.vtu" % step), time=step / 10.)
+    >>> viewer.wait()
+    >>> with open(os.path.join(dir, "phi.pvd")) as f:
+    ...     print(f.read()) # doctest: +PROCESSOR_0, +SERIAL
+    <?xml version="1.0"?>
+    <VTKFile type="Collection" version="0.1" byte_order="LittleEndian">
+      <Collection>
+        <DataSet timestep="0" group="" part="0" file="phi.0.vtu"/>
+        <DataSet timestep="0.1" group="" part="0" file="phi.1.vtu"/>
+        <DataSet timestep="0.2" group="" part="0" file="phi.2.vtu"/>
+      </Collection>
+    </VTKFile>
+    <BLANKLINE>
+    >>> print(_readVTU(os.path.join(dir, "phi.1.vtu"))["phi"].tolist()) # doctest: +SERIAL
+    [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
+    >>> print(_readVTU(os.path.join(dir, "phi.1.vtu"))["types"].tolist()) # doctest: +SERIAL
+    [7, 7, 7, 7, 7, 7, 7, 7]
+
+    >>> shutil.rmtree(dir)
+
+    In parallel, each processor writes the cells it owns to its own
+    `.vtu` file, with the processor number inserted before the extension,
+    and processor 0 writes a `.pvtu` file, with the name given to
+    :meth:`plot`, that gathers them.
+    """
+    def __init__(self, vars, title=None, limits={}, compress=False, timeSeries=None,
+                 background=False, maxPending=2, **kwlimits):
+        """Creates a `VTUViewer`
+
+        Parameters
+        ----------
+        vars : ~fipy.variables.cellVariable.CellVariable or list
+            the `CellVariable` objects to write, all on the same mesh.
+        title : str, optional
+            not used
+        limits : dict, optional
+            not used
+        compress : bool, optional
+            whether to compress the arrays with zlib
+        timeSeries : str, optional
+            name of a `.pvd` file listing the files written by
+            :meth:`plot`, with their times
+        background : bool, optional
+            whether to encode and write files in a background thread.
+            :meth:`plot` then only copies the values and returns; call
+            :meth:`wait` before reading the files.
+        maxPending : int, optional
+            how many files may wait to be written in the background before
+            :meth:`plot` waits, too
+        float xmin, xmax, ymin, ymax, zmin, zmax, datamin, datamax : float, optional
+            not used
+        """
+        kwlimits.update(limits)
+        AbstractViewer.__init__(self, vars=vars, title=title, **kwlimits)
+
+        self.mesh = self.vars[0].mesh
+        self.compress = compress
+        self.timeSeries = timeSeries
+        self._times = []
+        self._piece = None
+
+        if background:
+            from fipy.viewers.backgroundWriter import BackgroundWriter
+            self._writer = BackgroundWriter(maxPending=maxPending)
+
+    def _getSuitableVars(self, vars):
+        from fipy.variables.cellVariable import CellVariable
+
+        if type(vars) not in [type([]), type(())]:
+            vars = [vars]
+        vars = [var for var in vars if isinstance(var, CellVariable)]
+        if len(vars) == 0:
+            raise TypeError("%s can only display %s" % (self.__class__.__name__, CellVariable.__name__))
+        vars = [var for var in vars if var.mesh == vars[0].mesh]
+        return vars
+
+    def _nameComponentsValue(self, var):
+        name = var.name or "%s #%d" % (var.__class__.__name__, id(var))
+        value = numerix.array(var.numericValue)[..., self._piece.cellIDs]
+        if var.rank == 1 and value.shape[0] == self.mesh.dim:
+            # VTK vectors have three components
+            value = self.mesh._toVTK3D(value)
+        else:
+            value = value.reshape((-1, value.shape[-1])).swapaxes(0, 1)
+        if value.dtype.kind == "b":
+            value = value.astype("uint8")
+        components = value.shape[-1] if value.ndim > 1 else 1
+        if components == 1:
+            value = value.reshape((-1,))
+
+        return name, components, value
+
+    def plot(self, filename=None, time=None):
+        """Write the variables to `filename`
+
+        Parameters
+        ----------
+        filename : str
+            name of the `.vtu` (or, in parallel, `.pvtu`) file to write.
+        time : float, optional
+            time to record for this file in the `timeSeries`. By default,
+            the number of files written before.
+        """
+        if filename is None:
+            raise ValueError("%s can only write to a file" % self.__class__.__name__)
+
+        if self._piece is None:
+            self._piece = _Piece(self.mesh, self.compress)
+
+        # new arrays, so they can be written while the variables change
+        values = [self._nameComponentsValue(var) for var in self.vars]
+
+        communicator = self.mesh.communicator
+        if communicator.Nproc > 1:
+            root, ext = os.path.splitext(filename)
+            pieces = ["%s.%d.vtu" % (root, procID) for procID in range(communicator.Nproc)]
+            self._write(self._writePiece, pieces[communicator.procID], values)
+            if communicator.procID == 0:
+                self._write(self._writePieces, filename, pieces, values)
+        else:
+            self._write(self._writePiece, filename, values)
+
+        if time is None:
+            time = len(self._times)
+        self._times.append((time, filename))
+        if self.timeSeries is not None and communicator.procID == 0:
+            self._write(self._writeTimeSeries, self.timeSeries, list(self._times))
+
+    def _header(self, type):
+        header = '<VTKFile type="%s" version="0.1" byte_order="LittleEndian" header_type="UInt64"' % type
+        if self.compress:
+            header += ' compressor="vtkZLibDataCompressor"'
+        return header + '>\n'
+
+    @staticmethod
+    def _activeAttributes(values):
+        attributes = ""
+        scalars = [name for name, components, value in values if components == 1]
+        vectors = [name for name, components, value in values if components == 3]
+        if scalars:
+            attributes += ' Scalars=%s' % quoteattr(scalars[0])
+        if vectors:
+            attributes += ' Vectors=%s' % quoteattr(vectors[0])
+        return attributes
+
+    def _writePiece(self, filename, values):
+        piece = self._piece
+
+        blocks = list(piece.blocks)
+        blocks += [_encode(value, self.compress) for name, components, value in values]
+
+        offsets = numerix.cumsum([0] + [len(block) for block in blocks])
+
+        def dataArray(index, name, type, components):
+            return ('        <DataArray type="%s" Name=%s NumberOfComponents="%d" format="appended" offset="%d"/>\n'
+                    % (type, quoteattr(name), components, offsets[index]))
+
+        xml = [self._header("UnstructuredGrid"),
+               '  <UnstructuredGrid>\n',
+               '    <Piece NumberOfPoints="%d" NumberOfCells="%d">\n' % (piece.numberOfPoints, piece.numberOfCells),
+               '      <Points>\n',
+               dataArray(0, *piece.arrays[0]),
+               '      </Points>\n',
+               '      <Cells>\n']
+        xml += [dataArray(index, *piece.arrays[index]) for index in range(1, 4)]
+        xml += ['      </Cells>\n',
+                '      <CellData%s>\n' % self._activeAttributes(values)]
+        xml += [dataArray(4 + index, name, _VTKType(value.dtype), components)
+                for index, (name, components, value) in enumerate(values)]
+        xml += ['      </CellData>\n',
+                '    </Piece>\n',
+                '  </UnstructuredGrid>\n',
+                '  <AppendedData encoding="raw">\n',
+                '_']
+
+        with open(filename, "wb") as f:
+            f.write("".join(xml).encode("utf-8"))
+            for block in blocks:
+                f.write(block)
+            f.write(b'\n  </AppendedData>\n</VTKFile>\n')
+
+    def _writePieces(self, filename, pieces, values):
+        directory = os.path.dirname(filename)
+
+        xml = [self._header("PUnstructuredGrid"),
+               '  <PUnstructuredGrid GhostLevel="0">\n',
+               '    <PPoints>\n',
+               '      <PDataArray type="%s" NumberOfComponents="3"/>\n' % self._piece.arrays[0][1],
+               '    </PPoints>\n',
+               '    <PCellData%s>\n' % self._activeAttributes(values)]
+        xml += ['      <PDataArray type="%s" Name=%s NumberOfComponents="%d"/>\n'
+                % (_VTKType(value.dtype), quoteattr(name), components)
+                for name, components, value in values]
+        xml += ['    </PCellData>\n']
+        xml += ['    <Piece Source=%s/>\n' % quoteattr(os.path.relpath(piece, directory or os.curdir))
+                for piece in pieces]
+        xml += ['  </PUnstructuredGrid>\n',
+                '</VTKFile>\n']
+
+        with open(filename, "w") as f:
+            f.write("".join(xml))
+
+    @staticmethod
+    def _writeTimeSeries(timeSeries, times):
+        directory = os.path.dirname(timeSeries)
+
+        xml = ['<?xml version="1.0"?>\n',
+               '<VTKFile type="Collection" version="0.1" byte_order="LittleEndian">\n',
+               '  <Collection>\n']
+        xml += ['    <DataSet timestep="%.15g" group="" part="0" file=%s/>\n'
+                % (time, quoteattr(os.path.relpath(filename, directory or os.curdir)))
+                for time, filename in times]
+        xml += ['  </Collection>\n',
+                '</VTKFile>\n']
+
+        with open(timeSeries, "w") as f:
+            f.write("".join(xml))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
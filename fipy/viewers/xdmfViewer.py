@@ -0,0 +1,378 @@
+"""Write `CellVariable` time series to HDF5, described by XDMF
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import os
+from xml.sax.saxutils import quoteattr
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+from fipy.viewers.viewer import AbstractViewer
+from fipy.tests.doctestPlus import register_skipper
+
+__all__ = ["XDMFViewer"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+def _checkForH5py():
+    try:
+        import h5py
+        return True
+    except ImportError:
+        return False
+
+register_skipper(flag="H5PY",
+                 test=_checkForH5py,
+                 why="the `h5py` package cannot be imported")
+
+# XDMF cell types of a `Mixed` topology
+_XDMFPolyline = 2
+_XDMFPolygon = 3
+_XDMFPolyhedron = 16
+
+def _mixedTopology(mesh, cellIDs, vertexOffset=0):
+    """The XDMF `Mixed` topology of cells `cellIDs` of `mesh`
+
+    1D cells are polylines, 2D cells are polygons, and 3D cells are
+    polyhedra, listed face by face.
+
+    >>> from fipy import Grid1D, Grid2D, Grid3D
+    >>> print(_mixedTopology(Grid1D(nx=2), [0, 1]).tolist())
+    [2, 2, 1, 0, 2, 2, 2, 1]
+    >>> print(_mixedTopology(Grid2D(nx=2, ny=1), [1], vertexOffset=10).tolist())
+    [3, 4, 12, 15, 14, 11]
+    >>> topology = _mixedTopology(Grid3D(nx=1, ny=1, nz=1), [0])
+    >>> print(topology[:2].tolist(), len(topology))
+    [16, 6] 32
+
+    Parameters
+    ----------
+    mesh : ~fipy.meshes.mesh.Mesh
+        The mesh
+    cellIDs : array_like of int
+        The cells to describe
+    vertexOffset : int
+        Added to the ID of every vertex
+    """
+    cellIDs = numerix.asarray(cellIDs, dtype=numerix.INT_DTYPE)
+
+    if mesh.dim < 3:
+        # cells x vertices
+        vertexIDs = MA.array(mesh._orderedCellVertexIDs)[..., cellIDs].swapaxes(0, 1) + vertexOffset
+        counts = (~MA.getmaskarray(vertexIDs)).sum(axis=1)
+        cellType = _XDMFPolyline if mesh.dim == 1 else _XDMFPolygon
+        rows = MA.concatenate((MA.array(numerix.zeros_like(counts) + cellType)[..., numerix.newaxis],
+                               MA.array(counts)[..., numerix.newaxis],
+                               vertexIDs), axis=1)
+    else:
+        # faces x vertices, each face preceded by its number of vertices
+        faceVertexIDs = MA.array(mesh.faceVertexIDs).swapaxes(0, 1) + vertexOffset
+        faceCounts = (~MA.getmaskarray(faceVertexIDs)).sum(axis=1)
+        faceRows = MA.concatenate((MA.array(faceCounts)[..., numerix.newaxis],
+                                   faceVertexIDs), axis=1)
+
+        # cells x faces x (count + vertices)
+        cellFaceIDs = MA.array(mesh.cellFaceIDs)[..., cellIDs].swapaxes(0, 1)
+        faces = MA.array(faceRows[MA.filled(cellFaceIDs, 0)])
+        faces[MA.getmaskarray(cellFaceIDs)] = MA.masked
+        counts = (~MA.getmaskarray(cellFaceIDs)).sum(axis=1)
+        rows = MA.concatenate((MA.array(numerix.zeros_like(counts) + _XDMFPolyhedron)[..., numerix.newaxis],
+                               MA.array(counts)[..., numerix.newaxis],
+                               faces.reshape((len(cellIDs), faces.shape[1] * faces.shape[2]))), axis=1)
+
+    return MA.array(rows, dtype="int64").compressed()
+
+def _XDMFDataItem(dimensions, dtype, path):
+    kind = {"f": "Float", "i": "Int", "u": "UInt"}[dtype.kind]
+    return ('<DataItem Dimensions="%s" NumberType="%s" Precision="%d" Format="HDF">%s</DataItem>'
+            % (" ".join(str(d) for d in dimensions), kind, dtype.itemsize, path))
+
+def _XDMF(pieces, steps):
+    """An XDMF description of a time series
+
+    >>> print(_XDMF(pieces=[("run.h5", 2, 6, 12)],
+    ...             steps=[(0.5, "000000", [("phi", 1, numerix.dtype(float))])]))
+    <?xml version="1.0"?>
+    <Xdmf Version="3.0">
+      <Domain>
+        <Grid Name="TimeSeries" GridType="Collection" CollectionType="Temporal">
+          <Grid Name="000000" GridType="Uniform">
+            <Time Value="0.5"/>
+            <Topology TopologyType="Mixed" NumberOfElements="2">
+              <DataItem Dimensions="12" NumberType="Int" Precision="8" Format="HDF">run.h5:/mesh/topology</DataItem>
+            </Topology>
+            <Geometry GeometryType="XYZ">
+              <DataItem Dimensions="6 3" NumberType="Float" Precision="8" Format="HDF">run.h5:/mesh/points</DataItem>
+            </Geometry>
+            <Attribute Name="phi" AttributeType="Scalar" Center="Cell">
+              <DataItem Dimensions="2" NumberType="Float" Precision="8" Format="HDF">run.h5:/steps/000000/phi</DataItem>
+            </Attribute>
+          </Grid>
+        </Grid>
+      </Domain>
+    </Xdmf>
+    <BLANKLINE>
+
+    Parameters
+    ----------
+    pieces : list
+        The `(HDF5 file, cells, points, topology length)` of each part of
+        the mesh
+    steps : list
+        The `(time, name, variables)` of each step, where `variables`
+        lists the `(name, components, dtype)` of each variable
+    """
+    xml = ['<?xml version="1.0"?>',
+           '<Xdmf Version="3.0">',
+           '  <Domain>',
+           '    <Grid Name="TimeSeries" GridType="Collection" CollectionType="Temporal">']
+
+    for time, step, variables in steps:
+        if len(pieces) > 1:
+            xml += ['      <Grid Name=%s GridType="Collection" CollectionType="Spatial">' % quoteattr(step),
+                    '        <Time Value="%.15g"/>' % time]
+            indent = "        "
+        else:
+            indent = "      "
+
+        for piece, (filename, cells, points, topology) in enumerate(pieces):
+            if len(pieces) > 1:
+                xml += [indent + '<Grid Name="%s.%d" GridType="Uniform">' % (step, piece)]
+            else:
+                xml += [indent + '<Grid Name=%s GridType="Uniform">' % quoteattr(step),
+                        indent + '  <Time Value="%.15g"/>' % time]
+            xml += [indent + '  <Topology TopologyType="Mixed" NumberOfElements="%d">' % cells,
+                    indent + '    ' + _XDMFDataItem((topology,), numerix.dtype("int64"),
+                                                    "%s:/mesh/topology" % filename),
+                    indent + '  </Topology>',
+                    indent + '  <Geometry GeometryType="XYZ">',
+                    indent + '    ' + _XDMFDataItem((points, 3), numerix.dtype(float),
+                                                    "%s:/mesh/points" % filename),
+                    indent + '  </Geometry>']
+            for name, components, dtype in variables:
+                attributeType = {1: "Scalar", 3: "Vector"}.get(components, "Matrix")
+                dimensions = (cells,) if components == 1 else (cells, components)
+                xml += [indent + '  <Attribute Name=%s AttributeType="%s" Center="Cell">'
+                        % (quoteattr(name), attributeType),
+                        indent + '    ' + _XDMFDataItem(dimensions, dtype,
+                                                        "%s:/steps/%s/%s" % (filename, step, name)),
+                        indent + '  </Attribute>']
+            xml += [indent + '</Grid>']
+
+        if len(pieces) > 1:
+            xml += ['      </Grid>']
+
+    xml += ['    </Grid>',
+            '  </Domain>',
+            '</Xdmf>',
+            '']
+
+    return "\n".join(xml)
+
+class XDMFViewer(AbstractViewer):
+    """Writes a time series of `CellVariable` data to HDF5, described by XDMF
+
+    Each call to :meth:`plot` adds a step to an HDF5 file, and rewrites an
+    XDMF file that describes every step, which ParaView and VisIt can read.
+    The mesh is only written once.
+
+    Nothing is gathered to one processor. Each processor writes the values
+    of the cells it owns. If `h5py` was built with MPI, they all write to
+    one shared file, in order of processor, with the global ID of each cell
+    in `/mesh/globalCellIDs`. Otherwise, each processor writes its own file,
+    with its number inserted before the extension.
+
+    3D cells are described as XDMF polyhedra, which need a reader of XDMF
+    version 3, such as ParaView's "XDMF3 Reader".
+
+    >>> import os
+    >>> import shutil
+    >>> import tempfile
+    >>> from fipy import CellVariable, Grid2D, numerix
+    >>> dir = tempfile.mkdtemp()
+
+    >>> m = Grid2D(nx=3, ny=2)
+    >>> phi = CellVariable(mesh=m, name="phi", value=m.x)
+    >>> viewer = XDMFViewer(vars=(phi, phi.grad),
+    ...                     filename=os.path.join(dir, "run.xmf")) # doctest: +H5PY
+    >>> for step in range(2):
+    ...     phi.value = phi.value + 1
+    ...     viewer.plot(time=step * 0.1) # doctest: +H5PY
+
+    >>> import h5py # doctest: +H5PY
+    >>> with h5py.File(os.path.join(dir, "run.h5"), "r") as f:
+    ...     print(sorted(f["steps"].keys()))
+    ...     print(numerix.allclose(f["steps/000001/phi"], phi))
+    ...     print(f["mesh/points"].shape) # doctest: +H5PY, +SERIAL
+    ['000000', '000001']
+    True
+    (12, 3)
+    >>> print(open(os.path.join(dir, "run.xmf")).read().count("<Time ")) # doctest: +H5PY, +PROCESSOR_0
+    2
+
+    >>> shutil.rmtree(dir)
+    """
+    def __init__(self, vars, filename, title=None, limits={}, **kwlimits):
+        """Creates an `XDMFViewer`
+
+        Parameters
+        ----------
+        vars : ~fipy.variables.cellVariable.CellVariable or list
+            the `CellVariable` objects to write, all on the same mesh.
+        filename : str
+            name of the XDMF file. The data is written to an HDF5 file of
+            the same name, with the extension `.h5`.
+        title : str, optional
+            not used
+        limits : dict, optional
+            not used
+        float xmin, xmax, ymin, ymax, zmin, zmax, datamin, datamax : float, optional
+            not used
+        """
+        import h5py
+
+        kwlimits.update(limits)
+        AbstractViewer.__init__(self, vars=vars, title=title, **kwlimits)
+
+        self.mesh = self.vars[0].mesh
+        self.filename = filename
+
+        communicator = self.mesh.communicator
+        if (communicator.Nproc > 1
+            and h5py.get_config().mpi
+            and hasattr(communicator, "mpi4py_comm")):
+            self._mpiComm = communicator.mpi4py_comm
+        else:
+            self._mpiComm = None
+
+        self.dataFilename = os.path.splitext(filename)[0] + ".h5"
+        if self._mpiComm is None:
+            from fipy.meshes.meshCache import _rankFilename
+            self.dataFilename = _rankFilename(self.dataFilename, communicator)
+
+        self._pieces = None
+        self._steps = []
+
+    def _getSuitableVars(self, vars):
+        from fipy.variables.cellVariable import CellVariable
+
+        if type(vars) not in [type([]), type(())]:
+            vars = [vars]
+        vars = [var for var in vars if isinstance(var, CellVariable)]
+        if len(vars) == 0:
+            raise TypeError("%s can only display %s" % (self.__class__.__name__, CellVariable.__name__))
+        vars = [var for var in vars if var.mesh == vars[0].mesh]
+        return vars
+
+    def _open(self, mode):
+        import h5py
+
+        if self._mpiComm is not None:
+            return h5py.File(self.dataFilename, mode, driver="mpio", comm=self._mpiComm)
+        else:
+            return h5py.File(self.dataFilename, mode)
+
+    def _allgather(self, counts):
+        communicator = self.mesh.communicator
+        if communicator.Nproc > 1:
+            return [tuple(c) for c in communicator.allgather(tuple(counts))]
+        else:
+            return [tuple(counts)]
+
+    def _writeMesh(self):
+        mesh = self.mesh
+        cellIDs = mesh._localNonOverlappingCellIDs
+        points = mesh._toVTK3D(numerix.array(mesh.vertexCoords, dtype=float))
+
+        # the sizes of this processor's piece; vertices are numbered in
+        # the file, so a shared file needs the sizes of the pieces before it
+        topology = _mixedTopology(mesh, cellIDs)
+        counts = self._allgather((len(cellIDs), len(points), len(topology)))
+        procID = mesh.communicator.procID
+
+        if self._mpiComm is not None:
+            before = numerix.array(counts[:procID], dtype=numerix.INT_DTYPE).reshape((-1, 3)).sum(axis=0)
+            totals = numerix.array(counts, dtype=numerix.INT_DTYPE).sum(axis=0)
+            topology = _mixedTopology(mesh, cellIDs, vertexOffset=before[1])
+            self._cellOffset = before[0]
+            self._numberOfCells = totals[0]
+            self._pieces = [(os.path.basename(self.dataFilename),) + tuple(totals)]
+        else:
+            before = numerix.zeros((3,), dtype=numerix.INT_DTYPE)
+            totals = counts[procID]
+            self._cellOffset = 0
+            self._numberOfCells = len(cellIDs)
+            names = [os.path.basename(self.dataFilename)]
+            if mesh.communicator.Nproc > 1:
+                root = os.path.splitext(os.path.basename(self.filename))[0]
+                names = ["%s.%d.h5" % (root, n) for n in range(mesh.communicator.Nproc)]
+            self._pieces = [(name,) + tuple(count) for name, count in zip(names, counts)]
+
+        with self._open("w") as f:
+            # every processor takes part in creating datasets
+            for name, data, shape, offset in (("points", points, (totals[1], 3), before[1]),
+                                              ("topology", topology, (totals[2],), before[2]),
+                                              ("globalCellIDs",
+                                               numerix.array(mesh._globalNonOverlappingCellIDs, dtype="int64"),
+                                               (totals[0],), before[0])):
+                dataset = f.create_dataset("mesh/" + name, shape=shape, dtype=data.dtype)
+                dataset[offset:offset + len(data)] = data
+
+    def _value(self, var):
+        value = numerix.array(var.numericValue)[..., self.mesh._localNonOverlappingCellIDs]
+        if var.rank == 1 and value.shape[0] == self.mesh.dim:
+            # XDMF vectors have three components
+            value = self.mesh._toVTK3D(value)
+        else:
+            value = value.reshape((-1, value.shape[-1])).swapaxes(0, 1)
+        if value.dtype.kind == "b":
+            value = value.astype("uint8")
+        if value.shape[-1] == 1:
+            value = value.reshape((-1,))
+        return value
+
+    def plot(self, filename=None, time=None):
+        """Write the variables as a new step
+
+        Parameters
+        ----------
+        filename : str
+            not used; every step is written to the files given when the
+            viewer was created.
+        time : float, optional
+            time of this step. By default, the number of steps written
+            before.
+        """
+        if self._pieces is None:
+            self._writeMesh()
+
+        step = "%06d" % len(self._steps)
+        if time is None:
+            time = len(self._steps)
+
+        variables = []
+        with self._open("a") as f:
+            for var in self.vars:
+                name = var.name or "%s #%d" % (var.__class__.__name__, id(var))
+                value = self._value(var)
+                components = value.shape[-1] if value.ndim > 1 else 1
+                shape = (self._numberOfCells,) + value.shape[1:]
+                dataset = f.create_dataset("steps/%s/%s" % (step, name), shape=shape, dtype=value.dtype)
+                dataset[self._cellOffset:self._cellOffset + len(value)] = value
+                variables.append((name, components, value.dtype))
+
+        self._steps.append((time, step, variables))
+
+        if self.mesh.communicator.procID == 0:
+            with open(self.filename, "w") as f:
+                f.write(_XDMF(self._pieces, self._steps))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()